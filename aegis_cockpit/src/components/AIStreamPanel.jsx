@@ -27,7 +27,10 @@ export default function AIStreamPanel({ messages }) {
         color: 'text-aegis-cyan',
       }]);
     } else if (msg.type === 'ai.stream') {
-      setStreamText(msg.data?.full_text || '');
+      // Frames carry deltas; the final frame has the cleaned full text
+      setStreamText((prev) => (msg.data?.final
+        ? (msg.data.full_text ?? prev)
+        : prev + (msg.data?.chunk || '')));
     } else if (msg.type === 'ai.complete') {
       setIsThinking(false);
       const analysis = msg.data?.analysis;
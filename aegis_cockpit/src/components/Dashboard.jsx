@@ -163,6 +163,27 @@ export default function Dashboard() {
     const [metricsHistory, setMetricsHistory] = useState([]);
     const [selectedIncident, setSelectedIncident] = useState(null);
 
+    /* ── Seed the vitals chart from recorded history (survives reloads) ── */
+    useEffect(() => {
+        fetch('/api/metrics/history?range=183&step=3')
+            .then(r => r.ok ? r.json() : null)
+            .then(h => {
+                if (!h) return;
+                const byTs = new Map();
+                Object.values(h.series).forEach(s => s.ts.forEach((t, i) => {
+                    const b = byTs.get(t) || { n: 0, cpu: 0, mem: 0 };
+                    b.n += 1; b.cpu += s.cpu_percent[i]; b.mem += s.memory_percent[i];
+                    byTs.set(t, b);
+                }));
+                const seed = [...byTs.entries()].sort((a, b) => a[0] - b[0]).map(([t, b]) => ({
+                    time: new Date(t * 1000).toLocaleTimeString('en-US',{hour12:false,hour:'2-digit',minute:'2-digit',second:'2-digit'}),
+                    cpu: +(b.cpu / b.n).toFixed(1), mem: +(b.mem / b.n).toFixed(1),
+                }));
+                setMetricsHistory(p => [...seed, ...p].slice(-61));
+            })
+            .catch(() => {});
+    }, []);
+
     /* ── WS Frame Processor — FIXED to match backend shapes ── */
     useEffect(() => {
         if (!lastMessage) return;
@@ -160,19 +160,24 @@ export default function DashboardCockpit() {
     const f = lastMessage;
 
     switch (f.type) {
-      case 'incident.new':
+      case 'incident.new': {
         setCouncilStatus({ sre: 'idle', security: 'idle', auditor: 'idle' });
         setDecision(null);
         setAiText('');
         setAiStatus('idle');
-        addLog(`🚨 ALERT: ${f.data?.alert_type?.toUpperCase()} — ${f.data?.incident_id}`, 'alert');
-        // spike matching metric
-        if (f.data?.alert_type === 'memory_oom')      setMetrics(m => ({ ...m, memory: 97 }));
-        if (f.data?.alert_type === 'cpu_spike')        setMetrics(m => ({ ...m, cpu: 99 }));
-        if (f.data?.alert_type === 'db_connection')    setMetrics(m => ({ ...m, db: 94 }));
-        if (f.data?.alert_type === 'network_latency')  setMetrics(m => ({ ...m, net: 95 }));
-        if (f.data?.alert_type === 'disk_space')       setMetrics(m => ({ ...m, disk: 96 }));
+        // /webhook/batch sends one frame carrying a list of incidents
+        const alerts = Array.isArray(f.data) ? f.data : [f.data];
+        alerts.forEach((d) => {
+          addLog(`🚨 ALERT: ${d?.alert_type?.toUpperCase()} — ${d?.incident_id}`, 'alert');
+          // spike matching metric
+          if (d?.alert_type === 'memory_oom')      setMetrics(m => ({ ...m, memory: 97 }));
+          if (d?.alert_type === 'cpu_spike')        setMetrics(m => ({ ...m, cpu: 99 }));
+          if (d?.alert_type === 'db_connection')    setMetrics(m => ({ ...m, db: 94 }));
+          if (d?.alert_type === 'network_latency')  setMetrics(m => ({ ...m, net: 95 }));
+          if (d?.alert_type === 'disk_space')       setMetrics(m => ({ ...m, disk: 96 }));
+        });
         break;
+      }
 
       case 'ai.thinking':
         setAiStatus('streaming');
@@ -3,18 +3,27 @@ import { useEffect, useRef, useState, useCallback } from 'react';
 /**
  * Custom React hook for WebSocket connection to AegisOps backend.
  * Manages connection, reconnection, and message dispatching.
+ * On reconnect it resumes from the last seen frame (?stream=…&since=…);
+ * the server replays the gap, or sets `resync` when it no longer can.
+ * `metrics.delta` frames are applied to the last `metrics` keyframe and
+ * surfaced as full `metrics` frames, so panels only ever see full lists.
  */
 export function useWebSocket(url) {
   const wsRef = useRef(null);
   const [connected, setConnected] = useState(false);
   const [lastMessage, setLastMessage] = useState(null);
   const [messages, setMessages] = useState([]);
+  const [resync, setResync] = useState(false);
   const reconnectTimer = useRef(null);
+  const resume = useRef({ stream: null, seq: null });
+  const liveMetrics = useRef(new Map());
 
   const connect = useCallback(() => {
     if (wsRef.current?.readyState === WebSocket.OPEN) return;
 
-    const ws = new WebSocket(url);
+    const { stream, seq } = resume.current;
+    const sep = url.includes('?') ? '&' : '?';
+    const ws = new WebSocket(stream && seq != null ? `${url}${sep}stream=${stream}&since=${seq}` : url);
     wsRef.current = ws;
 
     ws.onopen = () => {
@@ -24,7 +33,24 @@ export function useWebSocket(url) {
 
     ws.onmessage = (event) => {
       try {
-        const frame = JSON.parse(event.data);
+        let frame = JSON.parse(event.data);
+        if (frame.type === 'resume') {
+          if (resume.current.stream !== frame.data?.stream || frame.data?.snapshot_required) {
+            resume.current.seq = frame.data?.seq ?? null;
+          }
+          resume.current.stream = frame.data?.stream;
+          setResync(Boolean(frame.data?.snapshot_required));
+        } else if (frame.seq != null && frame.seq > (resume.current.seq ?? -1)) {
+          resume.current.seq = frame.seq;
+        }
+        if (frame.type === 'metrics' && Array.isArray(frame.data)) {
+          liveMetrics.current = new Map(frame.data.map((m) => [m.name, m]));
+        } else if (frame.type === 'metrics.delta') {
+          const live = liveMetrics.current;
+          (frame.data?.removed || []).forEach((name) => live.delete(name));
+          (frame.data?.changed || []).forEach((m) => live.set(m.name, m));
+          frame = { ...frame, type: 'metrics', data: Array.from(live.values()) };
+        }
         setLastMessage(frame);
         setMessages((prev) => [...prev.slice(-500), frame]); // Keep last 500
       } catch (e) {
@@ -65,7 +91,7 @@ export function useWebSocket(url) {
     }
   }, []);
 
-  return { connected, lastMessage, messages, send };
+  return { connected, lastMessage, messages, send, resync };
 }
 
 /**
@@ -26,6 +26,8 @@ import asyncio
 import json
 import logging
 import re
+import threading
+import time
 from pathlib import Path
 from typing import AsyncGenerator
 
@@ -43,6 +45,7 @@ from .models import (
     AIAnalysis, CouncilDecision, CouncilRole, CouncilVerdict,
     CouncilVote, IncidentPayload,
 )
+from .telemetry import LLM_CALL
 
 logger = logging.getLogger("aegis.ai_brain")
 
@@ -92,20 +95,22 @@ def _parse_json(raw: str) -> dict:
     return data
 
 
-async def _call_llm(system: str, user_msg: str, model: str | None = None) -> str:
+async def _call_llm(system: str, user_msg: str, model: str | None = None,
+                    call: str = "chat") -> str:
     """Call LLM with Ollama PRIMARY, FastRouter fallback. Returns raw text."""
     # Try Ollama first
     try:
         client = _get_fallback()  # Ollama client
-        resp = await asyncio.to_thread(
-            client.chat.completions.create,
-            model=OLLAMA_MODEL,
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": user_msg},
-            ],
-            temperature=0.2,
-        )
+        with LLM_CALL.time(provider="ollama", call=call):
+            resp = await asyncio.to_thread(
+                client.chat.completions.create,
+                model=OLLAMA_MODEL,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": user_msg},
+                ],
+                temperature=0.2,
+            )
         raw = resp.choices[0].message.content.strip()
         logger.debug("Ollama response OK")
         return raw
@@ -115,15 +120,16 @@ async def _call_llm(system: str, user_msg: str, model: str | None = None) -> str
     # Fallback to FastRouter (Claude)
     try:
         client = _get_primary()
-        resp = await asyncio.to_thread(
-            client.chat.completions.create,
-            model=FASTRTR_MODEL,
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": user_msg},
-            ],
-            temperature=0.2,
-        )
+        with LLM_CALL.time(provider="fastrouter", call=call):
+            resp = await asyncio.to_thread(
+                client.chat.completions.create,
+                model=FASTRTR_MODEL,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": user_msg},
+                ],
+                temperature=0.2,
+            )
         return resp.choices[0].message.content.strip()
     except Exception as exc:
         logger.error("Both Ollama and FastRouter failed: %s", exc)
@@ -390,10 +396,94 @@ def _build_sre_system_prompt(rag_entries: list[dict]) -> str:
 # ③ STREAMING ANALYSIS (Typewriter UI Effect)
 # ═══════════════════════════════════════════════════════════════════════
 
+async def _iterate_in_thread(iterable) -> AsyncGenerator:
+    """
+    Consume a blocking iterator (OpenAI stream) in a worker thread. If the
+    consumer stops early the thread stops reading and the response is closed.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    end = object()
+    stop = threading.Event()
+
+    def _post(item, exc) -> None:
+        if stop.is_set():
+            return
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, (item, exc))
+        except RuntimeError:
+            stop.set()  # the loop is closed – nobody is listening
+
+    def _drain() -> None:
+        try:
+            for item in iterable:
+                if stop.is_set():
+                    break
+                _post(item, None)
+        except Exception as exc:
+            _post(None, exc)
+        finally:
+            _post(end, None)
+
+    loop.run_in_executor(None, _drain)
+    try:
+        while True:
+            item, exc = await queue.get()
+            if exc is not None:
+                raise exc
+            if item is end:
+                break
+            yield item
+    finally:
+        stop.set()
+        close = getattr(iterable, "close", None) or getattr(
+            getattr(iterable, "response", None), "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception as exc:
+                logger.debug("Closing LLM stream failed: %s", exc)
+
+
+async def _timed_stream(provider: str, call: str, create) -> AsyncGenerator:
+    """
+    Open a provider stream and yield its chunks, recording in LLM_CALL only
+    the time spent waiting on the provider – not the time the consumer takes
+    between chunks. A consumer that stops early is not a provider error.
+    """
+    waited, outcome, chunks = 0.0, "ok", None
+    try:
+        start = time.perf_counter()
+        try:
+            response = await asyncio.to_thread(create)
+        finally:
+            waited += time.perf_counter() - start
+        chunks = _iterate_in_thread(response)
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = await chunks.__anext__()
+            except StopAsyncIteration:
+                break
+            finally:
+                waited += time.perf_counter() - start
+            yield chunk
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        if chunks is not None:
+            await chunks.aclose()
+        LLM_CALL.observe(waited, provider=provider, call=call, outcome=outcome)
+
+
 async def stream_analysis(payload: IncidentPayload) -> AsyncGenerator[str, None]:
     """
-    Stream AI thinking tokens for the typewriter effect.
+    Stream AI thinking tokens for the typewriter effect, as they arrive.
     Now RAG-augmented: retrieves similar past incidents first.
+
+    Each chunk is cleaned on its own; words split across chunks are only
+    fixed by cleaning the joined text (see main._remediate's final frame).
     """
     safe_logs = _truncate_logs(payload.logs)
 
@@ -412,14 +502,12 @@ async def stream_analysis(payload: IncidentPayload) -> AsyncGenerator[str, None]
     )
 
     # Use FastRouter (Claude) ONLY for MVP
-    client = _get_primary()
-    model = FASTRTR_MODEL
+    provider, client, model = "fastrouter", _get_primary(), FASTRTR_MODEL
 
-    # Buffer all chunks, clean EACH chunk, then combine and yield char-by-char
-    raw_chunks: list[str] = []
+    # Chunks are read off the event loop and yielded as soon as they land
+    started = False
     try:
-        response = await asyncio.to_thread(
-            client.chat.completions.create,
+        stream = _timed_stream(provider, "stream", lambda: client.chat.completions.create(
             model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -427,22 +515,21 @@ async def stream_analysis(payload: IncidentPayload) -> AsyncGenerator[str, None]
             ],
             temperature=0.2,
             stream=True,
-        )
-        for chunk in response:
-            if chunk.choices and chunk.choices[0].delta.content:
-                # Clean each chunk IMMEDIATELY before buffering
-                cleaned_chunk = _clean_llm_text(chunk.choices[0].delta.content)
-                raw_chunks.append(cleaned_chunk)
+        ))
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    started = True
+                    yield _clean_llm_text(chunk.choices[0].delta.content)
+        finally:
+            await stream.aclose()
     except Exception as exc:
+        if started:
+            raise  # Partial text already shown – analyze_logs takes over
         # Non-streaming fallback
         logger.error("FastRouter streaming failed: %s", exc)
-        raw = await _call_llm(system_prompt, user_msg)
-        raw_chunks.append(raw)
-
-    # Final aggressive clean of the full text
-    cleaned = _clean_llm_text("".join(raw_chunks))
-    for char in cleaned:
-        yield char
+        raw = await _call_llm(system_prompt, user_msg, call="stream")
+        yield _clean_llm_text(raw)
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -479,7 +566,7 @@ async def analyze_logs(payload: IncidentPayload) -> AIAnalysis:
         f"Logs (last {LOG_TRUNCATE_CHARS} chars):\n{safe_logs}"
     )
 
-    raw = await _call_llm(system_prompt, user_msg)
+    raw = await _call_llm(system_prompt, user_msg, call="analysis")
     data = _parse_json(raw)
     analysis = AIAnalysis(**data)
 
@@ -550,7 +637,7 @@ async def council_review(
 
     # Agent B: Security Officer
     try:
-        sec_raw = await _call_llm(SECURITY_SYSTEM, plan_text)
+        sec_raw = await _call_llm(SECURITY_SYSTEM, plan_text, call="security")
         sec_data = _parse_json(sec_raw)
         sec_vote = CouncilVote(
             role=CouncilRole.SECURITY_OFFICER,
@@ -569,7 +656,7 @@ async def council_review(
     # Agent C: Auditor
     audit_context = plan_text + f"\nSecurity Review: {sec_vote.verdict.value} - {sec_vote.reasoning}"
     try:
-        aud_raw = await _call_llm(AUDITOR_SYSTEM, audit_context)
+        aud_raw = await _call_llm(AUDITOR_SYSTEM, audit_context, call="auditor")
         aud_data = _parse_json(aud_raw)
         aud_vote = CouncilVote(
             role=CouncilRole.AUDITOR,
@@ -28,10 +28,51 @@ OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "llama3.1:8b-instruct-q4_K_M")
 TARGET_CONTAINER: str = os.getenv("TARGET_CONTAINER", "buggy-app-v2")
 HEALTH_URL: str = os.getenv("HEALTH_URL", f"http://{TARGET_CONTAINER}:8000/health")
 
+# ── Docker API executor ──────────────────────────────────────────────
+# Docker SDK calls run on their own bounded, prioritised thread pool
+# (remediation > interactive reads > metrics polling), not the default executor
+DOCKER_WORKERS: int = int(os.getenv("DOCKER_WORKERS", "8"))
+# Queued background / interactive calls beyond this are refused (remediation never is; 0 = unbounded)
+DOCKER_QUEUE_SIZE: int = int(os.getenv("DOCKER_QUEUE_SIZE", "64"))
+# Caller-side deadlines for read operations, "op:secs" (queue wait included)
+DOCKER_OP_TIMEOUTS: str = os.getenv("DOCKER_OP_TIMEOUTS", "stats:15,list:10,logs:15,nginx_read:10")
+# Per-request HTTP timeout of the SDK client (bounds every call, writes included)
+DOCKER_HTTP_TIMEOUT_SECS: int = int(os.getenv("DOCKER_HTTP_TIMEOUT_SECS", "60"))
+# Keep-alive connections to the daemon: workers, fan-out threads, the events
+# stream and one stats stream per container (the SDK default is 10)
+DOCKER_MAX_POOL_SIZE: int = int(os.getenv("DOCKER_MAX_POOL_SIZE", "64"))
+
 # ── Verification timing ─────────────────────────────────────────────
+# Probing starts immediately and backs off (with jitter) from
+# VERIFY_BACKOFF_SECS up to VERIFY_DELAY_SECS until VERIFY_DEADLINE_SECS.
 VERIFY_DELAY_SECS: int = int(os.getenv("VERIFY_DELAY_SECS", "5"))
 VERIFY_RETRIES: int = int(os.getenv("VERIFY_RETRIES", "3"))
 HEALTH_TIMEOUT_SECS: int = int(os.getenv("HEALTH_TIMEOUT_SECS", "5"))
+VERIFY_INITIAL_DELAY_SECS: float = float(os.getenv("VERIFY_INITIAL_DELAY_SECS", "0"))
+VERIFY_BACKOFF_SECS: float = float(os.getenv("VERIFY_BACKOFF_SECS", "0.25"))
+VERIFY_DEADLINE_SECS: float = float(
+    os.getenv("VERIFY_DEADLINE_SECS", str(VERIFY_DELAY_SECS * VERIFY_RETRIES))
+)
+VERIFY_SUCCESS_THRESHOLD: int = int(os.getenv("VERIFY_SUCCESS_THRESHOLD", "2"))
+
+# ── Cockpit presentation ─────────────────────────────────────────────
+# Artificial pause between council-vote frames (0 = real time only).
+UI_VOTE_STAGGER_SECS: float = float(os.getenv("UI_VOTE_STAGGER_SECS", "0"))
+# AI stream tokens are batched into one delta frame per window.
+AI_STREAM_COALESCE_SECS: float = float(os.getenv("AI_STREAM_COALESCE_MS", "30")) / 1000
+
+# ── Container log tailing ────────────────────────────────────────────
+# Followed containers' output is kept in memory (ring per container) and
+# resumed from the last timestamp seen; webhook-named containers are added
+LOG_TAIL: bool = os.getenv("LOG_TAIL", "true").lower() == "true"
+LOG_TAIL_CONTAINERS: str = os.getenv("LOG_TAIL_CONTAINERS", TARGET_CONTAINER)
+LOG_TAIL_LINES: int = int(os.getenv("LOG_TAIL_LINES", "500"))
+LOG_TAIL_MAX_CONTAINERS: int = int(os.getenv("LOG_TAIL_MAX_CONTAINERS", "20"))
+LOG_TAIL_RESYNC_SECS: float = float(os.getenv("LOG_TAIL_RESYNC_SECS", "5"))
+# Alerts whose logs are shorter than this get recent container output appended
+LOG_ENRICH_MIN_CHARS: int = int(os.getenv("LOG_ENRICH_MIN_CHARS", "200"))
+LOG_ENRICH_LINES: int = int(os.getenv("LOG_ENRICH_LINES", "50"))
+LOG_ENRICH_SECS: float = float(os.getenv("LOG_ENRICH_SECS", "300"))
 
 # ── Data persistence ─────────────────────────────────────────────────
 DATA_DIR: Path = Path(__file__).resolve().parent.parent / "data"
@@ -43,8 +84,65 @@ SLACK_WEBHOOK_URL: str = os.getenv("SLACK_WEBHOOK_URL", "")
 # ── Auto-Scaling ─────────────────────────────────────────────────────
 MAX_REPLICAS: int = int(os.getenv("MAX_REPLICAS", "5"))
 SCALE_COOLDOWN_SECS: int = int(os.getenv("SCALE_COOLDOWN_SECS", "30"))
+# Replicas removed per SCALE_DOWN verdict (stepping toward zero, not straight to it)
+SCALE_DOWN_STEP: int = int(os.getenv("SCALE_DOWN_STEP", "1"))
+# Replica creates / starts run concurrently, at most this many at once
+SCALE_SPAWN_CONCURRENCY: int = int(os.getenv("SCALE_SPAWN_CONCURRENCY", "4"))
+# Stopped, pre-created replicas kept per scaled service (0 = off); started on SCALE_UP
+WARM_POOL_SIZE: int = int(os.getenv("WARM_POOL_SIZE", "0"))
 NGINX_CONTAINER: str = os.getenv("NGINX_CONTAINER", "aegis-lb")
 NGINX_CONF_PATH: str = os.getenv("NGINX_CONF_PATH", "/etc/nginx/conf.d/upstream.conf")
+# Upstream changes within this window are applied as one write + reload
+LB_DEBOUNCE_SECS: float = float(os.getenv("LB_DEBOUNCE_MS", "250")) / 1000
+# Pre-create replicas + stage the upstream while the council deliberates
+SPECULATIVE_PREPARE: bool = os.getenv("SPECULATIVE_PREPARE", "true").lower() == "true"
 
 # ── Metrics polling ──────────────────────────────────────────────────
 METRICS_INTERVAL_SECS: int = int(os.getenv("METRICS_INTERVAL_SECS", "3"))
+# One streaming stats subscription per running container (false = one-shot polling)
+STATS_STREAMING: bool = os.getenv("STATS_STREAMING", "true").lower() == "true"
+STATS_RESYNC_SECS: float = float(os.getenv("STATS_RESYNC_SECS", "5"))
+# Container list kept current from Docker events; full relist to correct drift
+INVENTORY_EVENTS: bool = os.getenv("INVENTORY_EVENTS", "true").lower() == "true"
+INVENTORY_RESYNC_SECS: float = float(os.getenv("INVENTORY_RESYNC_SECS", "60"))
+# auto = read cgroup v2 files when the host's cgroup tree is visible, else Docker stats
+METRICS_BACKEND: str = os.getenv("METRICS_BACKEND", "auto")  # auto | cgroup | docker
+CGROUP_ROOT: str = os.getenv("CGROUP_ROOT", "/sys/fs/cgroup")
+PROC_ROOT: str = os.getenv("PROC_ROOT", "/proc")
+# Between keyframes only containers that moved are pushed (metrics.delta)
+METRICS_KEYFRAME_EVERY: int = int(os.getenv("METRICS_KEYFRAME_EVERY", "10"))
+METRICS_DELTA_PCT_EPSILON: float = float(os.getenv("METRICS_DELTA_PCT_EPSILON", "0.5"))
+METRICS_DELTA_REL_EPSILON: float = float(os.getenv("METRICS_DELTA_REL_EPSILON", "0.01"))
+# In-memory history: "bucket_secs:points" per tier (default 1 h @ 3 s, 24 h @ 1 min, 7 d @ 15 min)
+METRICS_HISTORY: bool = os.getenv("METRICS_HISTORY", "true").lower() == "true"
+METRICS_HISTORY_TIERS: str = os.getenv("METRICS_HISTORY_TIERS", "3:1200,60:1440,900:672")
+METRICS_HISTORY_MAX_CONTAINERS: int = int(os.getenv("METRICS_HISTORY_MAX_CONTAINERS", "200"))
+
+# ── WebSocket fan-out ────────────────────────────────────────────────
+# Per-client outbox; a full outbox sheds the oldest metrics frames first
+WS_SEND_QUEUE_SIZE: int = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+# Drops tolerated before the client catches up, then it is disconnected
+WS_SLOW_CLIENT_MAX_DROPS: int = int(os.getenv("WS_SLOW_CLIENT_MAX_DROPS", "50"))
+WS_SEND_TIMEOUT_SECS: float = float(os.getenv("WS_SEND_TIMEOUT_SECS", "10"))
+# Resume buffer: recent frames per topic (incident / frame type) for reconnects
+WS_REPLAY_PER_TOPIC: int = int(os.getenv("WS_REPLAY_PER_TOPIC", "256"))
+WS_REPLAY_MAX_TOPICS: int = int(os.getenv("WS_REPLAY_MAX_TOPICS", "64"))
+
+# ── Remediation executor ─────────────────────────────────────────────
+REMEDIATION_WORKERS: int = int(os.getenv("REMEDIATION_WORKERS", "4"))
+REMEDIATION_QUEUE_SIZE: int = int(os.getenv("REMEDIATION_QUEUE_SIZE", "32"))
+REMEDIATION_RETRY_AFTER_SECS: int = int(os.getenv("REMEDIATION_RETRY_AFTER_SECS", "10"))
+REMEDIATION_DRAIN_TIMEOUT_SECS: int = int(os.getenv("REMEDIATION_DRAIN_TIMEOUT_SECS", "30"))
+
+# ── Incident store ───────────────────────────────────────────────────
+INCIDENT_DB_PATH: Path = Path(os.getenv("INCIDENT_DB_PATH", str(DATA_DIR / "incidents.db")))
+INCIDENT_CACHE_SIZE: int = int(os.getenv("INCIDENT_CACHE_SIZE", "256"))
+INCIDENT_FLUSH_INTERVAL_SECS: float = float(os.getenv("INCIDENT_FLUSH_INTERVAL_SECS", "1.0"))
+
+# ── Multi-worker shared state ────────────────────────────────────────
+# "" = single worker (SQLite + in-process); "redis://host:6379/0" = shared.
+SHARED_STATE_URL: str = os.getenv("SHARED_STATE_URL", "")
+SHARED_STATE_PREFIX: str = os.getenv("SHARED_STATE_PREFIX", "aegis")
+LEADER_LEASE_SECS: float = float(os.getenv("LEADER_LEASE_SECS", "10"))
+# Per-target execution lease (remediation / scaling); renewed while held
+TARGET_LEASE_SECS: float = float(os.getenv("TARGET_LEASE_SECS", "30"))
@@ -0,0 +1,127 @@
+"""
+AegisOps GOD MODE – Per-target remediation serialization.
+
+Two incidents for the same container must never race each other:
+  • Work on one target (execute + verify) holds that target's lock
+  • An identical action already in flight is JOINED, not repeated
+    (a second SCALE_UP shares the first one's replicas and health verdict)
+  • An identical action already queued behind the lock is COLLAPSED into it
+    (three RESTARTs waiting on one target → one extra restart, not three)
+  • Different actions on the same target run one after another
+  • With shared state attached, the work also holds the target's lease
+    (shared_state.lock), so workers take turns on a target too; joining
+    and collapsing stay per worker
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Generic, Optional, TypeVar
+
+logger = logging.getLogger("aegis.coordinator")
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Flight(Generic[T]):
+    owner: str
+    future: asyncio.Future
+    joined: list[str] = field(default_factory=list)
+
+
+class TargetCoordinator:
+    """Per-target lock manager with action merging."""
+
+    def __init__(self) -> None:
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._in_flight: dict[tuple[str, str], _Flight] = {}
+        self._queued: dict[tuple[str, str], _Flight] = {}
+        self._executed = 0
+        self._merged = 0
+        self._shared = None
+
+    def attach(self, shared) -> None:
+        """Also serialize each target across workers through ``shared``'s locks."""
+        self._shared = shared if shared.distributed else None
+
+    async def run(
+        self,
+        target: str,
+        action: str,
+        owner: str,
+        work: Callable[[], Awaitable[T]],
+        on_join: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> tuple[T, Optional[str]]:
+        """
+        Run ``work`` for (target, action) under the target lock.
+
+        Returns ``(value, leader)`` – ``leader`` is None when this caller did
+        the work, otherwise the owner whose in-flight/queued run was joined.
+        Exceptions raised by the leader propagate to every joiner.
+        """
+        key = (target, action)
+        flight = self._in_flight.get(key) or self._queued.get(key)
+        if flight is not None:
+            self._merged += 1
+            flight.joined.append(owner)
+            logger.info("🔗 %s on '%s' from %s merged into %s",
+                        action, target, owner, flight.owner)
+            if on_join is not None:
+                await on_join(flight.owner)
+            value = await asyncio.shield(flight.future)
+            return value, flight.owner
+
+        loop = asyncio.get_running_loop()
+        flight = _Flight(owner=owner, future=loop.create_future())
+        # Nobody may be waiting on it – don't warn about unretrieved errors.
+        flight.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._queued[key] = flight
+        lock = self._locks.setdefault(target, asyncio.Lock())
+        try:
+            async with lock, self._lease(target):
+                self._queued.pop(key, None)
+                self._in_flight[key] = flight
+                try:
+                    value = await work()
+                except Exception as exc:
+                    flight.future.set_exception(exc)
+                    raise
+                flight.future.set_result(value)
+                self._executed += 1
+                return value, None
+        finally:
+            if self._queued.get(key) is flight:
+                self._queued.pop(key)
+            if self._in_flight.get(key) is flight:
+                self._in_flight.pop(key)
+            if not flight.future.done():
+                flight.future.cancel()
+
+    def _lease(self, target: str):
+        if self._shared is None:
+            return contextlib.nullcontext()
+        return self._shared.lock(f"target:{target}")
+
+    def snapshot(self) -> dict:
+        return {
+            "distributed": self._shared is not None,
+            "executed": self._executed,
+            "merged": self._merged,
+            "locked_targets": sorted(t for t, lock in self._locks.items() if lock.locked()),
+            "in_flight": [
+                {"target": t, "action": a, "owner": f.owner, "joined": list(f.joined)}
+                for (t, a), f in self._in_flight.items()
+            ],
+            "queued": [
+                {"target": t, "action": a, "owner": f.owner, "joined": list(f.joined)}
+                for (t, a), f in self._queued.items()
+            ],
+        }
+
+
+# Singleton
+coordinator = TargetCoordinator()
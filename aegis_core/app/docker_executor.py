@@ -0,0 +1,220 @@
+"""
+AegisOps GOD MODE – Prioritised executor for Docker SDK calls.
+
+Docker calls used to share asyncio's default executor with LLM and SQLite
+calls, so a slow daemon during an incident storm starved everything. They
+now run on DOCKER_WORKERS dedicated threads fed by one priority queue:
+
+  • remediation  – restart, scaling, nginx swaps: always admitted, served first
+  • interactive  – API reads (container list, logs, upstream file)
+  • background   – metrics polling, inventory resyncs, warm-pool refills;
+                   refused with DockerSaturated once DOCKER_QUEUE_SIZE calls
+                   are waiting (0 = unbounded), so polling sheds first
+
+Read operations get a caller-side deadline (DOCKER_OP_TIMEOUTS, queue wait
+included). A call whose caller timed out or was cancelled before a worker
+picked it up is dropped, not run. Writes have no caller deadline – giving
+up on a half-done scale-up would desync the controller – and are bounded
+by the SDK client's HTTP timeout instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from .config import DOCKER_OP_TIMEOUTS, DOCKER_QUEUE_SIZE, DOCKER_WORKERS
+from .telemetry import DOCKER_CALL, DOCKER_QUEUE_WAIT
+
+logger = logging.getLogger("aegis.docker_executor")
+
+# Lower value = served first
+REMEDIATION, INTERACTIVE, BACKGROUND = 0, 1, 2
+PRIORITY_NAMES = {REMEDIATION: "remediation", INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+# Default class per op; callers may override (e.g. the scaler's own "list")
+OP_PRIORITY: dict[str, int] = {
+    "restart": REMEDIATION, "scale_prepare": REMEDIATION, "scale_reconcile": REMEDIATION,
+    "scale_rollback": REMEDIATION, "nginx_reconfigure": REMEDIATION, "nginx_discard": REMEDIATION,
+    "list": INTERACTIVE, "logs": INTERACTIVE, "nginx_read": INTERACTIVE,
+    "stats": BACKGROUND, "warm_fill": BACKGROUND,
+}
+
+# Rolling window for queue-wait statistics
+_STATS_WINDOW = 200
+
+
+class DockerSaturated(RuntimeError):
+    """Raised when a non-remediation Docker call finds the queue full."""
+
+
+class DockerTimeout(TimeoutError):
+    """Raised when a Docker read misses its DOCKER_OP_TIMEOUTS deadline."""
+
+
+def parse_timeouts(spec: str) -> dict[str, float]:
+    """"stats:15,list:10" → {"stats": 15.0, "list": 10.0}."""
+    out = {}
+    for part in spec.split(","):
+        if part.strip():
+            op, _, secs = part.partition(":")
+            out[op.strip()] = float(secs)
+    return out
+
+
+@dataclass(order=True)
+class _Call:
+    priority: int
+    seq: int
+    op: str = field(compare=False)
+    fn: Callable[[], Any] = field(compare=False)
+    loop: asyncio.AbstractEventLoop = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False, default_factory=time.monotonic)
+    abandoned: bool = field(compare=False, default=False)
+
+
+class DockerExecutor:
+    """Bounded worker threads serving Docker calls by priority, then FIFO."""
+
+    def __init__(self, workers: int = DOCKER_WORKERS, queue_size: int = DOCKER_QUEUE_SIZE,
+                 timeouts: str | dict[str, float] = DOCKER_OP_TIMEOUTS) -> None:
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.timeouts = parse_timeouts(timeouts) if isinstance(timeouts, str) else dict(timeouts)
+        self._cond = threading.Condition()
+        self._heap: list[_Call] = []
+        self._seq = itertools.count()
+        self._threads: list[threading.Thread] = []
+        self._closed = False
+        self.busy = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.dropped = 0
+        self._waits: dict[int, deque[float]] = {p: deque(maxlen=_STATS_WINDOW) for p in PRIORITY_NAMES}
+
+    async def run(self, op: str, fn: Callable[[], Any], priority: Optional[int] = None) -> Any:
+        """Run ``fn`` on a Docker worker; raises DockerSaturated / DockerTimeout."""
+        priority = OP_PRIORITY.get(op, INTERACTIVE) if priority is None else priority
+        loop = asyncio.get_running_loop()
+        call = _Call(priority, next(self._seq), op, fn, loop, loop.create_future())
+        with self._cond:
+            if priority != REMEDIATION and 0 < self.queue_size <= len(self._heap):
+                self.rejected += 1
+                raise DockerSaturated(
+                    f"Docker executor saturated ({len(self._heap)} queued) – {op} refused")
+            self._ensure_workers()
+            heapq.heappush(self._heap, call)
+            self._cond.notify()
+
+        timeout = self.timeouts.get(op)
+        try:
+            if timeout is None:
+                return await call.future
+            return await asyncio.wait_for(asyncio.shield(call.future), timeout)
+        except asyncio.TimeoutError:
+            call.abandoned = True
+            self.timed_out += 1
+            raise DockerTimeout(f"Docker {op} timed out after {timeout:g}s") from None
+        except asyncio.CancelledError:
+            call.abandoned = True
+            raise
+
+    def close(self) -> None:
+        """Stop the workers once the queue is empty (they restart on the next call)."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def status(self) -> dict:
+        with self._cond:
+            queued = {name: 0 for name in PRIORITY_NAMES.values()}
+            for call in self._heap:
+                queued[PRIORITY_NAMES[call.priority]] += 1
+            oldest = min((c.enqueued_at for c in self._heap), default=None)
+        waits = {}
+        for p, samples in self._waits.items():
+            if samples:
+                waits[PRIORITY_NAMES[p]] = {
+                    "avg_ms": round(sum(samples) / len(samples) * 1000, 1),
+                    "max_ms": round(max(samples) * 1000, 1),
+                }
+        return {
+            "workers": self.workers,
+            "busy": self.busy,
+            "queued": queued,
+            "queue_size": self.queue_size,
+            "oldest_wait_ms": round((time.monotonic() - oldest) * 1000, 1) if oldest else 0.0,
+            "wait": waits,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "dropped": self.dropped,
+        }
+
+    # ── Workers ──────────────────────────────────────────────────────
+    def _ensure_workers(self) -> None:
+        """Start (or restart after close) the worker threads; call with the lock held."""
+        self._closed = False
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"docker-{len(self._threads)}",
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap and not self._closed:
+                    self._cond.wait()
+                if not self._heap:
+                    return
+                call = heapq.heappop(self._heap)
+                if call.abandoned:  # caller gave up while it queued
+                    self.dropped += 1
+                    continue
+                self.busy += 1
+            wait = time.monotonic() - call.enqueued_at
+            self._waits[call.priority].append(wait)
+            DOCKER_QUEUE_WAIT.observe(wait, priority=PRIORITY_NAMES[call.priority])
+            result, error = None, None
+            try:
+                with DOCKER_CALL.time(op=call.op):
+                    result = call.fn()
+            except BaseException as exc:
+                error = exc
+            finally:
+                with self._cond:
+                    self.busy -= 1
+                    if error is None:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+            try:
+                call.loop.call_soon_threadsafe(_settle, call.future, result, error)
+            except RuntimeError:
+                pass  # the caller's loop is gone
+
+
+def _settle(future: asyncio.Future, result: Any, error: Optional[BaseException]) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+# Singleton
+docker_executor = DockerExecutor()
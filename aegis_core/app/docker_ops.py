@@ -6,35 +6,121 @@ Features:
   • Dynamic replica scaling (spawn/destroy containers)
   • Live container metrics (CPU, memory, network)
   • Nginx upstream reconfiguration
+  • Speculative scale-up: replicas created while the council votes,
+    started on approval, removed on rejection
+  • ScalingController: desired replicas per service with cooldown,
+    hysteresis, merged reconciliation and a scaling history
+  • Replicas are created / started concurrently (SCALE_SPAWN_CONCURRENCY),
+    from an optional warm pool of stopped containers when one is ready
+  • Every blocking SDK call runs on the prioritised Docker executor
+    (docker_executor), never on asyncio's default thread pool
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
+import posixpath
+import threading
 import time
-from typing import Optional
+import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, TypeVar
 
 import docker
 from docker.errors import NotFound, APIError
 
-from .config import TARGET_CONTAINER, MAX_REPLICAS, NGINX_CONTAINER
+from .config import (
+    TARGET_CONTAINER, MAX_REPLICAS, NGINX_CONF_PATH, NGINX_CONTAINER, SCALE_COOLDOWN_SECS,
+    SCALE_SPAWN_CONCURRENCY, WARM_POOL_SIZE, LB_DEBOUNCE_SECS,
+    DOCKER_HTTP_TIMEOUT_SECS, DOCKER_MAX_POOL_SIZE,
+)
+from .docker_executor import REMEDIATION, docker_executor
 from .models import ContainerMetrics, ScaleEvent
 
 logger = logging.getLogger("aegis.docker_ops")
 
+# Every replica / staged / warm container carries this label (value = the
+# service it replicates); replicas are discovered by it, not by name scans
+REPLICA_LABEL = "aegis.replica-of"
+
 _client: docker.DockerClient | None = None
 
 
 def _get_client() -> docker.DockerClient:
     global _client
     if _client is None:
-        _client = docker.from_env()
+        _client = docker.from_env(timeout=DOCKER_HTTP_TIMEOUT_SECS,
+                                  max_pool_size=DOCKER_MAX_POOL_SIZE)
         ver = _client.version().get("Version", "unknown")
         logger.info("Docker client connected (server v%s).", ver)
     return _client
 
 
+T = TypeVar("T")
+
+
+async def _run(op: str, fn: Callable[[], T], priority: int | None = None) -> T:
+    """Run a blocking Docker SDK call on the Docker executor, timed per operation."""
+    return await docker_executor.run(op, fn, priority)
+
+
+# Shared by every _fan_out call and sized like the Docker executor, so
+# concurrent creates / starts never add more threads than it has workers
+_fanout_pool: ThreadPoolExecutor | None = None
+_fanout_lock = threading.Lock()
+
+
+def _fan_out(fn: Callable[[Any], T], items: list, limit: int) -> list[T | Exception]:
+    """
+    fn over items, at most ``limit`` (capped at docker_executor.workers) at
+    once; results (or the exception) in order.
+    """
+    global _fanout_pool
+
+    def _safe(item):
+        try:
+            return fn(item)
+        except Exception as exc:
+            return exc
+    limit = min(limit, docker_executor.workers)
+    if limit <= 1 or len(items) <= 1:
+        return [_safe(i) for i in items]
+    with _fanout_lock:
+        if _fanout_pool is None:
+            _fanout_pool = ThreadPoolExecutor(max_workers=docker_executor.workers,
+                                              thread_name_prefix="docker-fanout")
+    results: list = [None] * len(items)
+    running: dict = {}
+    for index, item in enumerate(items):
+        if len(running) >= limit:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+        running[_fanout_pool.submit(_safe, item)] = index
+    for future, index in running.items():
+        results[index] = future.result()
+    return results
+
+
+def _inventory():
+    """The container inventory when it is live, else None (callers list from Docker)."""
+    from .inventory import inventory
+    return inventory if inventory.running else None
+
+
+def _note(container, reload: bool = False) -> None:
+    """Record a container we just created / started / renamed (reload = attrs are stale)."""
+    inv = _inventory()
+    if inv is not None:
+        if reload:
+            container.reload()
+        inv.upsert(container)
+
+
 # ── Restart ──────────────────────────────────────────────────────────
 async def restart_container(name: str = TARGET_CONTAINER, timeout: int = 10) -> str:
     logger.info("🔄 Restarting container '%s' (timeout=%ds)…", name, timeout)
@@ -44,7 +130,9 @@ async def restart_container(name: str = TARGET_CONTAINER, timeout: int = 10) ->
         try:
             container = client.containers.get(name)
         except NotFound:
-            available = [c.name for c in client.containers.list(all=True)]
+            inv = _inventory()
+            available = ([i.name for i in inv.list(running_only=False)] if inv is not None
+                         else [c.name for c in client.containers.list(all=True)])
             raise RuntimeError(f"Container '{name}' not found. Available: {available}")
         pre = container.status
         try:
@@ -52,14 +140,19 @@ async def restart_container(name: str = TARGET_CONTAINER, timeout: int = 10) ->
         except APIError as exc:
             raise RuntimeError(f"Docker API error restarting '{name}': {exc}")
         container.reload()
+        _note(container)
         logger.info("Container '%s': %s → %s", name, pre, container.status)
         return container.status
 
-    return await asyncio.to_thread(_restart)
+    return await _run("restart", _restart)
 
 
 # ── Container logs ───────────────────────────────────────────────────
 async def get_container_logs(name: str = TARGET_CONTAINER, tail: int = 50) -> str:
+    from .log_tailer import log_tailer
+    if log_tailer.running and log_tailer.covers(name, tail):  # followed: served from memory
+        return log_tailer.text(name, lines=tail)
+
     def _logs() -> str:
         client = _get_client()
         try:
@@ -69,11 +162,15 @@ async def get_container_logs(name: str = TARGET_CONTAINER, tail: int = 50) -> st
         raw = container.logs(tail=tail, timestamps=True)
         return raw.decode("utf-8", errors="replace")
 
-    return await asyncio.to_thread(_logs)
+    return await _run("logs", _logs)
 
 
 # ── List running containers ──────────────────────────────────────────
 async def list_running_containers() -> list[dict]:
+    inv = _inventory()
+    if inv is not None:
+        return [i.as_row() for i in inv.list()]
+
     def _list() -> list[dict]:
         client = _get_client()
         return [
@@ -85,12 +182,71 @@ async def list_running_containers() -> list[dict]:
             }
             for c in client.containers.list()
         ]
-    return await asyncio.to_thread(_list)
+    return await _run("list", _list)
 
 
 # ── Live metrics for a container ─────────────────────────────────────
+def _uptime(started_at: str) -> float:
+    import dateutil.parser
+    from datetime import datetime, timezone
+    try:
+        start_time = dateutil.parser.isoparse(started_at)
+        return (datetime.now(timezone.utc) - start_time).total_seconds()
+    except Exception:
+        return 0.0
+
+
+def metrics_from_stats(name: str, stats: dict, status: str = "running",
+                       started_at: str = "", image: str = "unknown") -> ContainerMetrics:
+    """ContainerMetrics from one Docker stats sample (one-shot or streamed)."""
+    cpu, precpu = stats.get("cpu_stats") or {}, stats.get("precpu_stats") or {}
+
+    # CPU calculation
+    cpu_delta = (
+        (cpu.get("cpu_usage") or {}).get("total_usage", 0)
+        - (precpu.get("cpu_usage") or {}).get("total_usage", 0)
+    )
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    num_cpus = cpu.get("online_cpus", 1) or 1
+    cpu_pct = (cpu_delta / system_delta * num_cpus * 100.0) if system_delta > 0 else 0.0
+
+    # Memory
+    memory = stats.get("memory_stats") or {}
+    mem_usage = memory.get("usage", 0)
+    mem_limit = memory.get("limit", 1)
+    mem_mb = mem_usage / (1024 * 1024)
+    mem_limit_mb = mem_limit / (1024 * 1024)
+    mem_pct = (mem_usage / mem_limit * 100.0) if mem_limit > 0 else 0.0
+
+    # Network
+    networks = stats.get("networks") or {}
+    rx = sum(v.get("rx_bytes", 0) for v in networks.values())
+    tx = sum(v.get("tx_bytes", 0) for v in networks.values())
+
+    return ContainerMetrics(
+        name=name,
+        cpu_percent=round(cpu_pct, 2),
+        memory_mb=round(mem_mb, 1),
+        memory_limit_mb=round(mem_limit_mb, 1),
+        memory_percent=round(mem_pct, 2),
+        net_rx_bytes=rx,
+        net_tx_bytes=tx,
+        status=status,
+        uptime_seconds=round(_uptime(started_at), 0),
+        image=image,
+    )
+
+
 async def get_container_metrics(name: str) -> Optional[ContainerMetrics]:
-    """Get CPU, memory, network stats for a single container."""
+    """Get CPU, memory, network stats for a single container (one-shot, ~1–2 s)."""
+    inv = _inventory()
+    if inv is not None:
+        info = inv.get(name)
+        if info is None:
+            return None
+        if info.status != "running":  # no daemon round-trip for stopped containers
+            return ContainerMetrics(name=name, status=info.status)
+
     def _metrics() -> Optional[ContainerMetrics]:
         client = _get_client()
         try:
@@ -106,181 +262,881 @@ async def get_container_metrics(name: str) -> Optional[ContainerMetrics]:
         except Exception:
             return ContainerMetrics(name=name, status=container.status)
 
-        # CPU calculation
-        cpu_delta = (
-            stats["cpu_stats"]["cpu_usage"]["total_usage"]
-            - stats["precpu_stats"]["cpu_usage"]["total_usage"]
-        )
-        system_delta = (
-            stats["cpu_stats"]["system_cpu_usage"]
-            - stats["precpu_stats"]["system_cpu_usage"]
-        )
-        num_cpus = stats["cpu_stats"].get("online_cpus", 1) or 1
-        cpu_pct = (cpu_delta / system_delta * num_cpus * 100.0) if system_delta > 0 else 0.0
-
-        # Memory
-        mem_usage = stats["memory_stats"].get("usage", 0)
-        mem_limit = stats["memory_stats"].get("limit", 1)
-        mem_mb = mem_usage / (1024 * 1024)
-        mem_limit_mb = mem_limit / (1024 * 1024)
-        mem_pct = (mem_usage / mem_limit * 100.0) if mem_limit > 0 else 0.0
-
-        # Network
-        networks = stats.get("networks", {})
-        rx = sum(v.get("rx_bytes", 0) for v in networks.values())
-        tx = sum(v.get("tx_bytes", 0) for v in networks.values())
-
-        # Uptime
-        import dateutil.parser
-        started = container.attrs.get("State", {}).get("StartedAt", "")
-        try:
-            start_time = dateutil.parser.isoparse(started)
-            from datetime import datetime, timezone
-            uptime = (datetime.now(timezone.utc) - start_time).total_seconds()
-        except Exception:
-            uptime = 0.0
-
-        image = container.image.tags[0] if container.image.tags else "unknown"
-
-        return ContainerMetrics(
-            name=name,
-            cpu_percent=round(cpu_pct, 2),
-            memory_mb=round(mem_mb, 1),
-            memory_limit_mb=round(mem_limit_mb, 1),
-            memory_percent=round(mem_pct, 2),
-            net_rx_bytes=rx,
-            net_tx_bytes=tx,
-            status=container.status,
-            uptime_seconds=round(uptime, 0),
-            image=image,
+        return metrics_from_stats(
+            name, stats, status=container.status,
+            started_at=container.attrs.get("State", {}).get("StartedAt", ""),
+            image=container.image.tags[0] if container.image.tags else "unknown",
         )
 
-    return await asyncio.to_thread(_metrics)
+    return await _run("stats", _metrics)
 
 
 async def get_all_metrics() -> list[ContainerMetrics]:
-    """Get metrics for ALL running containers."""
+    """
+    Get metrics for ALL running containers. Served from the streaming
+    collector's snapshot when it is running; one-shot stats otherwise.
+    """
+    from .stats_collector import stats_collector
+    if stats_collector.running:
+        return stats_collector.snapshot()
     containers = await list_running_containers()
     tasks = [get_container_metrics(c["name"]) for c in containers]
     results = await asyncio.gather(*tasks, return_exceptions=True)
     return [r for r in results if isinstance(r, ContainerMetrics)]
 
 
-# ── Auto-Scaling: spawn replicas ─────────────────────────────────────
-async def scale_up(
+# ── Speculative scale-up (prepare → controller commit | rollback) ────
+@dataclass
+class ScalePlan:
+    """
+    Replicas created (not started) and an upstream staged while the
+    council deliberates. Only replicas missing from the live set are
+    created. Exactly one of ScalingController.scale_to / rollback_scale_up
+    consumes it.
+    """
+    base_name: str
+    count: int
+    token: str = field(default_factory=lambda: uuid.uuid4().hex[:6])
+    image: str = ""
+    staged: list[tuple[Any, str]] = field(default_factory=list)   # (created container, final name)
+    upstream: list[str] = field(default_factory=list)             # replica set the staged file routes to
+    nginx_staged: bool = False
+    settled: bool = False
+
+    @property
+    def final_names(self) -> list[str]:
+        return [final for _, final in self.staged]
+
+
+async def prepare_scale_up(
     base_name: str = TARGET_CONTAINER,
     count: int = 2,
     network: str = "aegis-network",
-) -> ScaleEvent:
-    """
-    Clone the target container into N replicas.
-    Each replica gets a unique name: buggy-app-replica-1, buggy-app-replica-2, ...
-    """
-    count = min(count, MAX_REPLICAS)
-    logger.info("⚡ Scaling UP: spawning %d replicas of '%s'", count, base_name)
+) -> ScalePlan:
+    """Resolve the image, create stopped replicas and stage their upstream."""
+    plan = ScalePlan(base_name=base_name, count=min(count, MAX_REPLICAS))
+    logger.info("🧪 Preparing %d replica(s) of '%s' (plan %s)…",
+                plan.count, base_name, plan.token)
 
-    def _scale() -> ScaleEvent:
+    def _prepare() -> ScalePlan:
         client = _get_client()
-        event = ScaleEvent(container_base=base_name, replica_count=count)
-
         try:
             source = client.containers.get(base_name)
-            image = source.image.tags[0] if source.image.tags else source.image.id
         except NotFound:
             raise RuntimeError(f"Source container '{base_name}' not found for scaling")
+        plan.image = source.image.tags[0] if source.image.tags else source.image.id
+        env = source.attrs.get("Config", {}).get("Env", [])
 
-        for i in range(1, count + 1):
-            replica_name = f"{base_name}-replica-{i}"
+        running = _replica_indices(client, base_name, running_only=True)
+        missing = [i for i in range(1, plan.count + 1) if i not in running]
+        # Warm-pool containers are claimed at commit; only stage what they can't cover
+        pooled = min(len(missing), warm_pool.available(base_name))
 
-            # Remove stale replica if exists
-            try:
-                old = client.containers.get(replica_name)
-                old.remove(force=True)
-            except NotFound:
-                pass
+        def _create(i: int):
+            container = client.containers.create(
+                plan.image,
+                name=f"{base_name}-replica-{i}-staged-{plan.token}",
+                network=network,
+                restart_policy={"Name": "unless-stopped"},
+                environment=env,
+                labels={REPLICA_LABEL: base_name},
+            )
+            _note(container)
+            return container
 
-            try:
-                replica = client.containers.run(
-                    image,
-                    name=replica_name,
-                    detach=True,
-                    network=network,
-                    restart_policy={"Name": "unless-stopped"},
-                    environment=source.attrs.get("Config", {}).get("Env", []),
-                )
-                event.replicas.append(replica_name)
-                logger.info("  ✅ Spawned replica: %s", replica_name)
-            except Exception as exc:
-                logger.error("  ❌ Failed to spawn %s: %s", replica_name, exc)
+        to_stage = missing[pooled:]
+        results = _fan_out(_create, to_stage, SCALE_SPAWN_CONCURRENCY)
+        for i, container in zip(to_stage, results):
+            if not isinstance(container, Exception):
+                plan.staged.append((container, f"{base_name}-replica-{i}"))
+        failed = next((r for r in results if isinstance(r, Exception)), None)
+        if failed is not None:
+            _remove_staged(plan)
+            raise failed
 
-        return event
+        if missing:  # nothing missing → the upstream won't change either
+            plan.upstream = [f"{base_name}-replica-{i}" for i in range(1, plan.count + 1)]
+            plan.nginx_staged = _stage_upstream(client, base_name, plan.upstream, plan.token)
+        return plan
 
-    event = await asyncio.to_thread(_scale)
-    return event
+    return await _run("scale_prepare", _prepare)
 
 
-async def scale_down(base_name: str = TARGET_CONTAINER) -> list[str]:
-    """Remove all replicas of the target container."""
-    logger.info("📉 Scaling DOWN: removing replicas of '%s'", base_name)
+async def rollback_scale_up(plan: ScalePlan) -> None:
+    """Discard a plan that will not be committed. Safe to call twice."""
+    if plan.settled:
+        return
+    plan.settled = True
+    logger.info("↩️  Rolling back scale plan %s", plan.token)
 
-    def _scale_down() -> list[str]:
+    def _rollback() -> None:
         client = _get_client()
-        removed = []
-        for c in client.containers.list(all=True):
-            if c.name.startswith(f"{base_name}-replica-"):
-                c.remove(force=True)
-                removed.append(c.name)
-                logger.info("  🗑️ Removed: %s", c.name)
-        return removed
+        _remove_staged(plan)
+        if plan.nginx_staged:
+            _discard_upstream(client, plan.token)
+
+    await _run("scale_rollback", _rollback)
 
-    return await asyncio.to_thread(_scale_down)
+
+def _replica_indices(client: docker.DockerClient, base_name: str,
+                     running_only: bool = False) -> dict[int, Any]:
+    """
+    {index: container} for ``{base}-replica-<n>`` among containers labelled as
+    replicas of ``base_name`` (staged / warm copies excluded). Entries are
+    inventory ContainerInfo when it is live, SDK containers otherwise.
+    """
+    prefix = f"{base_name}-replica-"
+    found: dict[int, Any] = {}
+    inv = _inventory()
+    if inv is not None:
+        labelled = inv.by_label(REPLICA_LABEL, base_name)
+    else:
+        labelled = client.containers.list(all=True, filters={"label": f"{REPLICA_LABEL}={base_name}"})
+    for c in labelled:
+        suffix = c.name[len(prefix):] if c.name.startswith(prefix) else ""
+        if suffix.isdigit() and (c.status == "running" or not running_only):
+            found[int(suffix)] = c
+    return found
+
+
+def _remove_staged(plan: ScalePlan) -> None:
+    for container, _ in plan.staged:
+        _remove_quietly(container)
+
+
+def _remove_quietly(container) -> None:
+    try:
+        container.remove(force=True)
+    except NotFound:
+        pass
+    except Exception as exc:
+        logger.warning("Could not remove %s: %s", container.name, exc)
+        return
+    inv = _inventory()
+    if inv is not None:
+        inv.discard(container.id)
+
+
+def _resolve(client: docker.DockerClient, entry) -> Any:
+    """SDK container for an inventory entry (SDK containers pass through)."""
+    if hasattr(entry, "remove"):
+        return entry
+    try:
+        return client.containers.get(entry.id)
+    except NotFound:
+        return None
 
 
 # ── Nginx upstream reconfiguration ───────────────────────────────────
+def _render_upstream(base_name: str, replicas: list[str] | None) -> str:
+    servers = [f"    server {base_name}:8000;"]
+    for r in replicas or []:
+        servers.append(f"    server {r}:8000;")
+    return "upstream buggy_app {\n" + "\n".join(servers) + "\n}\n"
+
+
+def _staged_conf_path(token: str) -> str:
+    # Not *.conf, so nginx never includes it before the commit
+    return f"{NGINX_CONF_PATH}.staged-{token}"
+
+
+def _put_file(container, path: str, text: str) -> None:
+    import io
+    import tarfile
+    tar_stream = io.BytesIO()
+    with tarfile.open(fileobj=tar_stream, mode="w") as tar:
+        data = text.encode()
+        info = tarfile.TarInfo(name=posixpath.basename(path))
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+    tar_stream.seek(0)
+    container.put_archive(posixpath.dirname(path), tar_stream)
+
+
+def _discard_upstream(client: docker.DockerClient, token: str) -> None:
+    try:
+        nginx = client.containers.get(NGINX_CONTAINER)
+        nginx.exec_run(["rm", "-f", _staged_conf_path(token)])
+    except Exception as exc:
+        logger.debug("Staged upstream cleanup failed: %s", exc)
+
+
+def _stage_upstream(client: docker.DockerClient, base_name: str,
+                    replicas: list[str], token: str) -> bool:
+    try:
+        nginx = client.containers.get(NGINX_CONTAINER)
+        _put_file(nginx, _staged_conf_path(token), _render_upstream(base_name, replicas))
+        return True
+    except Exception as exc:
+        logger.debug("Could not stage upstream (%s) – will write it on commit", exc)
+        return False
+
+
 async def reconfigure_nginx(
     base_name: str = TARGET_CONTAINER,
     replicas: list[str] | None = None,
+    plan: ScalePlan | None = None,
 ) -> bool:
     """
-    Write new upstream config into the Nginx container and reload.
-    Returns True if successful.
+    Route the load balancer to ``base_name`` + ``replicas`` (see UpstreamManager:
+    no-op writes skipped, validated swap with rollback, bursts debounced).
+    With a ``plan`` staged for exactly this replica set, the staged file
+    is moved into place instead of being rendered and uploaded again.
+    Returns True if nginx serves this set.
     """
-    logger.info("🔧 Reconfiguring Nginx load balancer…")
+    return await lb.apply(base_name, replicas or [], plan)
 
-    def _reconfigure() -> bool:
+
+def _parse_upstream(text: str) -> list[str]:
+    return [line.split()[1].rsplit(":", 1)[0] for line in text.splitlines()
+            if line.strip().startswith("server ")]
+
+
+class UpstreamManager:
+    """
+    Owns nginx's upstream file and remembers what it routes to.
+
+      • diff      – the rendered file is compared with the last one applied;
+                    identical → no upload, no reload
+      • swap      – the new file is uploaded next to the live one, then one
+                    exec backs up, renames into place (atomic), runs
+                    `nginx -t` and reloads; a failed test or reload restores
+                    the backup, so nginx never runs a broken config
+      • debounce  – a change right after a reload waits out the rest of
+                    LB_DEBOUNCE_MS; calls arriving meanwhile collapse into one
+                    write + reload of the latest set (a lone change is applied
+                    at once). The flusher runs until nothing is pending, and
+                    each caller gets the result of the write that carried its
+                    set. The scaler already serialises one service's
+                    reconciles, so in practice this rate-limits reloads more
+                    than it merges them
+      • servers   – the upstream set nginx was last confirmed to serve
+                    (loaded from the live file on first use), for /topology
+    """
+
+    def __init__(self, debounce_secs: float = LB_DEBOUNCE_SECS) -> None:
+        self.debounce_secs = debounce_secs
+        self.servers: list[str] | None = None
+        self._text: str | None = None
+        self._pending: tuple[str, list[str], ScalePlan | None] | None = None
+        self._superseded: list[ScalePlan] = []
+        self._waiters: list[asyncio.Future] = []
+        self._flush: asyncio.Task | None = None
+        self._last_flush = 0.0
+        self.applied = 0
+        self.skipped = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    async def apply(self, base_name: str, replicas: list[str], plan: ScalePlan | None = None) -> bool:
+        if self._pending is not None:
+            self.coalesced += 1
+            if self._pending[2] is not None:
+                self._superseded.append(self._pending[2])
+        self._pending = (base_name, list(replicas), plan)
+        done = asyncio.get_running_loop().create_future()
+        self._waiters.append(done)
+        if self._flush is None or self._flush.done():
+            self._flush = asyncio.create_task(self._debounced())
+        return await done
+
+    async def load(self) -> list[str] | None:
+        """Read the live upstream file (once), so routing is known before the first change."""
+        if self.servers is None:
+            def _read() -> str | None:
+                nginx = _get_client().containers.get(NGINX_CONTAINER)
+                result = nginx.exec_run(["cat", NGINX_CONF_PATH])
+                return result.output.decode() if result.exit_code == 0 and result.output else None
+            try:
+                text = await _run("nginx_read", _read)
+            except Exception as exc:
+                logger.debug("Could not read upstream file: %s", exc)
+                return None
+            if text and self.servers is None:
+                self._text, self.servers = text, _parse_upstream(text)
+        return self.servers
+
+    def snapshot(self) -> dict:
+        return {
+            "servers": self.servers, "applied": self.applied, "skipped": self.skipped,
+            "coalesced": self.coalesced, "rejected": self.rejected,
+        }
+
+    async def _debounced(self) -> None:
+        """Write the latest pending set until none is left; settle each batch's callers."""
+        while self._pending is not None:
+            try:
+                await asyncio.sleep(max(0.0, self._last_flush + self.debounce_secs - time.monotonic()))
+                await asyncio.sleep(0)  # let callers of the same tick join
+            except asyncio.CancelledError:
+                self._pending = None
+                _settle_all(self._waiters, cancel=True)
+                self._waiters = []
+                raise
+            pending, self._pending = self._pending, None
+            superseded, self._superseded = self._superseded, []
+            waiters, self._waiters = self._waiters, []
+            try:
+                ok = await self._write(*pending, superseded)
+            except asyncio.CancelledError:
+                _settle_all(waiters + self._waiters, cancel=True)
+                self._pending, self._waiters = None, []
+                raise
+            except Exception as exc:
+                _settle_all(waiters, error=exc)
+                continue
+            _settle_all(waiters, result=ok)
+
+    async def _write(self, base_name: str, replicas: list[str], plan: ScalePlan | None,
+                     superseded: list[ScalePlan]) -> bool:
+        text = _render_upstream(base_name, replicas)
+        unchanged = text == self._text
+        use_staged = (not unchanged and plan is not None and plan.nginx_staged
+                      and plan.upstream == replicas)
+        stale = [p for p in superseded + [plan] if p is not None and p.nginx_staged and
+                 not (p is plan and use_staged)]
+
+        if unchanged:
+            self.skipped += 1
+            if stale:
+                await _run("nginx_discard", lambda: [_discard_upstream(_get_client(), p.token)
+                                                     for p in stale])
+            logger.info("🔧 Nginx upstream unchanged (%d servers) – no reload", 1 + len(replicas))
+            return True
+
+        logger.info("🔧 Reconfiguring Nginx load balancer…")
+        ok = await _run("nginx_reconfigure",
+                        lambda: self._swap(text, plan.token if use_staged else None, stale))
+        self._last_flush = time.monotonic()
+        if ok:
+            self._text, self.servers = text, _parse_upstream(text)
+            self.applied += 1
+            logger.info("✅ Nginx reloaded with %d upstream servers", 1 + len(replicas))
+        else:
+            self.rejected += 1
+        return ok
+
+    def _swap(self, text: str, staged_token: str | None, stale: list[ScalePlan]) -> bool:
         client = _get_client()
         try:
             nginx = client.containers.get(NGINX_CONTAINER)
         except NotFound:
             logger.warning("Nginx container '%s' not found – skipping LB config", NGINX_CONTAINER)
             return False
+        for p in stale:
+            _discard_upstream(client, p.token)
+
+        conf = NGINX_CONF_PATH
+        if staged_token is not None:
+            incoming = _staged_conf_path(staged_token)
+        else:
+            incoming = f"{conf}.next"  # not *.conf – never included half-written
+            _put_file(nginx, incoming, text)
+        script = (
+            f"cp -f {conf} {conf}.bak 2>/dev/null; mv -f {incoming} {conf} && "
+            f"if nginx -t 2>&1; then nginx -s reload 2>&1 || {{ mv -f {conf}.bak {conf}; exit 4; }}; "
+            f"else mv -f {conf}.bak {conf}; exit 3; fi"
+        )
+        result = nginx.exec_run(["sh", "-c", script])
+        if result.exit_code != 0:
+            output = (result.output or b"").decode(errors="replace").strip()
+            logger.error("❌ Nginx rejected the new upstream (exit %s) – rolled back: %s",
+                         result.exit_code, output[-300:])
+            return False
+        return True
+
+
+def _settle_all(waiters: list[asyncio.Future], result: bool = False,
+                error: Exception | None = None, cancel: bool = False) -> None:
+    for w in waiters:
+        if w.done():
+            continue  # caller gave up
+        if cancel:
+            w.cancel()
+        elif error is not None:
+            w.set_exception(error)
+        else:
+            w.set_result(result)
+
+
+def _source(client: docker.DockerClient, service: str) -> tuple[str, list]:
+    """(image, env) new replicas of ``service`` are created from."""
+    try:
+        source = client.containers.get(service)
+    except NotFound:
+        raise RuntimeError(f"Source container '{service}' not found for scaling")
+    image = source.image.tags[0] if source.image.tags else source.image.id
+    return image, source.attrs.get("Config", {}).get("Env", [])
+
+
+# ── Warm standby pool ────────────────────────────────────────────────
+class WarmPool:
+    """
+    Stopped replicas created ahead of demand, WARM_POOL_SIZE per service.
+    Claiming one is rename + start – no image resolution, layer or network
+    endpoint setup – so an approved SCALE_UP serves in about a start's time.
+    The pool refills in the background after every claim, drops containers
+    built from an outdated image, and adopts `{service}-warm-*` containers
+    left by a previous agent run.
+    """
+
+    def __init__(self, size: int = WARM_POOL_SIZE, network: str = "aegis-network",
+                 concurrency: int = SCALE_SPAWN_CONCURRENCY) -> None:
+        self.size = size
+        self.network = network
+        self.concurrency = concurrency
+        self._lock = threading.Lock()
+        self._ready: dict[str, list[Any]] = {}
+        self._fills: dict[str, asyncio.Task] = {}
+        self.created = 0
+        self.claimed = 0
+
+    def available(self, service: str) -> int:
+        with self._lock:
+            return len(self._ready.get(service, []))
+
+    def take(self, service: str, count: int) -> list[Any]:
+        """Claim up to ``count`` stopped containers (thread-safe)."""
+        if count <= 0:
+            return []
+        with self._lock:
+            ready = self._ready.get(service, [])
+            taken, self._ready[service] = ready[:count], ready[count:]
+        self.claimed += len(taken)
+        return taken
+
+    def refill_soon(self, service: str) -> None:
+        """Top the pool up in the background (no-op when disabled or already filling)."""
+        if self.size <= 0:
+            return
+        task = self._fills.get(service)
+        if task is None or task.done():
+            self._fills[service] = asyncio.create_task(self.fill(service), name=f"warm-{service}")
+
+    async def fill(self, service: str) -> int:
+        try:
+            return await _run("warm_fill", lambda: self._fill_sync(service))
+        except Exception as exc:
+            logger.warning("⚠️ Warm pool fill for %s failed: %s", service, exc)
+            return 0
+
+    async def close(self) -> None:
+        """Stop refilling; pooled containers stay for the next run to adopt."""
+        for task in self._fills.values():
+            task.cancel()
+        await asyncio.gather(*self._fills.values(), return_exceptions=True)
+        self._fills = {}
+
+    def status(self) -> dict:
+        with self._lock:
+            ready = {svc: len(c) for svc, c in self._ready.items()}
+        return {"size": self.size, "ready": ready, "created": self.created, "claimed": self.claimed}
 
-        # Build upstream list: original + replicas
-        servers = [f"    server {base_name}:8000;"]
-        if replicas:
-            for r in replicas:
-                servers.append(f"    server {r}:8000;")
+    def _fill_sync(self, service: str) -> int:
+        client = _get_client()
+        image, env = _source(client, service)
+        prefix = f"{service}-warm-"
+        with self._lock:
+            first = service not in self._ready
+            ready = self._ready.setdefault(service, [])
+        if first:  # adopt what a previous run left behind
+            labelled = client.containers.list(
+                all=True, filters={"label": f"{REPLICA_LABEL}={service}", "status": "created"})
+            adopted = [c for c in labelled if c.name.startswith(prefix)]
+            with self._lock:
+                ready.extend(adopted)
+
+        with self._lock:
+            stale = [c for c in ready if _image_of(c) != image]
+            surplus = [c for c in ready if c not in stale][self.size:]
+            ready[:] = [c for c in ready if c not in stale and c not in surplus]
+            missing = self.size - len(ready)
+        for c in stale + surplus:
+            _remove_quietly(c)
+
+        def _create(_: int):
+            container = client.containers.create(
+                image, name=f"{prefix}{uuid.uuid4().hex[:6]}", network=self.network,
+                restart_policy={"Name": "unless-stopped"}, environment=env,
+                labels={REPLICA_LABEL: service},
+            )
+            _note(container)
+            return container
+
+        made = [c for c in _fan_out(_create, list(range(missing)), self.concurrency)
+                if not isinstance(c, Exception)]
+        with self._lock:
+            ready.extend(made)
+        self.created += len(made)
+        if made:
+            logger.info("🧊 Warm pool %s: +%d (ready %d/%d)", service, len(made), len(ready), self.size)
+        return len(made)
+
+
+def _image_of(container) -> str:
+    image = (container.attrs.get("Config") or {}).get("Image")
+    if image:
+        return image
+    return container.image.tags[0] if container.image.tags else container.image.id
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Scaling controller – desired state, cooldown, hysteresis, history
+# ═══════════════════════════════════════════════════════════════════════
+
+class ScalingController:
+    """
+    Owns the desired replica count per service and reconciles Docker to it.
 
-        upstream_conf = (
-            "upstream buggy_app {\n"
-            + "\n".join(servers)
-            + "\n}\n"
+      • Scale-up requests raise the desired count immediately; a request
+        for no more than is already desired is a no-op (no churn).
+      • Scale-down waits for SCALE_COOLDOWN_SECS of quiet since the last
+        change *and* the last scale-up demand (hysteresis) unless forced.
+      • Concurrent requests for a service share one reconciliation: it
+        re-runs until the live set matches the latest desired count, and
+        nginx reloads only when the replica set actually changed.
+      • Every decision (applied, no-op, deferred) lands in the history.
+      • Missing replicas start concurrently (at most ``spawn_concurrency``
+        at once), preferring plan-staged containers, then the warm pool.
+      • With shared state attached, reconciliation holds the service's
+        lease and desired count / cooldown stamps live in a shared record,
+        so workers never undo each other's scaling.
+    """
+
+    def __init__(
+        self,
+        cooldown: float = SCALE_COOLDOWN_SECS,
+        max_replicas: int = MAX_REPLICAS,
+        network: str = "aegis-network",
+        history: int = 100,
+        spawn_concurrency: int = SCALE_SPAWN_CONCURRENCY,
+        pool: WarmPool | None = None,
+    ) -> None:
+        self.cooldown = cooldown
+        self.max_replicas = max_replicas
+        self.network = network
+        self.spawn_concurrency = spawn_concurrency
+        self.pool = pool if pool is not None else warm_pool
+        self._desired: dict[str, int] = {}
+        self._replicas: dict[str, list[str]] = {}
+        self._last_change: dict[str, float] = {}
+        self._last_up_demand: dict[str, float] = {}
+        self._plans: dict[str, list[ScalePlan]] = {}
+        self._waiting: dict[str, list[str]] = {}
+        self._reconcilers: dict[str, asyncio.Task] = {}
+        self._explicit: set[str] = set()      # a pending request may lower desired
+        self._history: deque[ScaleEvent] = deque(maxlen=history)
+        self._shared = None
+
+    def attach(self, shared) -> None:
+        """Share desired state with, and serialize reconciles against, other workers."""
+        self._shared = shared if shared.distributed else None
+
+    # ── Requests ─────────────────────────────────────────────────────
+    async def scale_to(
+        self,
+        service: str,
+        desired: int,
+        *,
+        reason: str = "",
+        incident_id: str | None = None,
+        plan: ScalePlan | None = None,
+        at_least: bool = False,
+        force: bool = False,
+    ) -> ScaleEvent:
+        """
+        Ask for ``desired`` replicas; returns the event that settled it.
+        ``at_least`` (SCALE_UP verdicts) never lowers the desired count.
+        """
+        desired = max(0, min(desired, self.max_replicas))
+        try:
+            await self._refresh(service)
+        except BaseException:
+            # The plan is still ours until it is queued for a reconcile
+            if plan is not None:
+                await rollback_scale_up(plan)
+            raise
+
+        now = time.monotonic()
+        current = self._desired[service]
+        if at_least:
+            desired = max(desired, current)
+        if desired >= current:
+            self._last_up_demand[service] = now
+        elif not force and self.cooldown_remaining(service) > 0:
+            event = self._record(service, current, "deferred", reason, [incident_id],
+                                 note=f"scale-down to {desired} held for cooldown "
+                                      f"({self.cooldown_remaining(service):.1f}s left)")
+            if plan is not None:
+                await rollback_scale_up(plan)
+            return event
+        self._desired[service] = desired
+        if not at_least:
+            self._explicit.add(service)
+
+        if plan is not None:
+            self._plans.setdefault(service, []).append(plan)
+        self._waiting.setdefault(service, []).append(incident_id or reason or "manual")
+
+        task = self._reconcilers.get(service)
+        if task is None or task.done():
+            task = self._reconcilers[service] = asyncio.create_task(
+                self._reconcile_loop(service, reason), name=f"scale-{service}",
+            )
+        return await asyncio.shield(task)
+
+    async def scale_by(self, service: str, delta: int, **kwargs: Any) -> ScaleEvent:
+        """Move the desired count by ``delta`` (e.g. -1 per SCALE_DOWN verdict)."""
+        await self._refresh(service)
+        return await self.scale_to(service, self._desired[service] + delta, **kwargs)
+
+    def cooldown_remaining(self, service: str) -> float:
+        last = max(self._last_change.get(service, -1e9), self._last_up_demand.get(service, -1e9))
+        return max(0.0, self.cooldown - (time.monotonic() - last))
+
+    # ── Shared state ─────────────────────────────────────────────────
+    async def _refresh(self, service: str) -> None:
+        """Know the service's state before deciding: local discovery, then the shared record."""
+        if service not in self._desired:
+            await self._discover(service)
+        if self._shared is None:
+            return
+        record = await self._shared.load_state(f"scale:{service}")
+        if record is None:
+            return
+        # Monotonic clocks differ per process – the record holds wall-clock stamps
+        offset = time.monotonic() - time.time()
+        for stamps, name in ((self._last_change, "last_change"),
+                             (self._last_up_demand, "last_up_demand")):
+            if record.get(name) is not None:
+                stamps[service] = max(stamps.get(service, -1e9), record[name] + offset)
+        self._replicas[service] = record["replicas"]
+        task = self._reconcilers.get(service)
+        if task is None or task.done():
+            self._desired[service] = record["desired"]
+        elif service not in self._explicit:
+            self._desired[service] = max(self._desired[service], record["desired"])
+
+    async def _publish(self, service: str) -> None:
+        offset = time.time() - time.monotonic()
+        await self._shared.save_state(f"scale:{service}", {
+            "desired": self._desired[service],
+            "replicas": self._replicas.get(service, []),
+            "last_change": (self._last_change[service] + offset
+                            if service in self._last_change else None),
+            "last_up_demand": (self._last_up_demand[service] + offset
+                               if service in self._last_up_demand else None),
+        })
+
+    def _lease(self, service: str):
+        if self._shared is None:
+            return contextlib.nullcontext()
+        return self._shared.lock(f"scale:{service}")
+
+    # ── Reconciliation ───────────────────────────────────────────────
+    async def _discover(self, service: str) -> None:
+        """Adopt replicas that already exist (e.g. after an agent restart)."""
+        def _live() -> list[str]:
+            found = _replica_indices(_get_client(), service, running_only=True)
+            return [found[i].name for i in sorted(found)]
+        live = await _run("list", _live, priority=REMEDIATION)
+        self._replicas[service] = live
+        self._desired.setdefault(service, len(live))
+
+    async def _reconcile_loop(self, service: str, reason: str) -> ScaleEvent:
+        me = asyncio.current_task()
+        try:
+            async with self._lease(service):
+                try:
+                    return await self._reconcile_leased(service, reason)
+                except BaseException:
+                    await self._rollback_leftovers(service)
+                    raise
+                finally:
+                    # Releasing a shared lease awaits: a request arriving meanwhile
+                    # must start its own reconcile, not join this finished one
+                    if self._reconcilers.get(service) is me:
+                        del self._reconcilers[service]
+        except BaseException:
+            if self._reconcilers.get(service) is me:  # never got the lease
+                await self._rollback_leftovers(service)
+            raise
+
+    async def _rollback_leftovers(self, service: str) -> None:
+        """Plans that never reached a reconcile round are still ours to undo."""
+        for p in self._plans.pop(service, []):
+            await rollback_scale_up(p)
+
+    async def _reconcile_leased(self, service: str, reason: str) -> ScaleEvent:
+        merged: list[str] = []
+        started: list[str] = []
+        removed: list[str] = []
+        lb_configured = False
+        target = self._desired[service]
+        # Requests that arrived mid-reconcile (new target or plans to settle) → go again
+        while not merged or self._waiting.get(service):
+            if self._shared is not None:
+                # Another worker may have scaled while we waited for the lease
+                await self._refresh(service)
+            self._explicit.discard(service)
+            target = self._desired[service]
+            plans = self._plans.pop(service, [])
+            waiting = self._waiting.pop(service, [])
+            merged.extend(waiting)
+            before = list(self._replicas.get(service, []))
+            try:
+                replicas, up, down, used = await _run(
+                    "scale_reconcile", lambda: self._reconcile_sync(service, target, plans),
+                )
+            except Exception:
+                for p in plans:
+                    await rollback_scale_up(p)
+                raise
+            for p in plans:
+                p.settled = True
+            self._replicas[service] = replicas
+            started.extend(up)
+            removed.extend(down)
+
+            if up or down or replicas != before:
+                self._last_change[service] = time.monotonic()
+                lb_configured = await reconfigure_nginx(service, replicas, plan=used)
+            if self._shared is not None:
+                await self._publish(service)
+            logger.info("📐 %s: desired=%d live=%d (+%d/-%d, merged %d request(s))",
+                        service, target, len(replicas), len(up), len(down), len(waiting))
+
+        if started:
+            self.pool.refill_soon(service)
+        event = self._record(service, target, "applied" if started or removed else "noop",
+                             reason, merged, started=started, removed=removed)
+        event.lb_configured = lb_configured
+        return event
+
+    def _reconcile_sync(
+        self, service: str, desired: int, plans: list[ScalePlan],
+    ) -> tuple[list[str], list[str], list[str], ScalePlan | None]:
+        client = _get_client()
+        current = _replica_indices(client, service)
+        started: list[str] = []
+        removed: list[str] = []
+
+        # Surplus and dead replicas go first
+        for i, c in sorted(current.items()):
+            if i > desired or c.status != "running":
+                container = _resolve(client, c)
+                if container is not None:
+                    _remove_quietly(container)
+                removed.append(c.name)
+        keep = {i for i, c in current.items() if i <= desired and c.status == "running"}
+
+        staged: dict[str, Any] = {}
+        for plan in plans:
+            for container, final in plan.staged:
+                staged.setdefault(final, container)
+        used_ids: set[int] = set()
+
+        # Each missing replica: staged by a plan → warm pool → fresh container
+        jobs = [(i, f"{service}-replica-{i}") for i in range(1, desired + 1) if i not in keep]
+        sources = {name: staged[name] for _, name in jobs if name in staged}
+        pooled = iter(self.pool.take(service, len(jobs) - len(sources)))
+        for _, name in jobs:
+            if name not in sources:
+                sources[name] = next(pooled, None)
+        used_ids.update(id(c) for c in sources.values() if c is not None)
+        fresh = None
+        if any(c is None for c in sources.values()):
+            fresh = _source(client, service)
+
+        def _bring_up(name: str):
+            container = sources[name]
+            if container is not None:
+                container.rename(name)
+                container.start()
+                _note(container, reload=True)
+                return container
+            container = client.containers.run(
+                fresh[0], name=name, detach=True, network=self.network,
+                restart_policy={"Name": "unless-stopped"}, environment=fresh[1],
+                labels={REPLICA_LABEL: service},
+            )
+            _note(container)
+            return container
+
+        def _spawn(job: tuple[int, str]):
+            _, name = job
+            try:
+                try:
+                    return _bring_up(name)
+                except APIError as exc:
+                    if "Conflict" not in str(exc):
+                        raise
+                    # An unlabelled replica from an older agent holds the name: replace it once
+                    logger.warning("♻️ Replacing unlabelled replica %s", name)
+                    _remove_quietly(client.containers.get(name))
+                    return _bring_up(name)
+            except Exception:
+                if sources[name] is not None:
+                    _remove_quietly(sources[name])
+                raise
+
+        for (i, name), result in zip(jobs, _fan_out(_spawn, jobs, self.spawn_concurrency)):
+            if isinstance(result, Exception):
+                logger.error("  ❌ Failed to start %s: %s", name, result)
+                continue
+            started.append(name)
+            keep.add(i)
+            logger.info("  ✅ Started replica: %s", name)
+
+        replicas = [f"{service}-replica-{i}" for i in sorted(keep)]
+
+        # Settle plans: drop unused staged containers and stale upstream files
+        used_plan = next((p for p in plans if p.nginx_staged and p.upstream == replicas), None)
+        for plan in plans:
+            for container, _ in plan.staged:
+                if id(container) not in used_ids:
+                    _remove_quietly(container)
+            if plan.nginx_staged and plan is not used_plan:
+                _discard_upstream(client, plan.token)
+        return replicas, started, removed, used_plan
+
+    # ── History / introspection ──────────────────────────────────────
+    def _record(self, service: str, desired: int, outcome: str, reason: str,
+                incident_ids: list[str | None], note: str = "",
+                started: list[str] | None = None, removed: list[str] | None = None) -> ScaleEvent:
+        event = ScaleEvent(
+            container_base=service,
+            replica_count=desired,
+            replicas=list(self._replicas.get(service, [])),
+            outcome=outcome,
+            reason=note or reason,
+            started=started or [],
+            removed=removed or [],
+            incident_ids=[i for i in incident_ids if i],
         )
+        self._history.append(event)
+        return event
+
+    def snapshot(self) -> dict:
+        return {
+            "cooldown_secs": self.cooldown,
+            "distributed": self._shared is not None,
+            "warm_pool": self.pool.status(),
+            "services": {
+                svc: {
+                    "desired": self._desired[svc],
+                    "replicas": self._replicas.get(svc, []),
+                    "cooldown_remaining_secs": round(self.cooldown_remaining(svc), 1),
+                    "reconciling": not (self._reconcilers.get(svc) is None
+                                        or self._reconcilers[svc].done()),
+                }
+                for svc in self._desired
+            },
+            "history": [e.model_dump() for e in reversed(self._history)],
+        }
 
-        # Write config via exec
-        import io
-        import tarfile
-        tar_stream = io.BytesIO()
-        with tarfile.open(fileobj=tar_stream, mode="w") as tar:
-            data = upstream_conf.encode()
-            info = tarfile.TarInfo(name="upstream.conf")
-            info.size = len(data)
-            tar.addfile(info, io.BytesIO(data))
-        tar_stream.seek(0)
-
-        nginx.put_archive("/etc/nginx/conf.d/", tar_stream)
-        nginx.exec_run("nginx -s reload")
-        logger.info("✅ Nginx reloaded with %d upstream servers", len(servers))
-        return True
 
-    return await asyncio.to_thread(_reconfigure)
+# Singletons
+lb = UpstreamManager()
+warm_pool = WarmPool()
+scaler = ScalingController()
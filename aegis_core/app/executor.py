@@ -0,0 +1,241 @@
+"""
+AegisOps GOD MODE – Bounded remediation executor.
+
+Replaces fire-and-forget BackgroundTasks with a fixed pool of asyncio
+workers fed by a priority queue:
+  • At most REMEDIATION_WORKERS pipelines run concurrently
+  • At most REMEDIATION_QUEUE_SIZE incidents wait behind them (0 = unbounded)
+  • CRITICAL alerts jump ahead of WARNING / INFO alerts
+  • A full queue is reported to the caller (→ HTTP 429) instead of piling up
+  • An incident_id already queued or running is refused (→ HTTP 409)
+  • Shutdown drains queued + in-flight work before cancelling workers
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as _dt
+import itertools
+import logging
+import sys
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from .config import (
+    REMEDIATION_DRAIN_TIMEOUT_SECS, REMEDIATION_QUEUE_SIZE, REMEDIATION_WORKERS,
+)
+from .models import IncidentPayload, IncidentResult, ResolutionStatus
+
+logger = logging.getLogger("aegis.executor")
+
+RemediationFn = Callable[[IncidentPayload, IncidentResult], Awaitable[None]]
+
+# Lower value = served first
+_SEVERITY_PRIORITY = {"CRITICAL": 0, "HIGH": 1, "WARNING": 2, "MEDIUM": 2}
+_DEFAULT_PRIORITY = 3
+
+# Rolling window used for wait / stage statistics
+_STATS_WINDOW = 200
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised when the remediation queue cannot accept more work."""
+
+
+class DuplicateIncident(ValueError):
+    """Raised when an incident_id is submitted while it is still queued or running."""
+
+
+def priority_for(payload: IncidentPayload) -> int:
+    return _SEVERITY_PRIORITY.get((payload.severity or "").upper(), _DEFAULT_PRIORITY)
+
+
+@dataclass(order=True)
+class _Job:
+    priority: int
+    seq: int
+    payload: IncidentPayload = field(compare=False)
+    result: IncidentResult = field(compare=False)
+    enqueued_at: float = field(compare=False, default_factory=time.monotonic)
+    started_at: float | None = field(compare=False, default=None)
+
+
+def _stats(samples: deque[float]) -> dict:
+    if not samples:
+        return {"count": 0, "avg_ms": 0.0, "max_ms": 0.0}
+    return {
+        "count": len(samples),
+        "avg_ms": round(sum(samples) / len(samples) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+    }
+
+
+class RemediationExecutor:
+    """
+    Bounded asyncio worker pool for the remediation pipeline.
+
+    ``submit`` never blocks: it either enqueues the incident or raises
+    ExecutorSaturated so the webhook can shed load with a 429.
+    """
+
+    def __init__(
+        self,
+        handler: RemediationFn,
+        workers: int = REMEDIATION_WORKERS,
+        max_queue: int = REMEDIATION_QUEUE_SIZE,
+    ) -> None:
+        self._handler = handler
+        self._num_workers = max(1, workers)
+        self._max_queue = max(0, max_queue)
+        self._queue: asyncio.PriorityQueue[_Job] = asyncio.PriorityQueue()
+        self._seq = itertools.count()
+        self._workers: list[asyncio.Task] = []
+        self._in_flight: dict[str, _Job] = {}
+        self._pending: set[str] = set()       # queued or in flight
+        self._accepting = False
+        self._completed = 0
+        self._rejected = 0
+        self._queue_wait: deque[float] = deque(maxlen=_STATS_WINDOW)
+        self._run_time: deque[float] = deque(maxlen=_STATS_WINDOW)
+        self._stage_time: dict[str, deque[float]] = {}
+
+    # ── Lifecycle ────────────────────────────────────────────────────
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._accepting = True
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"remediation-worker-{i}")
+            for i in range(self._num_workers)
+        ]
+        logger.info("🧵 Remediation executor started (%d workers, queue=%d)",
+                    self._num_workers, self._max_queue)
+
+    async def drain(self, timeout: float = REMEDIATION_DRAIN_TIMEOUT_SECS) -> None:
+        """Stop accepting work, wait for queued + in-flight jobs, then stop workers."""
+        self._accepting = False
+        pending = self._queue.qsize() + len(self._in_flight)
+        if pending:
+            logger.info("🧵 Draining %d remediation job(s) (timeout=%ss)…", pending, timeout)
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("🧵 Drain timed out – cancelling %d in-flight job(s)",
+                           len(self._in_flight))
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    # ── Admission ────────────────────────────────────────────────────
+    @property
+    def saturated(self) -> bool:
+        return bool(self._max_queue) and self._queue.qsize() >= self._max_queue
+
+    def capacity(self) -> int:
+        """How many more incidents can be queued right now."""
+        if not self._max_queue:
+            return sys.maxsize
+        return max(0, self._max_queue - self._queue.qsize())
+
+    def is_pending(self, incident_id: str) -> bool:
+        """True while ``incident_id`` is queued or being remediated."""
+        return incident_id in self._pending
+
+    def submit(self, payload: IncidentPayload, result: IncidentResult,
+               priority: int | None = None) -> None:
+        if not self._accepting:
+            self._rejected += 1
+            raise ExecutorSaturated("Remediation executor is not accepting work")
+        if payload.incident_id in self._pending:
+            raise DuplicateIncident(f"Incident {payload.incident_id} is already being remediated")
+        if self.saturated:
+            self._rejected += 1
+            raise ExecutorSaturated(
+                f"Remediation queue full ({self._queue.qsize()}/{self._max_queue})"
+            )
+        job = _Job(
+            priority=priority_for(payload) if priority is None else priority,
+            seq=next(self._seq),
+            payload=payload,
+            result=result,
+        )
+        self._queue.put_nowait(job)
+        self._pending.add(payload.incident_id)
+
+    def submit_many(self, jobs: list[tuple[IncidentPayload, IncidentResult]]) -> None:
+        """All-or-nothing enqueue for a batch – never admits half a batch."""
+        counts = Counter(payload.incident_id for payload, _ in jobs)
+        dupes = sorted(i for i, n in counts.items() if n > 1 or i in self._pending)
+        if dupes:
+            raise DuplicateIncident(f"Incidents already being remediated: {', '.join(dupes)}")
+        if not self._accepting or len(jobs) > self.capacity():
+            self._rejected += len(jobs)
+            raise ExecutorSaturated(
+                f"Batch of {len(jobs)} exceeds free queue capacity ({self.capacity()})"
+            )
+        for payload, result in jobs:
+            self.submit(payload, result)
+
+    # ── Workers ──────────────────────────────────────────────────────
+    async def _worker(self, idx: int) -> None:
+        while True:
+            job = await self._queue.get()
+            iid = job.payload.incident_id
+            job.started_at = time.monotonic()
+            self._queue_wait.append(job.started_at - job.enqueued_at)
+            self._in_flight[iid] = job
+            try:
+                await self._handler(job.payload, job.result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.exception("Remediation worker %d crashed on %s: %s", idx, iid, exc)
+                if job.result.status != ResolutionStatus.RESOLVED:
+                    job.result.status = ResolutionStatus.FAILED
+                    job.result.error = job.result.error or f"Pipeline crashed: {exc}"
+            finally:
+                self._run_time.append(time.monotonic() - job.started_at)
+                self._record_stages(job.result)
+                self._in_flight.pop(iid, None)
+                self._pending.discard(iid)
+                self._completed += 1
+                self._queue.task_done()
+
+    def _record_stages(self, result: IncidentResult) -> None:
+        """Derive time spent in each pipeline status from the incident timeline."""
+        stages = {s.value for s in ResolutionStatus}
+        marks = [
+            (e.status, _dt.datetime.fromisoformat(e.ts))
+            for e in result.timeline if e.status in stages
+        ]
+        for (status, start), (_, end) in zip(marks, marks[1:]):
+            samples = self._stage_time.setdefault(status, deque(maxlen=_STATS_WINDOW))
+            samples.append((end - start).total_seconds())
+
+    # ── Introspection ────────────────────────────────────────────────
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        return {
+            "workers": self._num_workers,
+            "accepting": self._accepting,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._max_queue,
+            "in_flight": len(self._in_flight),
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "queue_wait": _stats(self._queue_wait),
+            "run_time": _stats(self._run_time),
+            "stage_time": {k: _stats(v) for k, v in self._stage_time.items()},
+            "active": [
+                {
+                    "incident_id": iid,
+                    "status": job.result.status.value,
+                    "priority": job.priority,
+                    "running_ms": round((now - (job.started_at or now)) * 1000, 1),
+                }
+                for iid, job in self._in_flight.items()
+            ],
+        }
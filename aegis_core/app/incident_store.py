@@ -0,0 +1,290 @@
+"""
+AegisOps GOD MODE – Persistent incident store.
+
+Replaces the unbounded in-process ``incidents`` dict:
+  • SQLite (stdlib, embedded) holds every incident, indexed on
+    status / alert_type / created_at
+  • In-flight incidents are pinned in memory (the pipeline keeps mutating
+    them); finished ones move to a size-bounded LRU of hot entries
+  • Pipeline updates only mark an incident dirty – a background flusher
+    writes all dirty incidents in one batched transaction per interval
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as _dt
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Protocol
+
+from .config import (
+    INCIDENT_CACHE_SIZE, INCIDENT_DB_PATH, INCIDENT_FLUSH_INTERVAL_SECS,
+)
+from .models import IncidentResult, ResolutionStatus
+
+logger = logging.getLogger("aegis.incident_store")
+
+TERMINAL_STATUSES = {ResolutionStatus.RESOLVED, ResolutionStatus.FAILED}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS incidents (
+    incident_id TEXT PRIMARY KEY,
+    status      TEXT NOT NULL,
+    alert_type  TEXT NOT NULL,
+    created_at  TEXT NOT NULL,
+    updated_at  TEXT NOT NULL,
+    body        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_incidents_status     ON incidents(status);
+CREATE INDEX IF NOT EXISTS idx_incidents_alert_type ON incidents(alert_type);
+CREATE INDEX IF NOT EXISTS idx_incidents_created_at ON incidents(created_at);
+"""
+
+# (incident_id, status, alert_type, created_at, updated_at, body)
+Row = tuple[str, str, str, str, str, str]
+
+
+class SQLiteIncidentBackend:
+    """Blocking SQLite access – always called via asyncio.to_thread."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def write_many(self, rows: list[Row]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO incidents VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(incident_id) DO UPDATE SET "
+                "status=excluded.status, alert_type=excluded.alert_type, "
+                "updated_at=excluded.updated_at, body=excluded.body",
+                rows,
+            )
+
+    def get(self, incident_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM incidents WHERE incident_id = ?", (incident_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        alert_type: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = 100,
+    ) -> list[str]:
+        clauses, args = [], []
+        if status:
+            clauses.append("status = ?")
+            args.append(status)
+        if alert_type:
+            clauses.append("alert_type = ?")
+            args.append(alert_type)
+        if since:
+            clauses.append("created_at >= ?")
+            args.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT body FROM incidents {where} ORDER BY created_at DESC LIMIT ?"
+        with self._lock:
+            return [r[0] for r in self._conn.execute(sql, (*args, limit)).fetchall()]
+
+    def unfinished(self) -> list[str]:
+        terminal = tuple(s.value for s in TERMINAL_STATUSES)
+        with self._lock:
+            return [r[0] for r in self._conn.execute(
+                "SELECT body FROM incidents WHERE status NOT IN (?, ?)", terminal
+            ).fetchall()]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class IncidentBackend(Protocol):
+    """Blocking persistence interface (SQLite here, Redis in shared_state)."""
+
+    def write_many(self, rows: list[Row]) -> None: ...
+    def get(self, incident_id: str) -> Optional[str]: ...
+    def query(self, status: Optional[str] = None, alert_type: Optional[str] = None,
+              since: Optional[str] = None, limit: int = 100) -> list[str]: ...
+    def unfinished(self) -> list[str]: ...
+    def close(self) -> None: ...
+
+
+class IncidentStore:
+    """Write-behind incident store with a bounded LRU of hot incidents."""
+
+    def __init__(
+        self,
+        backend: IncidentBackend | None = None,
+        cache_size: int = INCIDENT_CACHE_SIZE,
+        flush_interval: float = INCIDENT_FLUSH_INTERVAL_SECS,
+    ) -> None:
+        self._backend = backend
+        self._cache_size = max(1, cache_size)
+        self._flush_interval = flush_interval
+        self._active: dict[str, IncidentResult] = {}
+        self._cache: OrderedDict[str, IncidentResult] = OrderedDict()
+        self._dirty: dict[str, IncidentResult] = {}
+        self._flush_task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+        self._shared = False
+
+    def use_backend(self, backend: IncidentBackend, shared: bool = False) -> None:
+        """
+        Swap the persistence backend before start(). ``shared`` means other
+        workers write to it too: reads are not cached (they could go stale)
+        and startup recovery is skipped (their in-flight work is not ours).
+        """
+        self._backend = backend
+        self._shared = shared
+
+    @property
+    def backend(self) -> IncidentBackend:
+        if self._backend is None:
+            self._backend = SQLiteIncidentBackend(INCIDENT_DB_PATH)
+            logger.info("🗄️  Incident store opened at %s", INCIDENT_DB_PATH)
+        return self._backend
+
+    # ── Lifecycle ────────────────────────────────────────────────────
+    async def start(self) -> None:
+        if not self._shared:
+            await self._recover_unfinished()
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush()
+        await asyncio.to_thread(self.backend.close)
+
+    async def _recover_unfinished(self) -> None:
+        """Incidents persisted mid-pipeline can never finish – mark them FAILED."""
+        bodies = await asyncio.to_thread(self.backend.unfinished)
+        for body in bodies:
+            result = IncidentResult.model_validate_json(body)
+            result.status = ResolutionStatus.FAILED
+            result.error = result.error or "Agent restarted before the pipeline finished."
+            self._dirty[result.incident_id] = result
+        if bodies:
+            logger.warning("🗄️  Marked %d interrupted incident(s) as FAILED", len(bodies))
+            await self.flush()
+
+    # ── Writes (non-blocking) ────────────────────────────────────────
+    def put(self, result: IncidentResult) -> None:
+        self._cache.pop(result.incident_id, None)
+        self._dirty[result.incident_id] = result
+        self._place(result)
+
+    def touch(self, result: IncidentResult) -> None:
+        """Mark an incident as changed; it is persisted on the next flush."""
+        self._dirty[result.incident_id] = result
+        self._place(result)
+
+    def _place(self, result: IncidentResult) -> None:
+        """Pin in-flight incidents; finished ones join the LRU. O(1) per call."""
+        iid = result.incident_id
+        if result.status not in TERMINAL_STATUSES:
+            self._active[iid] = result
+            return
+        self._active.pop(iid, None)
+        self._remember(iid, result)
+
+    def _remember(self, iid: str, result: IncidentResult) -> None:
+        self._cache[iid] = result
+        self._cache.move_to_end(iid)
+        while len(self._cache) > self._cache_size:
+            # Unflushed entries stay reachable through _dirty until written
+            self._cache.popitem(last=False)
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not self._dirty:
+                return 0
+            batch, self._dirty = self._dirty, {}
+            now = _dt.datetime.utcnow().isoformat()
+            rows: list[Row] = [
+                (
+                    iid, r.status.value, r.alert_type,
+                    r.timeline[0].ts if r.timeline else now,
+                    now, r.model_dump_json(),
+                )
+                for iid, r in batch.items()
+            ]
+            try:
+                await asyncio.to_thread(self.backend.write_many, rows)
+            except Exception:
+                # Keep them dirty unless a newer update already replaced them
+                for iid, r in batch.items():
+                    self._dirty.setdefault(iid, r)
+                raise
+            return len(rows)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            try:
+                await self.flush()
+            except Exception as exc:
+                logger.warning("Incident flush failed (will retry): %s", exc)
+
+    # ── Reads ────────────────────────────────────────────────────────
+    def _lookup(self, incident_id: str) -> Optional[IncidentResult]:
+        return (
+            self._active.get(incident_id)
+            or self._cache.get(incident_id)
+            or self._dirty.get(incident_id)
+        )
+
+    async def get(self, incident_id: str) -> Optional[IncidentResult]:
+        hot = self._lookup(incident_id)
+        if hot is not None:
+            if incident_id in self._cache:
+                self._cache.move_to_end(incident_id)
+            return hot
+        body = await asyncio.to_thread(self.backend.get, incident_id)
+        if body is None:
+            return None
+        result = IncidentResult.model_validate_json(body)
+        if not self._shared:
+            self._remember(incident_id, result)
+        return result
+
+    async def list(
+        self,
+        status: Optional[str] = None,
+        alert_type: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = 100,
+    ) -> list[IncidentResult]:
+        await self.flush()
+        bodies = await asyncio.to_thread(self.backend.query, status, alert_type, since, limit)
+        return [
+            self._lookup(r.incident_id) or r
+            for r in (IncidentResult.model_validate_json(b) for b in bodies)
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self._active),
+            "cached": len(self._cache),
+            "cache_capacity": self._cache_size,
+            "dirty": len(self._dirty),
+        }
+
+
+# Singleton
+incident_store = IncidentStore()
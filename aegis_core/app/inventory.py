@@ -0,0 +1,281 @@
+"""
+AegisOps GOD MODE – Event-driven container inventory.
+
+Every `containers.list()` makes the daemon inspect each container, and the
+metrics loop, /containers, /topology, the scaler and the stats collector
+all used to list on their own. The inventory lists ONCE and then follows
+the Docker events stream:
+
+  • watcher (thread)    – `client.events(filters={"type": "container"})`;
+                          create/start/restart/rename/unpause re-inspect the
+                          one container, die/stop/kill/pause flip its status,
+                          destroy drops it
+  • supervisor (async)  – full resync every INVENTORY_RESYNC_SECS to correct
+                          drift (missed events, daemon restarts) and restarts
+                          the watcher if the stream ended
+  • writers             – docker_ops records its own creates / starts /
+                          removes immediately, so a read right after a write
+                          never sees the old state
+
+Entries are immutable ContainerInfo snapshots indexed by id, name and
+label. Readers get copies; nothing here touches the network.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Optional
+
+from .config import INVENTORY_RESYNC_SECS
+from . import docker_ops
+from .docker_executor import BACKGROUND
+
+logger = logging.getLogger("aegis.inventory")
+
+# Event action → how to apply it
+_INSPECT = {"create", "start", "restart", "rename", "unpause", "update"}
+_STATUS = {"die": "exited", "stop": "exited", "kill": "exited", "pause": "paused"}
+
+
+@dataclass(frozen=True)
+class ContainerInfo:
+    id: str
+    name: str
+    status: str
+    image: str = "unknown"
+    started_at: str = ""
+    labels: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def short_id(self) -> str:
+        return self.id[:12]
+
+    def as_row(self) -> dict:
+        """The row shape of list_running_containers / container.list."""
+        return {"name": self.name, "status": self.status, "image": self.image, "id": self.short_id}
+
+    @classmethod
+    def from_container(cls, container: Any) -> "ContainerInfo":
+        attrs = container.attrs or {}
+        config = attrs.get("Config") or {}
+        image = config.get("Image") or ""
+        if not image:
+            tags = container.image.tags
+            image = tags[0] if tags else "unknown"
+        return cls(
+            id=container.id,
+            name=container.name,
+            status=container.status,
+            image=image,
+            started_at=(attrs.get("State") or {}).get("StartedAt", ""),
+            labels=dict(config.get("Labels") or {}),
+        )
+
+
+class ContainerInventory:
+    """In-process view of every container, kept current from Docker events."""
+
+    def __init__(self, resync_secs: float = INVENTORY_RESYNC_SECS) -> None:
+        self.resync_secs = resync_secs
+        self._lock = threading.Lock()
+        self._by_id: dict[str, ContainerInfo] = {}
+        self._by_name: dict[str, str] = {}
+        self._by_label: dict[str, dict[str, set[str]]] = {}
+        # Change counter + last change per id, so a resync never overwrites
+        # what an event or a writer recorded while the listing was in flight
+        self._seq = 0
+        self._touched: dict[str, int] = {}
+        self._task: asyncio.Task | None = None
+        self._watcher: threading.Thread | None = None
+        self._events_stream: Any = None
+        self._closed = False
+        self.events = 0
+        self.resyncs = 0
+        self._last_resync = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ── Lifecycle ────────────────────────────────────────────────────
+    def start(self) -> None:
+        if not self.running:
+            self._closed = False
+            self._task = asyncio.create_task(self._supervise())
+
+    async def stop(self) -> None:
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        stream = self._events_stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    async def resync(self) -> None:
+        """Replace the inventory with a full listing."""
+        with self._lock:
+            since = self._seq
+        infos = await docker_ops._run("list", _list_all, priority=BACKGROUND)
+        with self._lock:
+            fresh = {i.id: i for i in infos}
+            for cid, seq in self._touched.items():
+                if seq > since:  # changed while we were listing – keep the newer view
+                    if cid in self._by_id:
+                        fresh[cid] = self._by_id[cid]
+                    else:
+                        fresh.pop(cid, None)
+            self._rebuild(fresh)
+            self._touched = {cid: seq for cid, seq in self._touched.items() if seq > since}
+        self.resyncs += 1
+        self._last_resync = time.time()
+
+    # ── Reads ────────────────────────────────────────────────────────
+    def get(self, ref: str) -> Optional[ContainerInfo]:
+        """Look up by name, full id or id prefix (≥ 12 chars, like short_id)."""
+        with self._lock:
+            cid = self._by_name.get(ref, ref)
+            info = self._by_id.get(cid)
+            if info is None and len(ref) >= 12:
+                info = next((i for i in self._by_id.values() if i.id.startswith(ref)), None)
+            return info
+
+    def list(self, running_only: bool = True) -> list[ContainerInfo]:
+        with self._lock:
+            return [i for i in self._by_id.values() if i.status == "running" or not running_only]
+
+    def by_label(self, key: str, value: str | None = None) -> list[ContainerInfo]:
+        """Containers carrying label ``key`` (with ``value``, if given)."""
+        with self._lock:
+            values = self._by_label.get(key, {})
+            ids = values.get(value, set()) if value is not None else set().union(*values.values())
+            return [self._by_id[cid] for cid in ids]
+
+    def status(self) -> dict:
+        return {
+            "running": self.running,
+            "watching": self._watcher is not None and self._watcher.is_alive(),
+            "containers": len(self._by_id),
+            "events": self.events,
+            "resyncs": self.resyncs,
+            "last_resync_age_secs": round(time.time() - self._last_resync, 1) if self._last_resync else None,
+        }
+
+    # ── Writes (docker_ops + watcher) ────────────────────────────────
+    def upsert(self, container: Any) -> None:
+        """Record an SDK container's current attrs."""
+        self._put(ContainerInfo.from_container(container))
+
+    def discard(self, container_id: str) -> None:
+        with self._lock:
+            self._remove(container_id)
+            self._touch(container_id)
+
+    def _put(self, info: ContainerInfo) -> None:
+        with self._lock:
+            self._remove(info.id)
+            self._add(info)
+            self._touch(info.id)
+
+    def _touch(self, cid: str) -> None:
+        self._seq += 1
+        self._touched[cid] = self._seq
+
+    # ── Indexes (call with the lock held) ────────────────────────────
+    def _add(self, info: ContainerInfo) -> None:
+        stale = self._by_name.get(info.name)
+        if stale is not None and stale != info.id:
+            self._remove(stale)  # name reused by a new container
+        self._by_id[info.id] = info
+        self._by_name[info.name] = info.id
+        for key, value in info.labels.items():
+            self._by_label.setdefault(key, {}).setdefault(value, set()).add(info.id)
+
+    def _remove(self, cid: str) -> None:
+        info = self._by_id.pop(cid, None)
+        if info is None:
+            return
+        if self._by_name.get(info.name) == cid:
+            del self._by_name[info.name]
+        for key, value in info.labels.items():
+            ids = self._by_label.get(key, {}).get(value)
+            if ids is not None:
+                ids.discard(cid)
+                if not ids:
+                    del self._by_label[key][value]
+                    if not self._by_label[key]:
+                        del self._by_label[key]
+
+    def _rebuild(self, entries: dict[str, ContainerInfo]) -> None:
+        self._by_id, self._by_name, self._by_label = {}, {}, {}
+        for info in entries.values():
+            self._add(info)
+
+    # ── Supervisor / watcher ─────────────────────────────────────────
+    async def _supervise(self) -> None:
+        while True:
+            if self._watcher is None or not self._watcher.is_alive():
+                # Subscribe before listing so nothing falls between the two
+                self._watcher = threading.Thread(
+                    target=self._watch, args=(int(time.time()),),
+                    name="docker-events", daemon=True,
+                )
+                self._watcher.start()
+            try:
+                await self.resync()
+            except Exception as exc:
+                logger.debug("Inventory resync failed: %s", exc)
+            await asyncio.sleep(self.resync_secs)
+
+    def _watch(self, since: int) -> None:
+        """Thread body: apply container events until the stream ends or we stop."""
+        try:
+            self._events_stream = docker_ops._get_client().events(
+                decode=True, since=since, filters={"type": "container"},
+            )
+            for event in self._events_stream:
+                if self._closed:
+                    break
+                self._apply(event)
+        except Exception as exc:
+            if not self._closed:
+                logger.warning("⚠️ Docker events stream ended: %s – resyncing", exc)
+        finally:
+            self._events_stream = None
+
+    def _apply(self, event: dict) -> None:
+        action = (event.get("Action") or event.get("status") or "").split(":")[0]
+        cid = (event.get("Actor") or {}).get("ID") or event.get("id")
+        if not cid:
+            return
+        self.events += 1
+        if action == "destroy":
+            self.discard(cid)
+        elif action in _STATUS:
+            with self._lock:
+                info = self._by_id.get(cid)
+                if info is not None:
+                    self._by_id[cid] = replace(info, status=_STATUS[action])
+                    self._touch(cid)
+        elif action in _INSPECT:
+            try:
+                self.upsert(docker_ops._get_client().containers.get(cid))
+            except Exception:
+                self.discard(cid)  # gone again before we could look
+
+
+def _list_all() -> list[ContainerInfo]:
+    return [ContainerInfo.from_container(c)
+            for c in docker_ops._get_client().containers.list(all=True)]
+
+
+# Singleton
+inventory = ContainerInventory()
@@ -0,0 +1,260 @@
+"""
+AegisOps GOD MODE – Incremental container log tailer.
+
+`container.logs(tail=50)` re-reads and re-decodes the same lines on every
+call, and an alert whose `logs` field is a one-liner reaches the LLM with
+no real container output. The tailer follows a few containers instead and
+keeps their recent lines in memory:
+
+  • supervisor (async)  – every LOG_TAIL_RESYNC_SECS (re)starts a follow
+                          stream for each followed container that has none
+                          (first start, container restarted / replaced,
+                          stream dropped)
+  • follow (thread)     – one daemon thread per container iterating
+                          `logs(stream=True, follow=True, timestamps=True)`;
+                          the first one loads LOG_TAIL_LINES of history, then
+                          every stream starts at `since=<cursor>` (newest line
+                          kept), so nothing is read twice or missed
+  • reads               – last N lines and / or last T seconds from the ring
+                          (LOG_TAIL_LINES per container); no Docker call
+
+Followed: LOG_TAIL_CONTAINERS plus containers named by incoming alerts
+(follow()), at most LOG_TAIL_MAX_CONTAINERS. Like the stats streams, follow
+threads sit outside the Docker executor so they never hold its workers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from .config import (
+    LOG_TAIL_CONTAINERS, LOG_TAIL_LINES, LOG_TAIL_MAX_CONTAINERS, LOG_TAIL_RESYNC_SECS,
+)
+from . import docker_ops
+
+logger = logging.getLogger("aegis.logs")
+
+# Longer lines are cut, so a ring's memory stays bounded
+_MAX_LINE_CHARS = 4096
+
+
+def _parse_ts(stamp: str) -> Optional[float]:
+    """Docker's RFC 3339 nano timestamp ("2024-05-01T12:00:00.123456789Z") → epoch secs."""
+    try:
+        base, _, frac = stamp.rstrip("Z").partition(".")
+        ts = datetime.strptime(base, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc).timestamp()
+        return ts + float(f"0.{frac}") if frac else ts
+    except ValueError:
+        return None
+
+
+@dataclass
+class _Follow:
+    name: str
+    lines: deque                        # (ts, line), maxlen = LOG_TAIL_LINES
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    cursor: Optional[float] = None      # timestamp of the newest line kept
+    replay: Counter = field(default_factory=Counter)  # lines at `cursor` a new stream repeats
+    resuming: bool = False              # stream re-reads from `cursor`, nothing newer yet
+    primed: bool = False                # history loaded → reads can skip Docker
+    thread: Optional[threading.Thread] = None
+    stream: Any = None
+    received: int = 0
+    streams: int = 0
+
+    @property
+    def active(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+
+class LogTailer:
+    """Recent output of followed containers, kept current from follow streams."""
+
+    def __init__(self, containers: str = LOG_TAIL_CONTAINERS, lines: int = LOG_TAIL_LINES,
+                 max_containers: int = LOG_TAIL_MAX_CONTAINERS,
+                 resync_secs: float = LOG_TAIL_RESYNC_SECS) -> None:
+        self.lines = lines
+        self.max_containers = max_containers
+        self.resync_secs = resync_secs
+        self._follows: dict[str, _Follow] = {}
+        self._task: asyncio.Task | None = None
+        self._closed = False
+        for name in containers.split(","):
+            if name.strip():
+                self.follow(name.strip())
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ── Lifecycle ────────────────────────────────────────────────────
+    def start(self) -> None:
+        if not self.running:
+            self._closed = False
+            self._task = asyncio.create_task(self._supervise())
+
+    async def stop(self) -> None:
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for f in self._follows.values():
+            _close(f.stream)
+
+    def follow(self, name: str) -> bool:
+        """Start following ``name`` (right away if running). False if at the cap."""
+        if name in self._follows:
+            return True
+        if len(self._follows) >= self.max_containers:
+            logger.debug("Log tailer full (%d) – not following %s", self.max_containers, name)
+            return False
+        self._follows[name] = _Follow(name, deque(maxlen=self.lines))
+        if self.running:
+            self.resync()
+        return True
+
+    # ── Reads ────────────────────────────────────────────────────────
+    def recent(self, name: str, lines: int | None = None,
+               seconds: float | None = None) -> Optional[list[str]]:
+        """
+        Last ``lines`` lines and / or those from the last ``seconds``, oldest
+        first, each prefixed with its Docker timestamp. None if ``name`` is
+        not followed yet or its history isn't loaded (callers go to Docker).
+        """
+        f = self._follows.get(name)
+        if f is None or not f.primed:
+            return None
+        with f.lock:
+            entries = list(f.lines)
+        if seconds is not None:
+            cutoff = time.time() - seconds
+            entries = [e for e in entries if e[0] >= cutoff]
+        if lines is not None:
+            entries = entries[-lines:] if lines > 0 else []
+        return [line for _, line in entries]
+
+    def text(self, name: str, lines: int | None = None,
+             seconds: float | None = None) -> Optional[str]:
+        """recent() joined like `container.logs(timestamps=True)` output."""
+        recent = self.recent(name, lines, seconds)
+        if recent is None:
+            return None
+        return "".join(f"{line}\n" for line in recent)
+
+    def covers(self, name: str, lines: int) -> bool:
+        """True if a read of the last ``lines`` lines can be served from memory."""
+        f = self._follows.get(name)
+        return f is not None and f.primed and lines <= self.lines
+
+    def status(self) -> dict:
+        return {
+            "running": self.running,
+            "containers": len(self._follows),
+            "following": sum(1 for f in self._follows.values() if f.active),
+            "lines": sum(len(f.lines) for f in self._follows.values()),
+            "received": sum(f.received for f in self._follows.values()),
+            "streams": sum(f.streams for f in self._follows.values()),
+        }
+
+    # ── Supervisor / followers ───────────────────────────────────────
+    async def _supervise(self) -> None:
+        while True:
+            self.resync()
+            await asyncio.sleep(self.resync_secs)
+
+    def resync(self) -> None:
+        """Start a follow thread for every followed container that has none."""
+        inv = docker_ops._inventory()
+        for f in list(self._follows.values()):
+            if f.active:
+                continue
+            if inv is not None:
+                info = inv.get(f.name)
+                if info is None or (info.status != "running" and f.primed):
+                    continue  # nothing new to read until it runs again
+            f.thread = threading.Thread(target=self._pump, args=(f,),
+                                        name=f"logs-{f.name}", daemon=True)
+            f.thread.start()
+
+    def _pump(self, f: _Follow) -> None:
+        """Thread body: append followed lines to the ring until the stream ends."""
+        try:
+            container = docker_ops._get_client().containers.get(f.name)
+            since = f.cursor
+            if not f.primed:
+                since = time.time()
+                history = container.logs(tail=self.lines, timestamps=True)
+                for raw in history.decode("utf-8", errors="replace").split("\n"):
+                    self._add(f, raw)
+                f.primed = True
+            self._resume(f)
+            f.stream = container.logs(stream=True, follow=True, timestamps=True,
+                                      since=f.cursor or since)
+            f.streams += 1
+            pending = ""
+            for chunk in f.stream:
+                if self._closed:
+                    break
+                pending += chunk.decode("utf-8", errors="replace")
+                *complete, pending = pending.split("\n")
+                for raw in complete:
+                    self._add(f, raw)
+        except Exception as exc:
+            if not self._closed:
+                logger.debug("Log stream for %s ended: %s", f.name, exc)
+        finally:
+            _close(f.stream)
+            f.stream = None
+
+    @staticmethod
+    def _resume(f: _Follow) -> None:
+        """A stream is about to re-read from the cursor (`since` is inclusive)."""
+        with f.lock:
+            f.resuming = f.cursor is not None
+            f.replay = Counter(e for e in f.lines if e[0] == f.cursor)
+
+    def _add(self, f: _Follow, raw: str) -> None:
+        raw = raw.rstrip("\r")
+        if not raw:
+            return
+        ts = _parse_ts(raw.split(" ", 1)[0])
+        if ts is None:
+            ts = time.time()
+        line = raw[:_MAX_LINE_CHARS]
+        with f.lock:
+            # A resumed stream re-sends what we kept up to the cursor; skip
+            # that, but keep identical lines that really were logged twice.
+            # Otherwise nothing is dropped: stdout and stderr stamps are not
+            # globally ordered, so an older stamp can legitimately arrive late.
+            if f.resuming:
+                if ts > f.cursor:
+                    f.resuming = False
+                    f.replay.clear()
+                elif ts < f.cursor:
+                    return
+                elif f.replay[(ts, line)] > 0:
+                    f.replay[(ts, line)] -= 1
+                    return
+            f.lines.append((ts, line))
+            f.cursor = ts if f.cursor is None else max(f.cursor, ts)
+            f.received += 1
+
+
+def _close(stream: Any) -> None:
+    if stream is not None:
+        try:
+            stream.close()
+        except Exception:
+            pass
+
+
+# Singleton
+log_tailer = LogTailer()
@@ -14,25 +14,44 @@ from __future__ import annotations
 import asyncio
 import datetime as _dt
 import logging
+import time
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from .ai_brain import analyze_logs, council_review, stream_analysis
-from .ai_brain import get_relevant_runbook_entries, _load_runbook
+from .ai_brain import get_relevant_runbook_entries, _clean_llm_text, _load_runbook
+from .config import (
+    AI_STREAM_COALESCE_SECS, INVENTORY_EVENTS, METRICS_HISTORY, REMEDIATION_RETRY_AFTER_SECS,
+    SCALE_DOWN_STEP, SPECULATIVE_PREPARE, STATS_STREAMING, TARGET_CONTAINER, UI_VOTE_STAGGER_SECS,
+    LOG_TAIL, LOG_ENRICH_MIN_CHARS, LOG_ENRICH_LINES, LOG_ENRICH_SECS,
+)
+from .coordinator import coordinator
 from .docker_ops import (
     restart_container, get_container_logs, list_running_containers,
-    get_all_metrics, scale_up, scale_down, reconfigure_nginx,
+    get_all_metrics, ScalePlan, prepare_scale_up, rollback_scale_up, scaler, warm_pool, lb,
 )
+from .docker_executor import docker_executor
+from .executor import DuplicateIncident, ExecutorSaturated, RemediationExecutor
+from .incident_store import incident_store
+from .metrics_delta import MetricsDelta, MetricsMirror
+from .metrics_history import AGGREGATIONS, FIELDS as HISTORY_FIELDS, metrics_history
+from .shared_state import shared_state
+from .inventory import inventory
+from .log_tailer import log_tailer
+from .stats_collector import stats_collector
 from .models import (
-    ActionType, CouncilVerdict, IncidentPayload, IncidentResult,
-    ResolutionStatus, TimelineEntry, WSFrameType,
+    AIAnalysis, ActionType, BatchIngestResult, CouncilVerdict, IncidentPayload, IncidentResult,
+    ResolutionStatus, TimelineEntry, WSFrame, WSFrameType,
 )
-from .verification import append_to_runbook, verify_health
-from .slack_notifier import notify as slack_notify
-from .ws_manager import manager as ws
+from .verification import append_to_runbook, close_http as close_health_client, verify_health
+from .slack_notifier import notify as slack_notify, notify_batch as slack_notify_batch
+from .telemetry import PIPELINE_STAGE, pipeline_summary, render_prometheus
+from .ws_manager import WS_CHANNEL, manager as ws
 
 # ── Logging ──────────────────────────────────────────────────────────
 logging.basicConfig(
@@ -43,21 +62,47 @@ logger = logging.getLogger("aegis.main")
 
 # ── Metrics background task handle ───────────────────────────────────
 _metrics_task: asyncio.Task | None = None
+# The leader's metrics as broadcast over the shared bus (followers record these)
+_metrics_mirror = MetricsMirror()
+
+
+async def _mirror_frame(body: str) -> None:
+    frame = WSFrame.model_validate_json(body)
+    if frame.type in (WSFrameType.METRICS, WSFrameType.METRICS_DELTA):
+        _metrics_mirror.apply(frame.type, frame.data)
 
 
 async def _metrics_loop() -> None:
-    """Push live container metrics to all WS clients every 3 seconds."""
+    """
+    Push live container metrics to all WS clients every 3 seconds (leader only).
+    Keyframes every METRICS_KEYFRAME_EVERY ticks, metrics.delta in between;
+    container.list only when membership or status changes. Every tick also
+    lands in metrics_history, clients or not – on followers from the state
+    the leader broadcasts, so any worker can serve /metrics/history.
+    """
     from .config import METRICS_INTERVAL_SECS
+    delta = MetricsDelta()
     while True:
         try:
-            if ws.count > 0:
-                metrics = await get_all_metrics()
-                await ws.broadcast_raw(
-                    WSFrameType.METRICS,
-                    data=[m.model_dump() for m in metrics],
-                )
+            # Sibling workers may have clients even when we have none
+            push = shared_state.is_leader and (ws.count > 0 or shared_state.distributed)
+            if push or (shared_state.is_leader and METRICS_HISTORY):
+                rows = [m.model_dump() for m in await get_all_metrics()]
+                if METRICS_HISTORY:
+                    metrics_history.record(rows)
+            elif METRICS_HISTORY and shared_state.distributed:
+                mirrored = _metrics_mirror.rows()
+                if mirrored is not None:
+                    metrics_history.record(mirrored)
+            if push:
+                update = delta.metrics(rows)
+                if update is not None:
+                    await ws.broadcast_raw(update[0], data=update[1])
                 containers = await list_running_containers()
-                await ws.broadcast_raw(WSFrameType.CONTAINER_LIST, data=containers)
+                if delta.containers(containers):
+                    await ws.broadcast_raw(WSFrameType.CONTAINER_LIST, data=containers)
+            else:
+                delta.reset()  # nobody saw the last state – start over with a keyframe
         except Exception as exc:
             logger.debug("Metrics loop error: %s", exc)
         await asyncio.sleep(METRICS_INTERVAL_SECS)
@@ -67,9 +112,36 @@ async def _metrics_loop() -> None:
 async def lifespan(_app: FastAPI):
     global _metrics_task
     logger.info("🛡️  AegisOps GOD MODE starting…")
+    incident_store.use_backend(shared_state.incident_backend(), shared=shared_state.distributed)
+    ws.attach_bus(shared_state)
+    if METRICS_HISTORY:
+        shared_state.subscribe(WS_CHANNEL, _mirror_frame)
+    coordinator.attach(shared_state)
+    scaler.attach(shared_state)
+    await shared_state.start()
+    await incident_store.start()
+    executor.start()
+    if INVENTORY_EVENTS:
+        inventory.start()
+    if STATS_STREAMING:
+        stats_collector.start()
+    if LOG_TAIL:
+        log_tailer.start()
     _metrics_task = asyncio.create_task(_metrics_loop())
+    warm_pool.refill_soon(TARGET_CONTAINER)
     yield
     _metrics_task.cancel()
+    # Remediation still queued / running needs the pool, inventory and logs
+    await executor.drain()
+    await warm_pool.close()
+    await stats_collector.stop()
+    await log_tailer.stop()
+    await inventory.stop()
+    await ws.close()
+    await incident_store.close()
+    await shared_state.close()
+    await close_health_client()
+    docker_executor.close()
     logger.info("🛡️  AegisOps GOD MODE shutting down.")
 
 
@@ -91,6 +163,73 @@ app.add_middleware(
 # ── Helper: timeline append ─────────────────────────────────────────
 def _timeline(result: IncidentResult, status: str, msg: str, agent: str | None = None):
     result.timeline.append(TimelineEntry(status=status, message=msg, agent=agent))
+    incident_store.touch(result)
+
+
+# ── Helper: coalesce a token stream into time-windowed deltas ───────
+async def _coalesce(source: AsyncIterator[str], window: float) -> AsyncIterator[str]:
+    """
+    Yield the text that arrived within ``window`` seconds of the first
+    pending token, so a 2 KB answer becomes a few dozen frames instead of
+    2 000. A slow producer's tokens still go out after at most ``window``.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    end = object()
+
+    async def _pump() -> None:
+        try:
+            async for item in source:
+                queue.put_nowait(item)
+        finally:
+            queue.put_nowait(end)
+
+    pump = asyncio.create_task(_pump())
+    try:
+        finished = False
+        while not finished:
+            item = await queue.get()
+            if item is end:
+                break
+            buf = [item]
+            deadline = loop.time() + window
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    item = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is end:
+                    finished = True
+                    break
+                buf.append(item)
+            yield "".join(buf)
+        await pump  # surface producer errors
+    finally:
+        pump.cancel()
+
+
+# ── Helper: fill in thin alert logs from the log tailer ─────────────
+def _enrich_logs(payload: IncidentPayload, result: IncidentResult) -> IncidentPayload:
+    """
+    Alerts that carry little or no log text get the affected container's
+    recent output appended, read from the tailer's memory (never Docker, so
+    nothing is added to the incident's critical path). Containers not yet
+    followed are followed from now on for the next alert.
+    """
+    if len(payload.logs.strip()) >= LOG_ENRICH_MIN_CHARS or not log_tailer.running:
+        return payload
+    name = payload.container_name or TARGET_CONTAINER
+    recent = log_tailer.recent(name, lines=LOG_ENRICH_LINES, seconds=LOG_ENRICH_SECS)
+    if recent is None:
+        log_tailer.follow(name)
+        return payload
+    if not recent:
+        return payload
+    logs = (payload.logs.rstrip("\n") + "\n" if payload.logs.strip() else "") + "\n".join(recent)
+    _timeline(result, "LOG_ENRICHMENT",
+              f"📜 Added the last {len(recent)} line(s) of '{name}' output to a thin alert",
+              "LOG_TAILER")
+    return payload.model_copy(update={"logs": logs})
 
 
 # ── GOD MODE Remediation Pipeline ───────────────────────────────────
@@ -104,14 +243,17 @@ async def _remediate(payload: IncidentPayload, result: IncidentResult) -> None:
       4. Nginx LB reconfiguration (if scaled)
       5. Health verification
       6. Runbook learning (save for future RAG)
+    Thin alert logs are first topped up with live container output.
     """
     iid = payload.incident_id
+    payload = _enrich_logs(payload, result)
 
     # ── 0. RAG Retrieval — broadcast to UI ───────────────────────────
     import asyncio as _aio
     from .ai_brain import get_relevant_runbook_entries as _rag_retrieve
 
-    rag_entries = await _aio.to_thread(_rag_retrieve, payload.logs)
+    with PIPELINE_STAGE.time(stage="rag", action="none"):
+        rag_entries = await _aio.to_thread(_rag_retrieve, payload.logs)
     if rag_entries:
         _timeline(result, "RAG_RETRIEVAL",
                   f"📚 Retrieved {len(rag_entries)} similar past incidents "
@@ -144,18 +286,28 @@ async def _remediate(payload: IncidentPayload, result: IncidentResult) -> None:
         "incident_id": iid, "message": "Analysing logs…"
     }, incident_id=iid)
 
-    streamed_text = ""
+    # Delta-only frames; the full text is sent once, in the final frame
+    parts: list[str] = []
+    seq = 0
     try:
-        async for chunk in stream_analysis(payload):
-            streamed_text += chunk
-            await ws.broadcast_raw(WSFrameType.AI_STREAM, data={
-                "incident_id": iid, "chunk": chunk, "full_text": streamed_text,
-            }, incident_id=iid)
+        with PIPELINE_STAGE.time(stage="stream", action="none"):
+            async for delta in _coalesce(stream_analysis(payload), AI_STREAM_COALESCE_SECS):
+                parts.append(delta)
+                seq += 1
+                await ws.broadcast_raw(WSFrameType.AI_STREAM, data={
+                    "incident_id": iid, "seq": seq, "chunk": delta,
+                }, incident_id=iid)
     except Exception:
         pass  # Non-streaming fallback will be used by analyze_logs
+    if parts:
+        await ws.broadcast_raw(WSFrameType.AI_STREAM, data={
+            "incident_id": iid, "seq": seq + 1, "chunk": "", "final": True,
+            "full_text": _clean_llm_text("".join(parts)),
+        }, incident_id=iid)
 
     try:
-        analysis = await analyze_logs(payload)
+        with PIPELINE_STAGE.time(stage="analysis", action="none"):
+            analysis = await analyze_logs(payload)
         result.analysis = analysis
         await ws.broadcast_raw(WSFrameType.AI_COMPLETE, data={
             "incident_id": iid, "analysis": analysis.model_dump(),
@@ -174,6 +326,10 @@ async def _remediate(payload: IncidentPayload, result: IncidentResult) -> None:
         await slack_notify(payload, ResolutionStatus.FAILED, error=result.error)
         return
 
+    # ── Speculative prepare – overlaps container creation with the council
+    if SPECULATIVE_PREPARE and analysis.action == ActionType.SCALE_UP:
+        _plans[iid] = asyncio.create_task(_prepare(analysis.replica_count))
+
     # ── 2. Multi-Agent Council ───────────────────────────────────────
     result.status = ResolutionStatus.COUNCIL_REVIEW
     _timeline(result, "COUNCIL_REVIEW", "Convening the AI Council…")
@@ -183,7 +339,8 @@ async def _remediate(payload: IncidentPayload, result: IncidentResult) -> None:
     }, incident_id=iid)
 
     try:
-        decision = await council_review(payload, analysis)
+        with PIPELINE_STAGE.time(stage="council", action=analysis.action.value):
+            decision = await council_review(payload, analysis)
         result.council_decision = decision
 
         # Broadcast each vote individually for dramatic effect
@@ -194,7 +351,8 @@ async def _remediate(payload: IncidentPayload, result: IncidentResult) -> None:
             _timeline(result, "COUNCIL_VOTE",
                       f"{vote.role.value}: {vote.verdict.value} – {vote.reasoning[:80]}",
                       vote.role.value)
-            await asyncio.sleep(0.5)  # Stagger for UI drama
+            if UI_VOTE_STAGGER_SECS > 0:
+                await asyncio.sleep(UI_VOTE_STAGGER_SECS)  # Optional stagger for UI drama
 
         await ws.broadcast_raw(WSFrameType.COUNCIL_DECISION, data={
             "incident_id": iid, "decision": decision.model_dump(),
@@ -219,6 +377,95 @@ async def _remediate(payload: IncidentPayload, result: IncidentResult) -> None:
     result.status = ResolutionStatus.APPROVED
     _timeline(result, "APPROVED", "Council approved the action.")
 
+    # ── NOOP: nothing to execute or verify ───────────────────────────
+    if analysis.action == ActionType.NOOP:
+        _timeline(result, "NOOP", "No action required.")
+        result.status = ResolutionStatus.RESOLVED
+        await ws.broadcast_raw(WSFrameType.RESOLVED, data={
+            "incident_id": iid, "message": "No action needed."
+        }, incident_id=iid)
+        await slack_notify(payload, ResolutionStatus.RESOLVED, analysis=analysis)
+        return
+
+    # ── 3+4. Execute + verify, serialized per target ─────────────────
+    async def _joined(leader: str) -> None:
+        result.status = ResolutionStatus.EXECUTING
+        _timeline(result, "MERGED",
+                  f"Joined in-flight {analysis.action.value} on {TARGET_CONTAINER} "
+                  f"(incident {leader})")
+        await ws.broadcast_raw(WSFrameType.STATUS_UPDATE, data={
+            "incident_id": iid, "status": "EXECUTING",
+            "message": f"🔗 Merged into in-flight {analysis.action.value} ({leader})…"
+        }, incident_id=iid)
+
+    try:
+        outcome, leader = await coordinator.run(
+            TARGET_CONTAINER, analysis.action.value, iid,
+            lambda: _execute_and_verify(payload, result, analysis),
+            on_join=_joined,
+        )
+    except Exception as exc:
+        await _fail(payload, result, f"Execution crashed: {exc}", analysis)
+        return
+
+    if leader is not None:
+        result.replicas_spawned = outcome.replicas_spawned
+        _timeline(result, "MERGED_RESULT",
+                  f"Shared outcome from {leader}: healthy={outcome.healthy}")
+
+    if outcome.error:
+        await _fail(payload, result, outcome.error, analysis)
+        return
+
+    if outcome.healthy:
+        result.status = ResolutionStatus.RESOLVED
+        result.resolved_at = _dt.datetime.utcnow().isoformat()
+        _timeline(result, "RESOLVED", "Service is healthy! Incident resolved.")
+        await ws.broadcast_raw(WSFrameType.RESOLVED, data={
+            "incident_id": iid, "resolved_at": result.resolved_at,
+        }, incident_id=iid)
+        with PIPELINE_STAGE.time(stage="runbook", action=analysis.action.value):
+            await append_to_runbook(
+                payload, analysis,
+                council_approved=True,
+                replicas_used=result.replicas_spawned,
+            )
+        await slack_notify(payload, ResolutionStatus.RESOLVED, analysis=analysis,
+                          council=result.council_decision)
+        logger.info("✅ GOD MODE: Incident %s RESOLVED", iid)
+    else:
+        await _fail(payload, result, "Health check failed after all retries.", analysis)
+        logger.warning("❌ GOD MODE: Incident %s FAILED", iid)
+
+
+@dataclass
+class _ActionOutcome:
+    """Result of one execute+verify run, shared with merged incidents."""
+    healthy: bool = False
+    error: str | None = None
+    replicas_spawned: int = 0
+
+
+async def _fail(payload: IncidentPayload, result: IncidentResult, error: str,
+                analysis: AIAnalysis | None = None) -> None:
+    iid = payload.incident_id
+    result.status = ResolutionStatus.FAILED
+    result.error = error
+    _timeline(result, "FAILED", error)
+    await ws.broadcast_raw(WSFrameType.FAILED, data={
+        "incident_id": iid, "error": error,
+    }, incident_id=iid)
+    await slack_notify(payload, ResolutionStatus.FAILED, analysis=analysis, error=error)
+
+
+async def _execute_and_verify(
+    payload: IncidentPayload, result: IncidentResult, analysis: AIAnalysis,
+) -> _ActionOutcome:
+    """Steps 3+4 of the pipeline. Runs while holding the target lock."""
+    iid = payload.incident_id
+    action = analysis.action.value
+    outcome = _ActionOutcome()
+
     # ── 3. Execute Action ────────────────────────────────────────────
     result.status = ResolutionStatus.EXECUTING
     _timeline(result, "EXECUTING", f"Executing: {analysis.action.value}")
@@ -238,17 +485,27 @@ async def _remediate(payload: IncidentPayload, result: IncidentResult) -> None:
         }, incident_id=iid)
 
         try:
-            event = await scale_up(count=analysis.replica_count)
-            result.replicas_spawned = len(event.replicas)
-            _timeline(result, "SCALED", f"Spawned: {event.replicas}")
+            plan = await _take_plan(iid)
+            if plan is not None:
+                _timeline(result, "PREPARED",
+                          f"Using {len(plan.staged)} replica(s) pre-created during council review")
+            # Controller reconciles containers + nginx; merges concurrent requests
+            with PIPELINE_STAGE.time(stage="execute", action=action):
+                event = await scaler.scale_to(
+                    TARGET_CONTAINER, analysis.replica_count,
+                    reason=analysis.root_cause[:80], incident_id=iid, plan=plan, at_least=True,
+                )
+            result.replicas_spawned = outcome.replicas_spawned = len(event.replicas)
+            if event.outcome == "applied":
+                _timeline(result, "SCALED",
+                          f"Live replicas: {event.replicas} (started {event.started or 'none'})")
+            else:
+                _timeline(result, "SCALED",
+                          f"Already at {len(event.replicas)} replica(s) – no churn")
             await ws.broadcast_raw(WSFrameType.SCALE_EVENT, data={
                 "incident_id": iid, "event": event.model_dump(),
             }, incident_id=iid)
-
-            # Reconfigure Nginx
-            lb_ok = await reconfigure_nginx(replicas=event.replicas)
-            event.lb_configured = lb_ok
-            if lb_ok:
+            if event.lb_configured:
                 _timeline(result, "LB_CONFIGURED", "Nginx load balancer updated")
             await slack_notify(payload, ResolutionStatus.SCALING, analysis=analysis)
         except Exception as exc:
@@ -256,52 +513,40 @@ async def _remediate(payload: IncidentPayload, result: IncidentResult) -> None:
             _timeline(result, "SCALE_FAILED", f"Scaling error: {exc}, falling back to restart")
             # Fallback to restart
             try:
-                await restart_container()
+                with PIPELINE_STAGE.time(stage="execute", action=ActionType.RESTART.value):
+                    await restart_container()
                 _timeline(result, "RESTARTED", "Container restarted (scale fallback)")
             except Exception as exc2:
-                result.status = ResolutionStatus.FAILED
-                result.error = f"Both scale and restart failed: {exc2}"
-                _timeline(result, "FAILED", result.error)
-                await ws.broadcast_raw(WSFrameType.FAILED, data={
-                    "incident_id": iid, "error": result.error
-                }, incident_id=iid)
-                return
+                outcome.error = f"Both scale and restart failed: {exc2}"
+                return outcome
 
     elif analysis.action == ActionType.RESTART:
         try:
             await ws.broadcast_raw(WSFrameType.DOCKER_ACTION, data={
-                "incident_id": iid, "action": "RESTART", "container": "buggy-app-v2",
+                "incident_id": iid, "action": "RESTART", "container": TARGET_CONTAINER,
             }, incident_id=iid)
-            status = await restart_container()
+            with PIPELINE_STAGE.time(stage="execute", action=action):
+                status = await restart_container()
             _timeline(result, "RESTARTED", f"Container status: {status}")
             await slack_notify(payload, ResolutionStatus.EXECUTING, analysis=analysis)
         except Exception as exc:
-            result.status = ResolutionStatus.FAILED
-            result.error = f"Restart failed: {exc}"
-            _timeline(result, "FAILED", result.error)
-            await ws.broadcast_raw(WSFrameType.FAILED, data={
-                "incident_id": iid, "error": result.error
-            }, incident_id=iid)
-            await slack_notify(payload, ResolutionStatus.FAILED, analysis=analysis, error=result.error)
-            return
+            outcome.error = f"Restart failed: {exc}"
+            return outcome
 
     elif analysis.action == ActionType.SCALE_DOWN:
         try:
-            removed = await scale_down()
-            _timeline(result, "SCALED_DOWN", f"Removed replicas: {removed}")
-            await reconfigure_nginx(replicas=[])
+            with PIPELINE_STAGE.time(stage="execute", action=action):
+                event = await scaler.scale_by(
+                    TARGET_CONTAINER, -SCALE_DOWN_STEP,
+                    reason=analysis.root_cause[:80], incident_id=iid,
+                )
+            if event.outcome == "deferred":
+                _timeline(result, "SCALE_DEFERRED", event.reason)
+            else:
+                _timeline(result, "SCALED_DOWN", f"Removed replicas: {event.removed}")
         except Exception as exc:
             logger.warning("Scale down failed: %s", exc)
 
-    elif analysis.action == ActionType.NOOP:
-        _timeline(result, "NOOP", "No action required.")
-        result.status = ResolutionStatus.RESOLVED
-        await ws.broadcast_raw(WSFrameType.RESOLVED, data={
-            "incident_id": iid, "message": "No action needed."
-        }, incident_id=iid)
-        await slack_notify(payload, ResolutionStatus.RESOLVED, analysis=analysis)
-        return
-
     # ── 4. Verify health ─────────────────────────────────────────────
     result.status = ResolutionStatus.VERIFYING
     _timeline(result, "VERIFYING", "Running health checks…")
@@ -310,41 +555,72 @@ async def _remediate(payload: IncidentPayload, result: IncidentResult) -> None:
         "message": "🩺 Verifying service health…"
     }, incident_id=iid)
 
-    healthy = await verify_health()
-
-    for i in range(1, 4):
+    async def _on_probe(attempt: int, healthy: bool) -> None:
         await ws.broadcast_raw(WSFrameType.HEALTH_CHECK, data={
-            "incident_id": iid, "attempt": i, "healthy": healthy,
+            "incident_id": iid, "attempt": attempt, "healthy": healthy,
         }, incident_id=iid)
 
-    if healthy:
-        result.status = ResolutionStatus.RESOLVED
-        result.resolved_at = _dt.datetime.utcnow().isoformat()
-        _timeline(result, "RESOLVED", "Service is healthy! Incident resolved.")
-        await ws.broadcast_raw(WSFrameType.RESOLVED, data={
-            "incident_id": iid, "resolved_at": result.resolved_at,
-        }, incident_id=iid)
-        await append_to_runbook(
-            payload, analysis,
-            council_approved=True,
-            replicas_used=result.replicas_spawned,
-        )
-        await slack_notify(payload, ResolutionStatus.RESOLVED, analysis=analysis,
-                          council=result.council_decision)
-        logger.info("✅ GOD MODE: Incident %s RESOLVED", iid)
-    else:
-        result.status = ResolutionStatus.FAILED
-        result.error = "Health check failed after all retries."
-        _timeline(result, "FAILED", result.error)
-        await ws.broadcast_raw(WSFrameType.FAILED, data={
-            "incident_id": iid, "error": result.error,
-        }, incident_id=iid)
-        await slack_notify(payload, ResolutionStatus.FAILED, analysis=analysis, error=result.error)
-        logger.warning("❌ GOD MODE: Incident %s FAILED", iid)
+    with PIPELINE_STAGE.time(stage="verify", action=action):
+        outcome.healthy = await verify_health(on_probe=_on_probe)
+
+    return outcome
+
+# ── Speculative scale-up plans (one per incident) ───────────────────
+_plans: dict[str, asyncio.Task] = {}
+
 
+async def _prepare(count: int) -> ScalePlan:
+    with PIPELINE_STAGE.time(stage="prepare", action=ActionType.SCALE_UP.value):
+        return await prepare_scale_up(count=count)
 
-# ── In-memory incident store ─────────────────────────────────────────
-incidents: dict[str, IncidentResult] = {}
+
+async def _take_plan(iid: str) -> ScalePlan | None:
+    """Claim this incident's prepared plan; None → scale the slow way."""
+    task = _plans.pop(iid, None)
+    if task is None:
+        return None
+    try:
+        return await task
+    except Exception as exc:
+        logger.warning("Speculative prepare failed for %s: %s", iid, exc)
+        return None
+
+
+async def _discard_plan(iid: str) -> None:
+    """Roll back a plan nobody committed (rejected, merged, crashed, NOOP)."""
+    task = _plans.pop(iid, None)
+    if task is None:
+        return
+    try:
+        # Never cancel: the Docker thread would keep creating containers
+        plan = await asyncio.shield(task)
+        await rollback_scale_up(plan)
+    except Exception as exc:
+        logger.debug("Discarding plan for %s: %s", iid, exc)
+
+
+async def _run_pipeline(payload: IncidentPayload, result: IncidentResult) -> None:
+    """Executor entry point: run the pipeline and always persist the outcome."""
+    try:
+        await _remediate(payload, result)
+    except Exception as exc:
+        logger.exception("Pipeline crashed for %s", payload.incident_id)
+        await _fail(payload, result, f"Pipeline crashed: {exc}")
+    finally:
+        await _discard_plan(payload.incident_id)
+        incident_store.touch(result)
+
+
+# ── Bounded remediation worker pool ──────────────────────────────────
+executor = RemediationExecutor(_run_pipeline)
+
+
+def _too_busy(detail: str) -> JSONResponse:
+    return JSONResponse(
+        {"error": "Remediation queue saturated", "detail": detail},
+        status_code=429,
+        headers={"Retry-After": str(REMEDIATION_RETRY_AFTER_SECS)},
+    )
 
 
 # ── REST routes ──────────────────────────────────────────────────────
@@ -352,29 +628,110 @@ incidents: dict[str, IncidentResult] = {}
 async def receive_webhook(payload: IncidentPayload, bg: BackgroundTasks):
     logger.info("📨 Webhook: %s (%s)", payload.incident_id, payload.alert_type)
     result = IncidentResult(incident_id=payload.incident_id, alert_type=payload.alert_type)
-    _timeline(result, "RECEIVED", "Incident received via webhook.")
-    incidents[payload.incident_id] = result
+    # Not persisted until admitted – a shed incident must not linger as RECEIVED
+    result.timeline.append(TimelineEntry(status="RECEIVED", message="Incident received via webhook."))
+
+    try:
+        executor.submit(payload, result)
+    except ExecutorSaturated as exc:
+        logger.warning("🚦 Shedding %s: %s", payload.incident_id, exc)
+        return _too_busy(str(exc))
+    except DuplicateIncident as exc:
+        logger.info("📨 Ignoring duplicate %s: %s", payload.incident_id, exc)
+        return JSONResponse({"error": "Duplicate incident", "detail": str(exc)}, status_code=409)
+    incident_store.put(result)
 
     await ws.broadcast_raw(WSFrameType.INCIDENT_NEW, data={
         "incident_id": payload.incident_id, "alert_type": payload.alert_type,
         "logs": payload.logs[:200],
     }, incident_id=payload.incident_id)
 
-    bg.add_task(_remediate, payload, result)
     bg.add_task(slack_notify, payload, ResolutionStatus.RECEIVED)
     return result
 
 
+@app.post("/webhook/batch", response_model=BatchIngestResult)
+async def receive_webhook_batch(payloads: list[IncidentPayload], bg: BackgroundTasks):
+    """
+    Alertmanager-style grouped delivery: one validation pass, in-batch
+    dedup by incident_id (also against incidents still being remediated),
+    one INCIDENT_NEW frame and one Slack message.
+    The batch is admitted all-or-nothing (429 if it doesn't fit the queue).
+    """
+    unique: dict[str, IncidentPayload] = {}
+    duplicates: list[str] = []
+    already_pending: list[str] = []
+    for p in payloads:
+        if p.incident_id in unique or p.incident_id in already_pending:
+            duplicates.append(p.incident_id)
+        elif executor.is_pending(p.incident_id):
+            already_pending.append(p.incident_id)
+        else:
+            unique[p.incident_id] = p
+    logger.info("📨 Webhook batch: %d alerts (%d unique)", len(payloads), len(unique))
+
+    jobs = []
+    for p in unique.values():
+        result = IncidentResult(incident_id=p.incident_id, alert_type=p.alert_type)
+        result.timeline.append(
+            TimelineEntry(status="RECEIVED", message="Incident received via batch webhook."))
+        jobs.append((p, result))
+
+    try:
+        executor.submit_many(jobs)
+    except ExecutorSaturated as exc:
+        logger.warning("🚦 Shedding batch of %d: %s", len(jobs), exc)
+        return _too_busy(str(exc))
+    for _, result in jobs:
+        incident_store.put(result)
+
+    if jobs:
+        await ws.broadcast_raw(WSFrameType.INCIDENT_NEW, data=[
+            {"incident_id": p.incident_id, "alert_type": p.alert_type, "logs": p.logs[:200]}
+            for p, _ in jobs
+        ])
+        bg.add_task(slack_notify_batch, [p for p, _ in jobs])
+    return BatchIngestResult(accepted=[r for _, r in jobs], duplicates=duplicates,
+                             already_pending=already_pending)
+
+
+@app.get("/remediation/queue")
+async def remediation_queue():
+    """Executor state: queue depth, in-flight jobs, wait and per-stage timings."""
+    return {**executor.snapshot(), "targets": coordinator.snapshot()}
+
+
 @app.get("/incidents/{incident_id}", response_model=IncidentResult)
 async def get_incident(incident_id: str):
-    if incident_id not in incidents:
+    result = await incident_store.get(incident_id)
+    if result is None:
         raise HTTPException(404, "Incident not found.")
-    return incidents[incident_id]
+    return result
 
 
 @app.get("/incidents")
-async def list_incidents():
-    return list(incidents.values())
+async def list_incidents(
+    status: str | None = None,
+    alert_type: str | None = None,
+    since: str | None = None,
+    limit: int = 100,
+):
+    """Newest first. Filters use the store's status / alert_type / created_at indexes."""
+    return await incident_store.list(
+        status=status, alert_type=alert_type, since=since, limit=min(max(limit, 1), 1000),
+    )
+
+
+@app.get("/metrics/prometheus")
+async def prometheus_metrics():
+    """Prometheus text exposition of pipeline / LLM / Docker / HTTP latency histograms."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/debug/pipeline")
+async def debug_pipeline():
+    """p50/p95/p99 per pipeline stage and per external dependency."""
+    return pipeline_summary()
 
 
 @app.get("/containers")
@@ -395,24 +752,69 @@ async def metrics():
         return JSONResponse({"error": str(exc)}, status_code=500)
 
 
+@app.get("/metrics/history")
+async def metrics_history_range(
+    container: str | None = None,
+    range_secs: float = Query(900, alias="range", gt=0),
+    end: float | None = None,
+    step: float | None = Query(None, gt=0),
+    agg: str = "avg",
+):
+    """
+    Recorded metrics over the last `range` seconds (up to `end`, default now),
+    one point per `step` seconds aggregated with min / avg / max.
+    """
+    if agg not in AGGREGATIONS:
+        raise HTTPException(400, f"agg must be one of {', '.join(AGGREGATIONS)}")
+    end = end or time.time()
+    start = end - range_secs
+    # Default ~120 points; never more than 1000 per series
+    step = max(step or range_secs / 120, range_secs / 1000)
+    names = [container] if container else metrics_history.names()
+    series = {}
+    for name in names:
+        points = metrics_history.query(name, start, end, step, agg)
+        if points is not None:
+            series[name] = points
+    if container and not series:
+        raise HTTPException(404, f"No history for container '{container}'")
+    return {
+        "start": start, "end": end, "step": step, "agg": agg,
+        "fields": list(HISTORY_FIELDS), "series": series,
+    }
+
+
 @app.post("/scale/{direction}")
 async def manual_scale(direction: str, count: int = 2):
     """Manual scaling endpoint. direction = 'up' or 'down'."""
-    if direction == "up":
-        event = await scale_up(count=count)
-        await reconfigure_nginx(replicas=event.replicas)
-        await ws.broadcast_raw(WSFrameType.SCALE_EVENT, data=event.model_dump())
-        return event.model_dump()
-    elif direction == "down":
-        removed = await scale_down()
-        await reconfigure_nginx(replicas=[])
-        return {"removed": removed}
-    raise HTTPException(400, "direction must be 'up' or 'down'")
+    if direction not in ("up", "down"):
+        raise HTTPException(400, "direction must be 'up' or 'down'")
+    # Operator intent – bypasses the scale-down cooldown
+    event = await scaler.scale_to(
+        TARGET_CONTAINER, count if direction == "up" else 0, reason="manual", force=True,
+    )
+    await ws.broadcast_raw(WSFrameType.SCALE_EVENT, data=event.model_dump())
+    return event.model_dump()
+
+
+@app.get("/scaling")
+async def scaling_state():
+    """Desired vs live replicas, cooldown and recent scaling decisions."""
+    return scaler.snapshot()
 
 
 @app.get("/health")
 async def healthcheck():
-    return {"status": "ok", "mode": "GOD_MODE", "version": "2.0.0", "ws_clients": ws.count}
+    return {
+        "status": "ok", "mode": "GOD_MODE", "version": "2.0.0", "ws_clients": ws.count,
+        "ws": ws.snapshot(),
+        "stats": stats_collector.status(),
+        "inventory": inventory.status(),
+        "history": metrics_history.status(),
+        "docker": docker_executor.status(),
+        "logs": log_tailer.status(),
+        "worker_id": shared_state.worker_id, "leader": shared_state.is_leader,
+    }
 
 
 @app.get("/topology")
@@ -442,17 +844,19 @@ async def topology():
             "image": c.get("image", ""),
         })
 
-    # Auto-generate edges
+    # Auto-generate edges; "routes" follows the upstream nginx actually serves
     agent_name = "aegis-agent"
+    upstream = await lb.load() or [TARGET_CONTAINER]
     for n in nodes:
         if n["type"] == "app":
             edges.append({"from": agent_name, "to": n["id"], "label": "monitors"})
         elif n["type"] == "replica":
             edges.append({"from": agent_name, "to": n["id"], "label": "spawned"})
         elif n["type"] == "loadbalancer":
-            edges.append({"from": n["id"], "to": "buggy-app-v2", "label": "routes"})
+            for server in upstream:
+                edges.append({"from": n["id"], "to": server, "label": "routes"})
 
-    return {"nodes": nodes, "edges": edges}
+    return {"nodes": nodes, "edges": edges, "lb": lb.snapshot()}
 
 
 @app.get("/runbook")
@@ -479,7 +883,15 @@ async def rag_test(logs: str = "CPU usage at 98% infinite loop"):
 # ── WebSocket endpoint ───────────────────────────────────────────────
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    await ws.connect(websocket)
+    # ?encoding=json (default) | compact | msgpack; ?stream=…&since=<seq> resumes
+    params = websocket.query_params
+    since = params.get("since")
+    await ws.connect(
+        websocket,
+        encoding=params.get("encoding", "json"),
+        stream=params.get("stream"),
+        since=int(since) if since and since.isdigit() else None,
+    )
     try:
         # Send initial state
         await ws.broadcast_raw(WSFrameType.HEARTBEAT, data={"status": "connected"})
@@ -488,7 +900,11 @@ async def websocket_endpoint(websocket: WebSocket):
             data = await websocket.receive_text()
             # Client can send "ping" to keep alive
             if data == "ping":
-                await websocket.send_json({"type": "heartbeat", "data": {"status": "alive"}})
+                await ws.send_to(websocket, WSFrame(type=WSFrameType.HEARTBEAT,
+                                                    data={"status": "alive"}))
+            else:
+                # {"op": "subscribe", "types": […], "incidents": […], "containers": […]}
+                await ws.handle_message(websocket, data)
     except WebSocketDisconnect:
         await ws.disconnect(websocket)
     except Exception:
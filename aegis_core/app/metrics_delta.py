@@ -0,0 +1,127 @@
+"""
+AegisOps GOD MODE – Delta encoding for the live metrics push.
+
+_metrics_loop used to broadcast every container's metrics and the full
+container list on every tick. MetricsDelta keeps what clients were last
+sent and turns each tick into:
+  • a `metrics` keyframe (full list) on the first tick and every
+    METRICS_KEYFRAME_EVERY ticks – old clients keep working off these
+  • a `metrics.delta` frame {"changed": [rows], "removed": [names]} with
+    only containers that appeared or moved beyond the epsilons
+  • nothing, when no container moved
+and sends `container.list` only when membership or status changes.
+
+MetricsMirror is the receiving side: workers that are not the leader
+rebuild the full per-container state from those frames (off the shared
+bus) so they can record metrics history without polling Docker.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Optional
+
+from .config import (
+    METRICS_DELTA_PCT_EPSILON, METRICS_DELTA_REL_EPSILON, METRICS_INTERVAL_SECS,
+    METRICS_KEYFRAME_EVERY,
+)
+from .models import WSFrameType
+
+# Percentage-point fields compare absolutely, the rest relatively.
+# uptime_seconds always moves – clients extrapolate it between keyframes.
+_PCT_FIELDS = ("cpu_percent", "memory_percent")
+_REL_FIELDS = ("memory_mb", "memory_limit_mb", "net_rx_bytes", "net_tx_bytes")
+_EXACT_FIELDS = ("status", "image")
+
+
+class MetricsDelta:
+    """Tracks the metrics/container state last sent to clients."""
+
+    def __init__(
+        self,
+        keyframe_every: int = METRICS_KEYFRAME_EVERY,
+        pct_epsilon: float = METRICS_DELTA_PCT_EPSILON,
+        rel_epsilon: float = METRICS_DELTA_REL_EPSILON,
+    ) -> None:
+        self.keyframe_every = max(1, keyframe_every)
+        self.pct_epsilon = pct_epsilon
+        self.rel_epsilon = rel_epsilon
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget client state – the next tick is a keyframe."""
+        self._sent: dict[str, dict] = {}
+        self._containers: Optional[list[tuple]] = None
+        self._ticks = 0
+
+    def _moved(self, old: dict, new: dict) -> bool:
+        for f in _EXACT_FIELDS:
+            if old.get(f) != new.get(f):
+                return True
+        for f in _PCT_FIELDS:
+            if abs((new.get(f) or 0) - (old.get(f) or 0)) > self.pct_epsilon:
+                return True
+        for f in _REL_FIELDS:
+            a, b = old.get(f) or 0, new.get(f) or 0
+            if abs(b - a) > self.rel_epsilon * max(abs(a), 1):
+                return True
+        return False
+
+    def metrics(self, rows: list[dict]) -> Optional[tuple[WSFrameType, Any]]:
+        """Frame type + data to broadcast for this tick, or None to skip."""
+        keyframe = self._ticks % self.keyframe_every == 0
+        self._ticks += 1
+        current = {r["name"]: r for r in rows}
+        if keyframe:
+            self._sent = current
+            return WSFrameType.METRICS, rows
+
+        changed = [r for name, r in current.items()
+                   if name not in self._sent or self._moved(self._sent[name], r)]
+        removed = [name for name in self._sent if name not in current]
+        for r in changed:
+            self._sent[r["name"]] = r
+        for name in removed:
+            del self._sent[name]
+        if not changed and not removed:
+            return None
+        return WSFrameType.METRICS_DELTA, {"changed": changed, "removed": removed}
+
+    def containers(self, containers: list[dict]) -> bool:
+        """True when membership or status changed since the last push."""
+        key = sorted((c.get("name"), c.get("status"), c.get("id")) for c in containers)
+        if key == self._containers:
+            return False
+        self._containers = key
+        return True
+
+
+class MetricsMirror:
+    """Full metrics state rebuilt from received keyframes and deltas."""
+
+    def __init__(self, max_age: float = (METRICS_KEYFRAME_EVERY + 1) * METRICS_INTERVAL_SECS) -> None:
+        # A live leader sends a keyframe at least every METRICS_KEYFRAME_EVERY
+        # ticks, so older state means it stopped pushing
+        self.max_age = max_age
+        self._rows: dict[str, dict] = {}
+        self._synced = False
+        self._last = 0.0
+
+    def apply(self, frame_type: WSFrameType, data: Any) -> None:
+        if frame_type is WSFrameType.METRICS:
+            self._rows = {r["name"]: r for r in data}
+            self._synced = True
+        elif frame_type is WSFrameType.METRICS_DELTA and self._synced:
+            for r in data.get("changed", []):
+                self._rows[r["name"]] = r
+            for name in data.get("removed", []):
+                self._rows.pop(name, None)
+        else:
+            return  # a delta before the first keyframe can't be applied
+        self._last = time.monotonic()
+
+    def rows(self) -> Optional[list[dict]]:
+        """Current rows, or None before the first keyframe / once stale."""
+        if not self._synced or time.monotonic() - self._last > self.max_age:
+            return None
+        return list(self._rows.values())
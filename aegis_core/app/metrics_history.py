@@ -0,0 +1,216 @@
+"""
+AegisOps GOD MODE – In-memory metrics time-series store.
+
+Every metrics tick is recorded per container into fixed-size NumPy ring
+buffers, one per resolution tier (METRICS_HISTORY_TIERS, "secs:points"):
+
+  • tier 0   – one slot per bucket of the finest width (normally the
+               metrics tick), keeping min / avg / max of what landed in it
+  • tier n   – wider buckets (e.g. 1 min, 10 min) rolled up from the same
+               samples, so a day of history costs the same as an hour
+
+Each slot stores min / sum / max per field plus a sample count; the open
+bucket of each tier is kept aside and included in queries. All arrays are
+allocated when a container is first seen, so memory is fixed per
+container (`bytes_per_container`) and the container count is capped at
+METRICS_HISTORY_MAX_CONTAINERS (least recently seen is dropped).
+
+query() picks the finest tier that still reaches back to the range start
+and re-buckets it to the requested step with min / avg / max.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .config import METRICS_HISTORY_MAX_CONTAINERS, METRICS_HISTORY_TIERS
+
+# Network counters are cumulative; they are stored as-is (max of a bucket
+# is its last value), rates are left to the caller. min / max are float32
+# (7 significant digits is plenty for charts); sums stay float64 so
+# averages of large byte counters don't drift.
+FIELDS = ("cpu_percent", "memory_mb", "memory_percent", "net_rx_bytes", "net_tx_bytes")
+AGGREGATIONS = ("min", "avg", "max")
+
+
+def parse_tiers(spec: str) -> list[tuple[float, int]]:
+    """"3:1200,60:1440" → [(3.0, 1200), (60.0, 1440)], finest first."""
+    tiers = []
+    for part in spec.split(","):
+        if part.strip():
+            width, _, points = part.partition(":")
+            tiers.append((float(width), int(points)))
+    if not tiers:
+        raise ValueError("METRICS_HISTORY_TIERS needs at least one 'secs:points' tier")
+    return sorted(tiers)
+
+
+class _Tier:
+    """Ring of `points` buckets of `width` seconds."""
+
+    def __init__(self, width: float, points: int) -> None:
+        self.width = width
+        self.points = points
+        self.start = np.zeros(points, dtype=np.float64)            # bucket start ts
+        self.count = np.zeros(points, dtype=np.uint32)
+        self.minmax = np.zeros((points, 2, len(FIELDS)), dtype=np.float32)
+        self.sum = np.zeros((points, len(FIELDS)), dtype=np.float64)
+        self.head = 0   # next slot to write
+        self.size = 0
+        # Open bucket, flushed into the ring when a sample lands past it
+        self.open_start: Optional[float] = None
+        self.open_count = 0
+        self.open = np.zeros((3, len(FIELDS)), dtype=np.float64)
+
+    @staticmethod
+    def nbytes_for(points: int) -> int:
+        return points * (8 + 4 + len(FIELDS) * (2 * 4 + 8)) + 3 * len(FIELDS) * 8
+
+    def add(self, ts: float, values: np.ndarray) -> None:
+        bucket = ts - ts % self.width
+        if self.open_start is not None and bucket != self.open_start:
+            self._flush()
+        if self.open_count == 0:
+            self.open_start = bucket
+            self.open[0] = values
+            self.open[1] = values
+            self.open[2] = values
+        else:
+            np.minimum(self.open[0], values, out=self.open[0])
+            self.open[1] += values
+            np.maximum(self.open[2], values, out=self.open[2])
+        self.open_count += 1
+
+    def _flush(self) -> None:
+        self.start[self.head] = self.open_start
+        self.count[self.head] = self.open_count
+        self.minmax[self.head, 0] = self.open[0]
+        self.minmax[self.head, 1] = self.open[2]
+        self.sum[self.head] = self.open[1]
+        self.head = (self.head + 1) % self.points
+        self.size = min(self.size + 1, self.points)
+        self.open_start, self.open_count = None, 0
+
+    def oldest(self) -> Optional[float]:
+        if self.size:
+            return float(self.start[(self.head - self.size) % self.points])
+        return self.open_start
+
+    def ordered(self) -> tuple[np.ndarray, ...]:
+        """(start, count, min, sum, max) in time order, open bucket last."""
+        idx = np.arange(self.head - self.size, self.head) % self.points
+        start, count = self.start[idx], self.count[idx]
+        lo, total, hi = self.minmax[idx, 0], self.sum[idx], self.minmax[idx, 1]
+        if self.open_count:
+            start = np.append(start, self.open_start)
+            count = np.append(count, self.open_count)
+            lo = np.concatenate([lo, self.open[0:1]])
+            total = np.concatenate([total, self.open[1:2]])
+            hi = np.concatenate([hi, self.open[2:3]])
+        return start, count, lo, total, hi
+
+
+class _Series:
+    def __init__(self, tiers: list[tuple[float, int]]) -> None:
+        self.tiers = [_Tier(w, p) for w, p in tiers]
+
+    def add(self, ts: float, values: np.ndarray) -> None:
+        for tier in self.tiers:
+            tier.add(ts, values)
+
+    def pick(self, start: float, step: float) -> _Tier:
+        """Finest tier that reaches back to `start` and is no coarser than `step`."""
+        usable = [t for t in self.tiers if t.width <= step] or self.tiers[:1]
+        for tier in usable:
+            oldest = tier.oldest()
+            if oldest is not None and oldest <= start:
+                return tier
+        return usable[-1]
+
+
+class MetricsHistory:
+    """Per-container ring buffers of CPU / memory / network, multi-resolution."""
+
+    def __init__(self, tiers: str | list[tuple[float, int]] = METRICS_HISTORY_TIERS,
+                 max_containers: int = METRICS_HISTORY_MAX_CONTAINERS) -> None:
+        self.tiers = parse_tiers(tiers) if isinstance(tiers, str) else sorted(tiers)
+        self.max_containers = max_containers
+        self._series: OrderedDict[str, _Series] = OrderedDict()
+
+    @property
+    def bytes_per_container(self) -> int:
+        return sum(_Tier.nbytes_for(p) for _, p in self.tiers)
+
+    @property
+    def retention_secs(self) -> float:
+        return max(w * p for w, p in self.tiers)
+
+    def record(self, rows: Iterable[dict], ts: float | None = None) -> None:
+        """Add one tick: rows shaped like ContainerMetrics.model_dump()."""
+        ts = time.time() if ts is None else ts
+        for row in rows:
+            name = row["name"]
+            series = self._series.get(name)
+            if series is None:
+                if len(self._series) >= self.max_containers:
+                    self._series.popitem(last=False)  # least recently seen
+                series = self._series[name] = _Series(self.tiers)
+            else:
+                self._series.move_to_end(name)
+            series.add(ts, np.array([float(row.get(f) or 0) for f in FIELDS]))
+
+    def names(self) -> list[str]:
+        return list(self._series)
+
+    def query(self, name: str, start: float, end: float, step: float,
+              agg: str = "avg") -> Optional[dict]:
+        """
+        Columnar series for one container: {"ts": [...], <field>: [...]},
+        one point per `step` bucket that has data, plus the tier width used.
+        """
+        if agg not in AGGREGATIONS:
+            raise ValueError(f"agg must be one of {AGGREGATIONS}")
+        series = self._series.get(name)
+        if series is None:
+            return None
+        tier = series.pick(start, step)
+        starts, counts, lo, total, hi = tier.ordered()
+        keep = (starts > start - tier.width) & (starts <= end)
+        starts, counts = starts[keep], counts[keep]
+        out: dict = {"resolution": tier.width, "ts": []}
+        if not len(starts):
+            out.update({f: [] for f in FIELDS})
+            return out
+
+        # Re-bucket to `step`; starts are sorted, so bucket ids are too
+        bucket = np.floor((np.maximum(starts, start) - start) / step).astype(np.int64)
+        first = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        if agg == "min":
+            values = np.minimum.reduceat(lo[keep], first, axis=0)
+        elif agg == "max":
+            values = np.maximum.reduceat(hi[keep], first, axis=0)
+        else:
+            values = (np.add.reduceat(total[keep], first, axis=0)
+                      / np.add.reduceat(counts, first)[:, None])
+        out["ts"] = (start + bucket[first] * step).round(3).tolist()
+        for i, f in enumerate(FIELDS):
+            out[f] = values[:, i].round(2).tolist()
+        return out
+
+    def status(self) -> dict:
+        return {
+            "containers": len(self._series),
+            "max_containers": self.max_containers,
+            "tiers": [{"step_secs": w, "points": p} for w, p in self.tiers],
+            "retention_secs": self.retention_secs,
+            "bytes_per_container": self.bytes_per_container,
+            "bytes": self.bytes_per_container * len(self._series),
+        }
+
+
+# Singleton
+metrics_history = MetricsHistory()
@@ -101,12 +101,24 @@ class IncidentResult(BaseModel):
     timeline: list[TimelineEntry] = Field(default_factory=list)
 
 
+class BatchIngestResult(BaseModel):
+    accepted: list[IncidentResult] = Field(default_factory=list)
+    duplicates: list[str] = Field(default_factory=list, description="IDs repeated within the batch")
+    already_pending: list[str] = Field(
+        default_factory=list, description="IDs still queued or being remediated from earlier deliveries")
+
+
 # ── Scaling events ───────────────────────────────────────────────────
 class ScaleEvent(BaseModel):
     container_base: str
-    replica_count: int
-    replicas: list[str] = Field(default_factory=list)
+    replica_count: int                                          # desired count
+    replicas: list[str] = Field(default_factory=list)           # live set afterwards
     lb_configured: bool = False
+    outcome: str = "applied"                                    # applied | noop | deferred
+    reason: str = ""
+    started: list[str] = Field(default_factory=list)
+    removed: list[str] = Field(default_factory=list)
+    incident_ids: list[str] = Field(default_factory=list)      # requests merged into this one
     timestamp: str = Field(default_factory=lambda: _dt.datetime.utcnow().isoformat())
 
 
@@ -123,16 +135,20 @@ class WSFrameType(str, Enum):
     SCALE_EVENT = "scale.event"
     HEALTH_CHECK = "health.check"
     METRICS = "metrics"
+    METRICS_DELTA = "metrics.delta"
     CONTAINER_LIST = "container.list"
     TOPOLOGY = "topology"
     RESOLVED = "resolved"
     FAILED = "failed"
     HEARTBEAT = "heartbeat"
+    SUBSCRIPTION = "subscription"
+    RESUME = "resume"
 
 
 class WSFrame(BaseModel):
     type: WSFrameType
     incident_id: Optional[str] = None
+    seq: Optional[int] = None          # per-worker broadcast order (None = direct reply)
     data: Any = None
     timestamp: str = Field(default_factory=lambda: _dt.datetime.utcnow().isoformat())
 
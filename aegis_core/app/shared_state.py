@@ -0,0 +1,380 @@
+"""
+AegisOps GOD MODE – Shared state for multi-worker deployments.
+
+Everything a uvicorn worker needs to agree on with its siblings:
+  • Incident store backend   – where IncidentStore persists incidents
+  • Pub/sub                  – WS frames produced on one worker reach
+                               clients connected to every other worker
+  • Leader election          – exactly one worker runs _metrics_loop
+  • Named locks              – one worker at a time acts on a target
+                               (remediation, scaling reconciliation)
+  • Small JSON state records – e.g. the scaler's desired count / cooldown
+
+Backends (SHARED_STATE_URL):
+  • ""            → LocalSharedState: SQLite + in-process, single worker
+  • "redis://…"   → RedisSharedState: any Redis-protocol server. Clients
+                    are injectable, so tests can pass a local stand-in
+                    (e.g. fakeredis) instead of a live server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime
+from typing import Any, AsyncContextManager, AsyncIterator, Awaitable, Callable, Optional
+
+from .config import (
+    INCIDENT_DB_PATH, LEADER_LEASE_SECS, SHARED_STATE_PREFIX, SHARED_STATE_URL,
+    TARGET_LEASE_SECS,
+)
+from .incident_store import TERMINAL_STATUSES, Row, SQLiteIncidentBackend
+
+logger = logging.getLogger("aegis.shared_state")
+
+MessageHandler = Callable[[str], Awaitable[None]]
+
+
+def _worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Local (default) – single process
+# ═══════════════════════════════════════════════════════════════════════
+
+class LocalSharedState:
+    """Single-worker default: SQLite incidents, no cross-process traffic."""
+
+    distributed = False
+
+    def __init__(self) -> None:
+        self.worker_id = _worker_id()
+
+    def incident_backend(self) -> SQLiteIncidentBackend:
+        return SQLiteIncidentBackend(INCIDENT_DB_PATH)
+
+    @property
+    def is_leader(self) -> bool:
+        return True
+
+    async def start(self) -> None:
+        logger.info("🌐 Shared state: local (single worker %s)", self.worker_id)
+
+    async def close(self) -> None:
+        return None
+
+    async def publish(self, channel: str, message: str) -> None:
+        # Local delivery has already happened – nobody else to tell.
+        return None
+
+    def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        return None
+
+    def lock(self, name: str) -> AsyncContextManager[None]:
+        # In-process locks (TargetCoordinator, ScalingController) suffice
+        return contextlib.nullcontext()
+
+    async def load_state(self, key: str) -> Optional[dict]:
+        return None
+
+    async def save_state(self, key: str, value: dict) -> None:
+        return None
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Redis-protocol backend
+# ═══════════════════════════════════════════════════════════════════════
+
+# Renew / release the lease only if we still hold it
+_RENEW_LUA = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('pexpire', KEYS[1], ARGV[2]) else return 0 end"
+)
+_RELEASE_LUA = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('del', KEYS[1]) else return 0 end"
+)
+
+
+class RedisIncidentBackend:
+    """
+    IncidentStore backend on Redis (sync client – called via to_thread).
+
+    Layout (prefix ``p``):
+      p:incident:<id>          → JSON body
+      p:idx:created            → ZSET id scored by created epoch
+      p:idx:status:<status>    → ZSET id scored by created epoch
+      p:idx:alert:<alert_type> → ZSET id scored by created epoch
+    """
+
+    def __init__(self, client: Any, prefix: str = SHARED_STATE_PREFIX) -> None:
+        self._r = client
+        self._p = prefix
+
+    def _score(self, created_at: str) -> float:
+        try:
+            return datetime.fromisoformat(created_at).timestamp()
+        except ValueError:
+            return 0.0
+
+    def write_many(self, rows: list[Row]) -> None:
+        old_status = self._r.mget([f"{self._p}:status:{r[0]}" for r in rows]) if rows else []
+        pipe = self._r.pipeline(transaction=True)
+        for (iid, status, alert_type, created_at, _updated, body), prev in zip(rows, old_status):
+            score = self._score(created_at)
+            if prev is not None and _s(prev) != status:
+                pipe.zrem(f"{self._p}:idx:status:{_s(prev)}", iid)
+            pipe.set(f"{self._p}:incident:{iid}", body)
+            pipe.set(f"{self._p}:status:{iid}", status)
+            pipe.zadd(f"{self._p}:idx:created", {iid: score})
+            pipe.zadd(f"{self._p}:idx:status:{status}", {iid: score})
+            pipe.zadd(f"{self._p}:idx:alert:{alert_type}", {iid: score})
+        pipe.execute()
+
+    def get(self, incident_id: str) -> Optional[str]:
+        body = self._r.get(f"{self._p}:incident:{incident_id}")
+        return None if body is None else _s(body)
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        alert_type: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = 100,
+    ) -> list[str]:
+        index = (
+            f"{self._p}:idx:status:{status}" if status
+            else f"{self._p}:idx:alert:{alert_type}" if alert_type
+            else f"{self._p}:idx:created"
+        )
+        low = self._score(since) if since else "-inf"
+        out: list[str] = []
+        offset, page = 0, max(limit, 50)
+        while len(out) < limit:
+            ids = self._r.zrevrangebyscore(index, "+inf", low, start=offset, num=page)
+            if not ids:
+                break
+            offset += len(ids)
+            bodies = self._r.mget([f"{self._p}:incident:{_s(i)}" for i in ids])
+            for body in bodies:
+                if body is None:
+                    continue
+                body = _s(body)
+                if status and alert_type and json.loads(body).get("alert_type") != alert_type:
+                    continue
+                out.append(body)
+                if len(out) >= limit:
+                    break
+        return out
+
+    def unfinished(self) -> list[str]:
+        ids: list[str] = []
+        terminal = {s.value for s in TERMINAL_STATUSES}
+        for key in self._r.scan_iter(match=f"{self._p}:idx:status:*"):
+            if _s(key).rsplit(":", 1)[-1] not in terminal:
+                ids.extend(_s(i) for i in self._r.zrange(key, 0, -1))
+        bodies = self._r.mget([f"{self._p}:incident:{i}" for i in ids]) if ids else []
+        return [_s(b) for b in bodies if b is not None]
+
+    def close(self) -> None:
+        try:
+            self._r.close()
+        except Exception:
+            pass
+
+
+def _s(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class RedisSharedState:
+    """Cross-worker state on a Redis-protocol server."""
+
+    distributed = True
+
+    def __init__(
+        self,
+        url: str = SHARED_STATE_URL,
+        prefix: str = SHARED_STATE_PREFIX,
+        lease_secs: float = LEADER_LEASE_SECS,
+        lock_lease_secs: float = TARGET_LEASE_SECS,
+        sync_client: Any = None,
+        async_client: Any = None,
+    ) -> None:
+        if sync_client is None or async_client is None:
+            try:
+                import redis
+                import redis.asyncio as aioredis
+            except ImportError as exc:  # optional dependency
+                raise RuntimeError(
+                    "SHARED_STATE_URL points at Redis but the 'redis' package "
+                    "is not installed (pip install redis)"
+                ) from exc
+            sync_client = sync_client or redis.Redis.from_url(url)
+            async_client = async_client or aioredis.Redis.from_url(url)
+        self.worker_id = _worker_id()
+        self._sync = sync_client
+        self._r = async_client
+        self._prefix = prefix
+        self._lease_ms = int(lease_secs * 1000)
+        self._lock_lease_ms = int(lock_lease_secs * 1000)
+        self._leader_key = f"{prefix}:leader"
+        self._is_leader = False
+        self._handlers: dict[str, list[MessageHandler]] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    def incident_backend(self) -> RedisIncidentBackend:
+        return RedisIncidentBackend(self._sync, self._prefix)
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader
+
+    # ── Lifecycle ────────────────────────────────────────────────────
+    async def start(self) -> None:
+        await self._campaign_once()
+        self._tasks.append(asyncio.create_task(self._campaign_loop()))
+        if self._handlers:
+            self._tasks.append(asyncio.create_task(self._listen()))
+        logger.info("🌐 Shared state: redis (worker %s, leader=%s)",
+                    self.worker_id, self._is_leader)
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._is_leader:
+            try:
+                await self._r.eval(_RELEASE_LUA, 1, self._leader_key, self.worker_id)
+            except Exception as exc:
+                logger.debug("Leader release failed: %s", exc)
+            self._is_leader = False
+        try:
+            await self._r.aclose()
+        except Exception:
+            pass
+
+    # ── Leader election (lease with renewal) ─────────────────────────
+    async def _campaign_once(self) -> None:
+        try:
+            if self._is_leader:
+                renewed = await self._r.eval(
+                    _RENEW_LUA, 1, self._leader_key, self.worker_id, self._lease_ms
+                )
+                self._is_leader = bool(renewed)
+            else:
+                acquired = await self._r.set(
+                    self._leader_key, self.worker_id, nx=True, px=self._lease_ms
+                )
+                self._is_leader = bool(acquired)
+                if self._is_leader:
+                    logger.info("👑 Worker %s is now leader", self.worker_id)
+        except Exception as exc:
+            # Can't prove we hold the lease → stop acting as leader
+            if self._is_leader:
+                logger.warning("👑 Lost leadership (redis error: %s)", exc)
+            self._is_leader = False
+
+    async def _campaign_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._lease_ms / 3000)
+            await self._campaign_once()
+
+    # ── Named locks (lease with renewal) ─────────────────────────────
+    @contextlib.asynccontextmanager
+    async def lock(self, name: str) -> AsyncIterator[None]:
+        """
+        Hold ``name`` across every worker for the duration of the block.
+        Waits (polling with backoff) while another worker holds it; the
+        lease is renewed while held, so it only lapses if we die.
+        """
+        key = f"{self._prefix}:lock:{name}"
+        token = f"{self.worker_id}:{uuid.uuid4().hex[:8]}"
+        delay = 0.02
+        while not await self._r.set(key, token, nx=True, px=self._lock_lease_ms):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.5)
+        keepalive = asyncio.create_task(self._keep_lock(key, token, name))
+        try:
+            yield
+        finally:
+            keepalive.cancel()
+            await asyncio.gather(keepalive, return_exceptions=True)
+            try:
+                await self._r.eval(_RELEASE_LUA, 1, key, token)
+            except Exception as exc:
+                logger.debug("Lock %s release failed (lease will expire): %s", name, exc)
+
+    async def _keep_lock(self, key: str, token: str, name: str) -> None:
+        while True:
+            await asyncio.sleep(self._lock_lease_ms / 3000)
+            try:
+                held = await self._r.eval(_RENEW_LUA, 1, key, token, self._lock_lease_ms)
+            except Exception as exc:
+                logger.warning("🔒 Could not renew lock %s: %s", name, exc)
+                continue
+            if not held:
+                logger.warning("🔒 Lock %s lapsed while held – another worker may act", name)
+                return
+
+    # ── State records ────────────────────────────────────────────────
+    async def load_state(self, key: str) -> Optional[dict]:
+        raw = await self._r.get(f"{self._prefix}:state:{key}")
+        return None if raw is None else json.loads(_s(raw))
+
+    async def save_state(self, key: str, value: dict) -> None:
+        await self._r.set(f"{self._prefix}:state:{key}", json.dumps(value))
+
+    # ── Pub/sub ──────────────────────────────────────────────────────
+    async def publish(self, channel: str, message: str) -> None:
+        envelope = json.dumps({"origin": self.worker_id, "body": message})
+        await self._r.publish(f"{self._prefix}:{channel}", envelope)
+
+    def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        """Register before start(); messages from this worker are skipped."""
+        self._handlers.setdefault(channel, []).append(handler)
+
+    async def _listen(self) -> None:
+        channels = {f"{self._prefix}:{c}": c for c in self._handlers}
+        while True:
+            pubsub = self._r.pubsub()
+            try:
+                await pubsub.subscribe(*channels)
+                async for msg in pubsub.listen():
+                    if msg.get("type") != "message":
+                        continue
+                    envelope = json.loads(_s(msg["data"]))
+                    if envelope.get("origin") == self.worker_id:
+                        continue
+                    for handler in self._handlers[channels[_s(msg["channel"])]]:
+                        try:
+                            await handler(envelope["body"])
+                        except Exception as exc:
+                            logger.debug("Shared-state handler error: %s", exc)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Pub/sub connection lost (%s) – resubscribing", exc)
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+def build_shared_state(url: str = SHARED_STATE_URL) -> LocalSharedState | RedisSharedState:
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisSharedState(url)
+    return LocalSharedState()
+
+
+# Singleton
+shared_state = build_shared_state()
@@ -11,6 +11,7 @@ import httpx
 
 from .config import SLACK_WEBHOOK_URL
 from .models import AIAnalysis, CouncilDecision, IncidentPayload, ResolutionStatus
+from .telemetry import HTTP_CALL, PIPELINE_STAGE
 
 logger = logging.getLogger("aegis.slack")
 
@@ -88,11 +89,41 @@ async def notify(
 
     blocks.append({"type": "divider"})
 
+    await _post(blocks, status.value, analysis.action.value if analysis else "none")
+
+
+async def notify_batch(payloads: list[IncidentPayload]) -> None:
+    """One RECEIVED message for a whole /webhook/batch delivery."""
+    if not SLACK_WEBHOOK_URL or not payloads:
+        return
+
+    emoji = _STATUS_EMOJI[ResolutionStatus.RECEIVED]
+    lines = "\n".join(f"• `{p.incident_id}` – {p.alert_type}" for p in payloads[:20])
+    if len(payloads) > 20:
+        lines += f"\n…and {len(payloads) - 20} more"
+
+    blocks: list[dict] = [
+        {
+            "type": "header",
+            "text": {
+                "type": "plain_text",
+                "text": f"{emoji}  AegisOps GOD MODE – {len(payloads)} incidents RECEIVED",
+                "emoji": True,
+            },
+        },
+        {"type": "section", "text": {"type": "mrkdwn", "text": lines}},
+        {"type": "divider"},
+    ]
+    await _post(blocks, f"{ResolutionStatus.RECEIVED.value} x{len(payloads)}", "none")
+
+
+async def _post(blocks: list[dict], label: str, action: str) -> None:
     try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            resp = await client.post(SLACK_WEBHOOK_URL, json={"blocks": blocks})
+        with PIPELINE_STAGE.time(stage="slack", action=action), HTTP_CALL.time(target="slack"):
+            async with httpx.AsyncClient(timeout=5) as client:
+                resp = await client.post(SLACK_WEBHOOK_URL, json={"blocks": blocks})
             if resp.status_code == 200:
-                logger.info("📣 Slack → %s", status.value)
+                logger.info("📣 Slack → %s", label)
             else:
                 logger.warning("Slack returned %d", resp.status_code)
     except httpx.RequestError as exc:
@@ -0,0 +1,202 @@
+"""
+AegisOps GOD MODE – Streaming container stats collector.
+
+One-shot `container.stats(stream=False)` makes the daemon take two samples
+a second apart, so polling N containers costs N × ~1–2 s of daemon time
+per tick. Instead, the collector keeps ONE streaming stats subscription per
+running container and folds every sample into a shared snapshot:
+
+  • supervisor (async)  – every STATS_RESYNC_SECS reads the running set
+                          (from the container inventory when it is live, one
+                          list call otherwise), starts streams for new
+                          containers, forgets gone ones
+  • stream (thread)     – one daemon thread per container iterating
+                          `stats(stream=True, decode=True)`; each sample is
+                          turned into ContainerMetrics and stored
+  • snapshot()          – reads the latest sample of every container; no
+                          Docker call, no waiting
+
+Streams run on dedicated daemon threads, not the asyncio thread pool, so
+long-lived subscriptions never starve the pool the rest of docker_ops uses.
+A stream ends by itself when its container stops.
+
+With METRICS_BACKEND=auto|cgroup and the host's cgroup v2 tree visible,
+containers whose cgroup is found get no stream at all: snapshot() reads
+their cgroup files directly (see cgroup_metrics). The rest keep streaming.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .cgroup_metrics import CgroupReader
+from .config import METRICS_BACKEND, STATS_RESYNC_SECS
+from . import docker_ops
+from .docker_executor import BACKGROUND
+from .docker_ops import _run, _uptime, metrics_from_stats
+from .models import ContainerMetrics
+
+logger = logging.getLogger("aegis.stats")
+
+
+@dataclass
+class _Stream:
+    name: str
+    container_id: str
+    image: str
+    started_at: str
+    # Wall-clock start, parsed once; uptime is derived from it on read
+    started_ts: float = field(init=False)
+    thread: Optional[threading.Thread] = None
+    cgroup: bool = False
+    latest: Optional[ContainerMetrics] = None
+    samples: int = 0
+    stopped: bool = False
+
+    def __post_init__(self) -> None:
+        self.started_ts = time.time() - _uptime(self.started_at) if self.started_at else time.time()
+
+
+class StatsCollector:
+    """Keeps the latest stats sample of every running container."""
+
+    def __init__(self, resync_secs: float = STATS_RESYNC_SECS,
+                 backend: str = METRICS_BACKEND, cgroup: CgroupReader | None = None) -> None:
+        self.resync_secs = resync_secs
+        self._streams: dict[str, _Stream] = {}
+        self._task: asyncio.Task | None = None
+        self._cgroup: CgroupReader | None = None
+        if backend != "docker":
+            reader = cgroup or CgroupReader()
+            if reader.available:
+                self._cgroup = reader
+            elif backend == "cgroup":
+                logger.warning("⚠️ No readable cgroup v2 tree at %s – using Docker stats", reader.root)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ── Lifecycle ────────────────────────────────────────────────────
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._supervise())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for stream in self._streams.values():
+            stream.stopped = True
+        self._streams = {}
+
+    async def refresh(self) -> None:
+        """Re-list containers now (e.g. right after a scale event)."""
+        inv = docker_ops._inventory()
+        if inv is not None:  # event-driven list – no Docker call
+            running = [(i.name, i.id, i.image, i.started_at) for i in inv.list()]
+        else:
+            running = await _run("list", _list_running, priority=BACKGROUND)
+        self._reconcile(running)
+
+    # ── Reads ────────────────────────────────────────────────────────
+    def snapshot(self) -> list[ContainerMetrics]:
+        """Latest metrics for every running container (placeholder until its first sample)."""
+        out = []
+        for stream in list(self._streams.values()):
+            if stream.stopped:
+                continue  # container went away; the next resync drops or restarts it
+            if stream.cgroup:
+                latest = self._cgroup.read(stream.name, stream.container_id, stream.image,
+                                           time.time() - stream.started_ts)
+                if latest is not None:
+                    stream.samples += 1
+                    out.append(latest)
+                    continue
+                stream.stopped = True  # cgroup vanished; the next resync re-resolves it
+                continue
+            latest = stream.latest
+            if latest is None:
+                out.append(ContainerMetrics(name=stream.name, status="running", image=stream.image))
+            else:
+                # Uptime moves on between samples
+                out.append(latest.model_copy(
+                    update={"uptime_seconds": round(time.time() - stream.started_ts, 0)}))
+        return out
+
+    def status(self) -> dict:
+        return {
+            "running": self.running,
+            "streams": len(self._streams),
+            "cgroup": sum(1 for s in self._streams.values() if s.cgroup),
+            "samples": sum(s.samples for s in self._streams.values()),
+        }
+
+    # ── Supervisor ───────────────────────────────────────────────────
+    async def _supervise(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as exc:
+                logger.debug("Stats resync failed: %s", exc)
+            await asyncio.sleep(self.resync_secs)
+
+    def _reconcile(self, running: list[tuple[str, str, str, str]]) -> None:
+        live = {}
+        for name, cid, image, started_at in running:
+            stream = self._streams.get(name)
+            if stream is not None and stream.container_id == cid and not stream.stopped:
+                live[name] = stream
+                continue
+            if stream is not None:
+                stream.stopped = True  # same name, new container (restart / replace)
+            stream = _Stream(name=name, container_id=cid, image=image, started_at=started_at)
+            if self._cgroup is not None and self._cgroup.path_for(cid) is not None:
+                stream.cgroup = True
+                live[name] = stream
+                continue
+            stream.thread = threading.Thread(
+                target=self._pump, args=(stream,), name=f"stats-{name}", daemon=True,
+            )
+            stream.thread.start()
+            live[name] = stream
+        for name, stream in self._streams.items():
+            if live.get(name) is not stream:
+                stream.stopped = True
+                if self._cgroup is not None:
+                    self._cgroup.forget(stream.container_id)
+        self._streams = live
+
+    def _pump(self, stream: _Stream) -> None:
+        """Thread body: fold streamed samples into stream.latest until stopped."""
+        try:
+            container = docker_ops._get_client().containers.get(stream.container_id)
+            for sample in container.stats(stream=True, decode=True):
+                if stream.stopped:
+                    break
+                stream.latest = metrics_from_stats(
+                    stream.name, sample, started_at=stream.started_at, image=stream.image,
+                )
+                stream.samples += 1
+        except Exception as exc:
+            logger.debug("Stats stream for %s ended: %s", stream.name, exc)
+        finally:
+            stream.stopped = True
+
+
+def _list_running() -> list[tuple[str, str, str, str]]:
+    return [
+        (c.name, c.id, c.image.tags[0] if c.image.tags else "unknown",
+         c.attrs.get("State", {}).get("StartedAt", ""))
+        for c in docker_ops._get_client().containers.list()
+    ]
+
+
+# Singleton
+stats_collector = StatsCollector()
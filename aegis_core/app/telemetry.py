@@ -0,0 +1,186 @@
+"""
+AegisOps GOD MODE – Pipeline latency instrumentation.
+
+Fixed-bucket histograms (Prometheus style) – one observation is a bisect
+and two integer increments, cheap enough to wrap every pipeline stage and
+every external call (LLM, Docker, httpx). Exposed as Prometheus text and
+as a p50/p95/p99 summary for humans.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+# Seconds – covers sub-ms Docker inspects up to multi-minute LLM stalls
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+
+class _Series:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, n_buckets: int) -> None:
+        self.counts = [0] * (n_buckets + 1)  # last slot = +Inf
+        self.total = 0.0
+        self.count = 0
+
+
+class Histogram:
+    """Labelled histogram. Thread-safe: Docker calls observe from worker threads."""
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...],
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], _Series] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.label_names)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self.buckets))
+            series.counts[idx] += 1
+            series.total += value
+            series.count += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """
+        Time a block. If the histogram has an ``outcome`` label it is set to
+        ok/error; cancellation and generator close are not errors.
+        """
+        start = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            if "outcome" in self.label_names:
+                labels["outcome"] = outcome
+            self.observe(time.perf_counter() - start, **labels)
+
+    # ── Reading ──────────────────────────────────────────────────────
+    def _merged(self, group_by: str) -> dict[str, _Series]:
+        """Collapse every other label so series are keyed by one label only."""
+        pos = self.label_names.index(group_by)
+        merged: dict[str, _Series] = {}
+        with self._lock:
+            for key, series in self._series.items():
+                acc = merged.setdefault(key[pos], _Series(len(self.buckets)))
+                acc.counts = [a + b for a, b in zip(acc.counts, series.counts)]
+                acc.total += series.total
+                acc.count += series.count
+        return merged
+
+    def _quantile(self, series: _Series, q: float) -> float:
+        """Linear interpolation inside the bucket holding rank q (histogram_quantile)."""
+        if series.count == 0:
+            return 0.0
+        rank = q * series.count
+        cumulative = 0
+        for i, c in enumerate(series.counts):
+            if cumulative + c >= rank and c > 0:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                if i >= len(self.buckets):
+                    return lower  # +Inf bucket – best we can say is "at least"
+                upper = self.buckets[i]
+                return lower + (upper - lower) * (rank - cumulative) / c
+            cumulative += c
+        return self.buckets[-1]
+
+    def summary(self, group_by: str) -> dict[str, dict]:
+        return {
+            label: {
+                "count": s.count,
+                "avg_ms": round(s.total / s.count * 1000, 2) if s.count else 0.0,
+                "p50_ms": round(self._quantile(s, 0.50) * 1000, 2),
+                "p95_ms": round(self._quantile(s, 0.95) * 1000, 2),
+                "p99_ms": round(self._quantile(s, 0.99) * 1000, 2),
+            }
+            for label, s in sorted(self._merged(group_by).items())
+        }
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(s.counts), s.total, s.count) for k, s in self._series.items()]
+        for key, counts, total, count in sorted(items):
+            base = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(self.label_names, key))
+            sep = "," if base else ""
+            cumulative = 0
+            for bound, c in zip(self.buckets, counts):
+                cumulative += c
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {count}')
+            labels = f"{{{base}}}" if base else ""
+            lines.append(f"{self.name}_sum{labels} {total:.6f}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# ── Registry ─────────────────────────────────────────────────────────
+PIPELINE_STAGE = Histogram(
+    "aegis_pipeline_stage_seconds",
+    "Time spent in each remediation pipeline stage.",
+    ("stage", "action"),
+)
+LLM_CALL = Histogram(
+    "aegis_llm_call_seconds",
+    "LLM request latency by provider and call type.",
+    ("provider", "call", "outcome"),
+)
+DOCKER_CALL = Histogram(
+    "aegis_docker_call_seconds",
+    "Docker API operation latency.",
+    ("op", "outcome"),
+)
+DOCKER_QUEUE_WAIT = Histogram(
+    "aegis_docker_queue_seconds",
+    "Time Docker calls waited for a Docker executor worker.",
+    ("priority",),
+)
+HTTP_CALL = Histogram(
+    "aegis_http_call_seconds",
+    "Outbound HTTP request latency (health probes, Slack).",
+    ("target", "outcome"),
+)
+
+REGISTRY: tuple[Histogram, ...] = (PIPELINE_STAGE, LLM_CALL, DOCKER_CALL, DOCKER_QUEUE_WAIT, HTTP_CALL)
+
+
+def render_prometheus() -> str:
+    lines: list[str] = []
+    for hist in REGISTRY:
+        lines.extend(hist.render())
+    return "\n".join(lines) + "\n"
+
+
+def pipeline_summary() -> dict:
+    return {
+        "stages": PIPELINE_STAGE.summary("stage"),
+        "llm": LLM_CALL.summary("provider"),
+        "docker": DOCKER_CALL.summary("op"),
+        "docker_queue": DOCKER_QUEUE_WAIT.summary("priority"),
+        "http": HTTP_CALL.summary("target"),
+    }
@@ -13,37 +13,104 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import random
 from pathlib import Path
+from typing import Awaitable, Callable
 
 import httpx
 
 from .config import (
     HEALTH_TIMEOUT_SECS, HEALTH_URL, RUNBOOK_PATH,
-    VERIFY_DELAY_SECS, VERIFY_RETRIES,
+    VERIFY_BACKOFF_SECS, VERIFY_DEADLINE_SECS, VERIFY_DELAY_SECS,
+    VERIFY_INITIAL_DELAY_SECS, VERIFY_SUCCESS_THRESHOLD,
 )
 from .models import AIAnalysis, IncidentPayload, RunbookEntry
+from .telemetry import HTTP_CALL
 
 logger = logging.getLogger("aegis.verification")
 
 
+_http: httpx.AsyncClient | None = None
+
+ProbeCallback = Callable[[int, bool], Awaitable[None]]
+
+
+def _get_http() -> httpx.AsyncClient:
+    """Pooled client reused across probes and incidents (keep-alive)."""
+    global _http
+    if _http is None or _http.is_closed:
+        _http = httpx.AsyncClient(
+            timeout=HEALTH_TIMEOUT_SECS,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _http
+
+
+async def close_http() -> None:
+    global _http
+    if _http is not None:
+        await _http.aclose()
+        _http = None
+
+
+async def _probe(url: str, attempt: int) -> bool:
+    try:
+        with HTTP_CALL.time(target="health"):
+            resp = await _get_http().get(url)
+        if resp.status_code == 200:
+            return True
+        logger.warning("Health attempt %d → HTTP %d", attempt, resp.status_code)
+    except httpx.RequestError as exc:
+        logger.warning("Health attempt %d failed: %s", attempt, exc)
+    return False
+
+
 async def verify_health(
     url: str = HEALTH_URL,
-    retries: int = VERIFY_RETRIES,
-    delay: int = VERIFY_DELAY_SECS,
+    deadline: float = VERIFY_DEADLINE_SECS,
+    required_passes: int = VERIFY_SUCCESS_THRESHOLD,
+    initial_delay: float = VERIFY_INITIAL_DELAY_SECS,
+    backoff: float = VERIFY_BACKOFF_SECS,
+    max_backoff: float = VERIFY_DELAY_SECS,
+    on_probe: ProbeCallback | None = None,
 ) -> bool:
-    for attempt in range(1, retries + 1):
-        logger.info("⏳ Health check %d/%d – waiting %ds…", attempt, retries, delay)
-        await asyncio.sleep(delay)
-        try:
-            async with httpx.AsyncClient(timeout=HEALTH_TIMEOUT_SECS) as client:
-                resp = await client.get(url)
-                if resp.status_code == 200:
-                    logger.info("💚 Health PASSED on attempt %d", attempt)
-                    return True
-                logger.warning("Health attempt %d → HTTP %d", attempt, resp.status_code)
-        except httpx.RequestError as exc:
-            logger.warning("Health attempt %d failed: %s", attempt, exc)
-    logger.error("❌ All %d health-check attempts failed.", retries)
+    """
+    Probe until ``required_passes`` consecutive successes or ``deadline``.
+
+    The first probe fires immediately (after an optional ``initial_delay``);
+    failures back off exponentially with jitter up to ``max_backoff``, while
+    confirmation probes after a pass use the short base ``backoff``.
+    ``on_probe(attempt, healthy)`` is awaited after every real probe.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    if initial_delay > 0:
+        await asyncio.sleep(initial_delay)
+
+    attempt = passes = 0
+    wait = backoff
+    while True:
+        attempt += 1
+        healthy = await _probe(url, attempt)
+        passes = passes + 1 if healthy else 0
+        if on_probe is not None:
+            await on_probe(attempt, healthy)
+        if passes >= required_passes:
+            logger.info("💚 Health PASSED (%d consecutive) after %d probe(s) in %.2fs",
+                        passes, attempt, loop.time() - started)
+            return True
+
+        remaining = deadline - (loop.time() - started)
+        if remaining <= 0:
+            break
+        if healthy:
+            pause = backoff
+        else:
+            pause = random.uniform(wait / 2, wait)
+            wait = min(wait * 2, max_backoff)
+        await asyncio.sleep(min(pause, remaining))
+
+    logger.error("❌ Health not confirmed within %.1fs (%d probes).", deadline, attempt)
     return False
 
 
@@ -3,54 +3,501 @@ AegisOps GOD MODE – WebSocket connection manager.
 
 Manages persistent connections for real-time UI streaming.
 Broadcasts frames to all connected cockpit clients.
+
+Fan-out never waits on the network: a frame is serialized once, appended
+to every client's bounded outbox, and each client's writer task drains
+its own outbox. A slow browser only ever delays itself.
+
+Clients may narrow what they receive by sending a subscribe message:
+    {"op": "subscribe", "types": [...], "incidents": [...], "containers": [...]}
+Each field given replaces that filter; null or ["*"] means everything,
+an omitted field is left as is. Frames are routed through per-type and
+per-incident indexes, so a broadcast only touches matching clients; a
+batched incident.new (a list of incidents) is trimmed to the incidents
+each client subscribed to.
+
+Encodings (negotiated with /ws?encoding=…, serialized once per encoding):
+  • json     – default, WSFrame as JSON text
+  • compact  – JSON text; metrics / container.list rows sent as
+               {"cols": [...], "rows": [[...], ...]} so keys go once
+  • msgpack  – compact layout as MessagePack binary frames (optional dep)
+permessage-deflate is negotiated by the server (uvicorn) on top of any of them.
+
+Resume: every broadcast gets a sequence number and is kept in a bounded
+per-topic replay buffer. Each connection first receives a `resume` frame
+naming the stream; reconnecting with /ws?stream=<id>&since=<last seq>
+replays only the missed frames, or flags snapshot_required when part of
+the gap has already been evicted.
 """
 
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
-from typing import Any
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, replace
+from typing import Any, Optional
 
 from fastapi import WebSocket
 
+try:
+    import msgpack
+except ImportError:  # optional dependency – msgpack clients fall back to json
+    msgpack = None
+
+from .config import (
+    WS_REPLAY_MAX_TOPICS, WS_REPLAY_PER_TOPIC, WS_SEND_QUEUE_SIZE, WS_SEND_TIMEOUT_SECS,
+    WS_SLOW_CLIENT_MAX_DROPS,
+)
 from .models import WSFrame, WSFrameType
 
+WS_CHANNEL = "ws"
+
+# Periodic frames – the next snapshot / metrics keyframe repairs a shed one
+DROPPABLE: frozenset[WSFrameType] = frozenset({
+    WSFrameType.METRICS, WSFrameType.METRICS_DELTA, WSFrameType.CONTAINER_LIST,
+    WSFrameType.HEARTBEAT,
+})
+
+# Full snapshots – only the latest is worth replaying
+SUPERSEDING: frozenset[WSFrameType] = frozenset({
+    WSFrameType.METRICS, WSFrameType.CONTAINER_LIST,
+})
+
+# Frames carrying per-container rows ({"name": …, …}); metrics.delta
+# nests them as {"changed": [rows], "removed": [names]}
+PER_CONTAINER: frozenset[WSFrameType] = SUPERSEDING | {WSFrameType.METRICS_DELTA}
+
+# Frames that may carry a list of per-incident rows ({"incident_id": …, …})
+# instead of one incident_id – e.g. incident.new for /webhook/batch
+PER_INCIDENT: frozenset[WSFrameType] = frozenset({WSFrameType.INCIDENT_NEW})
+
+ENCODINGS = ("json", "compact", "msgpack")
+
 logger = logging.getLogger("aegis.ws")
 
 
+@dataclass(frozen=True)
+class Subscription:
+    """What a client wants; None in a dimension means everything."""
+
+    types: Optional[frozenset[WSFrameType]] = None
+    incidents: Optional[frozenset[str]] = None
+    containers: Optional[frozenset[str]] = None
+
+    def as_dict(self) -> dict:
+        def _out(values):
+            return None if values is None else sorted(str(getattr(v, "value", v)) for v in values)
+        return {"types": _out(self.types), "incidents": _out(self.incidents),
+                "containers": _out(self.containers)}
+
+
+ALL = Subscription()
+
+
+def _columnar(rows: Any) -> Any:
+    if not rows or not isinstance(rows, list) or not isinstance(rows[0], dict):
+        return rows
+    cols = list(rows[0])
+    return {"cols": cols, "rows": [[r.get(c) for c in cols] for r in rows]}
+
+
+def encode(frame: WSFrame, encoding: str = "json") -> str | bytes:
+    """Serialize a frame for one wire encoding."""
+    compact_rows = frame.type in PER_CONTAINER
+    if encoding == "json" or (encoding == "compact" and not compact_rows):
+        return frame.model_dump_json()
+    if compact_rows:
+        # Rows are already plain dicts (model_dump / Docker listing)
+        data = frame.data
+        if isinstance(data, dict):
+            data = {**data, "changed": _columnar(data.get("changed"))}
+        else:
+            data = _columnar(data)
+        body = {"type": frame.type.value, "incident_id": frame.incident_id, "seq": frame.seq,
+                "data": data, "timestamp": frame.timestamp}
+    else:
+        body = frame.model_dump(mode="json")
+    if encoding == "msgpack":
+        return msgpack.packb(body)
+    return json.dumps(body, separators=(",", ":"))
+
+
+def _parse_filter(values: Any, cast=str) -> Optional[frozenset]:
+    if values is None or values == "*" or (isinstance(values, list) and "*" in values):
+        return None
+    if not isinstance(values, list):
+        raise ValueError("filters must be a list, '*' or null")
+    return frozenset(cast(v) for v in values)
+
+
+class ReplayBuffer:
+    """
+    Recent broadcasts, one bounded deque per topic.
+
+    Topics are incidents ("incident:<id>") or, for untagged frames, the
+    frame type. metrics / container.list keep only their latest frame –
+    it supersedes the rest, so dropping older ones loses nothing.
+    evicted_upto is the highest seq that was lost; a resume from below it
+    can't be served.
+    """
+
+    def __init__(self, per_topic: int = WS_REPLAY_PER_TOPIC,
+                 max_topics: int = WS_REPLAY_MAX_TOPICS) -> None:
+        self._per_topic = per_topic
+        self._max_topics = max_topics
+        self._topics: OrderedDict[str, deque[WSFrame]] = OrderedDict()
+        self.evicted_upto = 0
+
+    def add(self, frame: WSFrame) -> None:
+        if frame.type is WSFrameType.HEARTBEAT:
+            return
+        superseding = frame.type in SUPERSEDING
+        if frame.type is WSFrameType.METRICS:
+            # A keyframe makes the deltas before it redundant
+            self._topics.pop(WSFrameType.METRICS_DELTA.value, None)
+        topic = f"incident:{frame.incident_id}" if frame.incident_id else frame.type.value
+        buf = self._topics.get(topic)
+        if buf is None:
+            buf = self._topics[topic] = deque(maxlen=1 if superseding else self._per_topic)
+            if len(self._topics) > self._max_topics:
+                _, oldest = self._topics.popitem(last=False)
+                if oldest and oldest[0].type not in SUPERSEDING:
+                    self.evicted_upto = max(self.evicted_upto, oldest[-1].seq)
+        else:
+            self._topics.move_to_end(topic)
+            if len(buf) == buf.maxlen and not superseding:
+                self.evicted_upto = max(self.evicted_upto, buf[0].seq)
+        buf.append(frame)
+
+    def since(self, seq: int) -> Optional[list[WSFrame]]:
+        """Frames after ``seq`` in order, or None if some were evicted."""
+        if self.evicted_upto > seq:
+            return None
+        missed = [f for buf in self._topics.values() for f in buf if f.seq > seq]
+        missed.sort(key=lambda f: f.seq)
+        return missed
+
+    def live_state(self) -> list[WSFrame]:
+        """Latest keyframe, deltas since it and container list – for new clients."""
+        topics = (WSFrameType.METRICS, WSFrameType.METRICS_DELTA, WSFrameType.CONTAINER_LIST)
+        frames = [f for t in topics for f in self._topics.get(t.value, ())]
+        frames.sort(key=lambda f: f.seq)
+        return frames
+
+    def __len__(self) -> int:
+        return sum(len(buf) for buf in self._topics.values())
+
+
+class _Client:
+    """One connection: bounded outbox + the writer task that drains it."""
+
+    __slots__ = ("ws", "outbox", "wake", "drops", "task", "sub", "closed", "encoding")
+
+    def __init__(self, ws: WebSocket, encoding: str = "json") -> None:
+        self.ws = ws
+        self.encoding = encoding
+        self.outbox: deque[tuple[str | bytes, bool]] = deque()
+        self.wake = asyncio.Event()
+        self.drops = 0          # since the outbox last ran empty
+        self.task: asyncio.Task | None = None
+        self.sub = ALL
+        self.closed = False
+
+    def stop(self) -> None:
+        # The flag backs up cancel(): wait_for on 3.11 can swallow a
+        # cancellation that lands as a send completes
+        self.closed = True
+        self.wake.set()
+        if self.task is not None:
+            self.task.cancel()
+
+    def offer(self, text: str | bytes, droppable: bool) -> bool:
+        """Queue a serialized frame. False → client is too slow, evict it."""
+        if len(self.outbox) >= WS_SEND_QUEUE_SIZE:
+            victim = next((i for i, (_, d) in enumerate(self.outbox) if d), None)
+            if victim is None and not droppable:
+                return False  # outbox is all pipeline frames – nothing to shed
+            self.drops += 1
+            if self.drops > WS_SLOW_CLIENT_MAX_DROPS:
+                return False
+            if victim is None:
+                return True   # shed the incoming snapshot instead
+            del self.outbox[victim]
+        self.outbox.append((text, droppable))
+        self.wake.set()
+        return True
+
+
 class ConnectionManager:
     """
-    Thread-safe WebSocket connection manager.
+    WebSocket connection manager (event-loop only, no cross-thread use).
     All connected React cockpit clients receive real-time frames.
     """
 
     def __init__(self) -> None:
-        self._connections: list[WebSocket] = []
-        self._lock = asyncio.Lock()
+        self._clients: dict[WebSocket, _Client] = {}
+        self.stream_id = uuid.uuid4().hex[:12]   # seqs are only comparable within a stream
+        self._seq = 0
+        self._replay = ReplayBuffer()
+        # Routing indexes: a client sits in the "any" set or in one bucket per value
+        self._any_type: set[_Client] = set()
+        self._by_type: dict[WSFrameType, set[_Client]] = {}
+        self._any_incident: set[_Client] = set()
+        self._by_incident: dict[str, set[_Client]] = {}
+        self._bus = None
+        self._bus_outbox: asyncio.Queue[str] | None = None
+        self._bus_task: asyncio.Task | None = None
+        self._closing: set[asyncio.Task] = set()
+        self.slow_disconnects = 0
+
+    def attach_bus(self, bus) -> None:
+        """
+        Fan frames out across workers through a shared-state pub/sub bus.
+        Frames from sibling workers are delivered to our local clients only.
+        """
+        self._bus = bus
+
+        async def _from_peer(body: str) -> None:
+            # Renumber into this worker's stream
+            frame = self._sequence(WSFrame.model_validate_json(body))
+            self._deliver(frame, frame.model_dump_json())
+
+        bus.subscribe(WS_CHANNEL, _from_peer)
 
-    async def connect(self, ws: WebSocket) -> None:
+    async def connect(self, ws: WebSocket, encoding: str = "json",
+                      stream: str | None = None, since: int | None = None) -> None:
+        """
+        Accept a client. With ``stream``/``since`` from a previous session on
+        this worker, the frames it missed are queued ahead of live traffic.
+        """
+        if encoding not in ENCODINGS or (encoding == "msgpack" and msgpack is None):
+            logger.warning("WS encoding %r unavailable – using json", encoding)
+            encoding = "json"
         await ws.accept()
-        async with self._lock:
-            self._connections.append(ws)
-        logger.info("🔌 WS client connected (%d total)", len(self._connections))
+        client = _Client(ws, encoding)
+
+        # Fresh clients get the current metrics state; resumes get their gap
+        missed: list[WSFrame] | None = self._replay.live_state()
+        if since is not None:
+            missed = self._replay.since(since) if stream == self.stream_id else None
+            if missed is not None and len(missed) >= WS_SEND_QUEUE_SIZE:
+                missed = None  # bigger than the outbox – a snapshot is cheaper
+        client.offer(encode(WSFrame(type=WSFrameType.RESUME, data={
+            "stream": self.stream_id, "seq": self._seq,
+            "replayed": len(missed or ()), "snapshot_required": missed is None,
+        }), encoding), False)
+        for frame in missed or ():
+            client.offer(encode(frame, encoding), frame.type in DROPPABLE)
+
+        # No await since accept(): nothing live can slip in ahead of the replay
+        client.task = asyncio.create_task(self._writer(client))
+        self._clients[ws] = client
+        self._index(client)
+        logger.info("🔌 WS client connected (%d total%s)", len(self._clients),
+                    f", resumed +{len(missed)}" if since is not None and missed is not None
+                    else ", resume gap evicted" if since is not None else "")
 
     async def disconnect(self, ws: WebSocket) -> None:
-        async with self._lock:
-            if ws in self._connections:
-                self._connections.remove(ws)
-        logger.info("🔌 WS client disconnected (%d remaining)", len(self._connections))
+        client = self._clients.pop(ws, None)
+        if client is not None:
+            self._unindex(client)
+            client.stop()
+        logger.info("🔌 WS client disconnected (%d remaining)", len(self._clients))
+
+    async def close(self) -> None:
+        """Stop every writer and the bus publisher (shutdown)."""
+        tasks = [c.task for c in self._clients.values() if c.task is not None]
+        if self._bus_task is not None:
+            tasks.append(self._bus_task)
+        for client in self._clients.values():
+            client.stop()
+        if self._bus_task is not None:
+            self._bus_task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for client in list(self._clients.values()):
+            self._unindex(client)
+        self._clients.clear()
+        self._bus_task = None
 
     async def broadcast(self, frame: WSFrame) -> None:
-        """Send a frame to ALL connected clients."""
-        async with self._lock:
-            dead: list[WebSocket] = []
-            for ws in self._connections:
-                try:
-                    await ws.send_json(frame.model_dump())
-                except Exception:
-                    dead.append(ws)
-            for ws in dead:
-                self._connections.remove(ws)
+        """Queue a frame for every subscribed client (on every worker); never blocks."""
+        self._sequence(frame)
+        text = frame.model_dump_json()
+        self._deliver(frame, text)
+        if self._bus is not None and self._bus.distributed:
+            self._publish(text)
+
+    async def send_to(self, ws: WebSocket, frame: WSFrame) -> None:
+        """Queue a frame for one client, in order with its broadcasts."""
+        client = self._clients.get(ws)
+        if client is not None and not client.offer(encode(frame, client.encoding),
+                                                   frame.type in DROPPABLE):
+            self._evict(client)
+
+    def _sequence(self, frame: WSFrame) -> WSFrame:
+        self._seq += 1
+        frame.seq = self._seq
+        self._replay.add(frame)
+        return frame
+
+    def _deliver(self, frame: WSFrame, text: str) -> None:
+        """Queue a serialized frame for the matching clients on THIS worker."""
+        droppable = frame.type in DROPPABLE
+        # Per-container / per-incident row lists are trimmed per distinct
+        # filter; each (trim, encoding) variant is serialized once
+        trimmed: dict[Optional[frozenset[str]], Optional[WSFrame]] = {None: frame}
+        payloads: dict[tuple, str | bytes] = {(None, "json"): text}
+        batched = (frame.type in PER_INCIDENT and frame.incident_id is None
+                   and isinstance(frame.data, list))
+        for client in self._route(frame):
+            key = (client.sub.containers if frame.type in PER_CONTAINER
+                   else client.sub.incidents if batched else None)
+            if key not in trimmed:
+                trimmed[key] = self._trim(frame, key)
+            if trimmed[key] is None:
+                continue
+            variant = (key, client.encoding)
+            if variant not in payloads:
+                payloads[variant] = encode(trimmed[key], client.encoding)
+            if not client.offer(payloads[variant], droppable):
+                self._evict(client)
+
+    def _route(self, frame: WSFrame) -> list[_Client]:
+        # Unfiltered dimensions (the common case) cost no set arithmetic
+        matched = self._any_type
+        if len(matched) < len(self._clients):
+            matched = matched | self._by_type.get(frame.type, set())
+        if frame.incident_id is not None and len(self._any_incident) < len(self._clients):
+            matched = matched & (self._any_incident | self._by_incident.get(frame.incident_id, set()))
+        return list(matched)
+
+    @staticmethod
+    def _trim(frame: WSFrame, keep: frozenset[str]) -> Optional[WSFrame]:
+        """Only the rows for ``keep`` (containers, or incidents for PER_INCIDENT)."""
+        data = frame.data
+        if frame.type in PER_INCIDENT:
+            rows = [r for r in data if isinstance(r, dict) and r.get("incident_id") in keep]
+            return frame.model_copy(update={"data": rows}) if rows else None
+        if isinstance(data, dict):  # metrics.delta
+            changed = [r for r in data.get("changed", []) if r.get("name") in keep]
+            removed = [n for n in data.get("removed", []) if n in keep]
+            if not changed and not removed:
+                return None
+            return frame.model_copy(update={"data": {"changed": changed, "removed": removed}})
+        rows = [r for r in data or [] if isinstance(r, dict) and r.get("name") in keep]
+        return frame.model_copy(update={"data": rows}) if rows else None
+
+    # ── Subscriptions ────────────────────────────────────────────────
+    async def handle_message(self, ws: WebSocket, raw: str) -> None:
+        """Apply a client control message and acknowledge the resulting filter."""
+        client = self._clients.get(ws)
+        if client is None:
+            return
+        try:
+            msg = json.loads(raw)
+            if not isinstance(msg, dict) or msg.get("op") != "subscribe":
+                raise ValueError("expected {\"op\": \"subscribe\", …}")
+            sub = client.sub
+            changes: dict[str, Any] = {}
+            if "types" in msg:
+                changes["types"] = _parse_filter(msg["types"], WSFrameType)
+            if "incidents" in msg:
+                changes["incidents"] = _parse_filter(msg["incidents"])
+            if "containers" in msg:
+                changes["containers"] = _parse_filter(msg["containers"])
+        except (ValueError, TypeError) as exc:
+            await self.send_to(ws, WSFrame(type=WSFrameType.SUBSCRIPTION,
+                                           data={"error": str(exc)}))
+            return
+        self._unindex(client)
+        client.sub = replace(sub, **changes)
+        self._index(client)
+        await self.send_to(ws, WSFrame(type=WSFrameType.SUBSCRIPTION, data=client.sub.as_dict()))
+
+    def _index(self, client: _Client) -> None:
+        sub = client.sub
+        if sub.types is None:
+            self._any_type.add(client)
+        else:
+            for t in sub.types:
+                self._by_type.setdefault(t, set()).add(client)
+        if sub.incidents is None:
+            self._any_incident.add(client)
+        else:
+            for iid in sub.incidents:
+                self._by_incident.setdefault(iid, set()).add(client)
+
+    def _unindex(self, client: _Client) -> None:
+        sub = client.sub
+        self._any_type.discard(client)
+        self._any_incident.discard(client)
+        for index, keys in ((self._by_type, sub.types), (self._by_incident, sub.incidents)):
+            for key in keys or ():
+                bucket = index.get(key)
+                if bucket is not None:
+                    bucket.discard(client)
+                    if not bucket:
+                        del index[key]
+
+    # ── Per-client writer ────────────────────────────────────────────
+    async def _writer(self, client: _Client) -> None:
+        try:
+            while not client.closed:
+                await client.wake.wait()
+                client.wake.clear()
+                while client.outbox and not client.closed:
+                    payload, _ = client.outbox.popleft()
+                    send = (client.ws.send_bytes if isinstance(payload, bytes)
+                            else client.ws.send_text)
+                    await asyncio.wait_for(send(payload), WS_SEND_TIMEOUT_SECS)
+                client.drops = 0
+        except Exception as exc:
+            logger.debug("WS send failed (%s) – dropping client", exc)
+            if self._clients.get(client.ws) is client:
+                del self._clients[client.ws]
+                self._unindex(client)
+
+    def _evict(self, client: _Client) -> None:
+        if self._clients.pop(client.ws, None) is None:
+            return
+        self._unindex(client)
+        self.slow_disconnects += 1
+        logger.warning("🐢 WS client too slow (%d frames queued, %d dropped) – disconnecting",
+                       len(client.outbox), client.drops)
+        client.stop()
+        client.outbox.clear()
+        task = asyncio.create_task(self._close_quietly(client.ws))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_quietly(ws: WebSocket) -> None:
+        try:
+            # 1013 "try again later" – the cockpit reconnects on close
+            await asyncio.wait_for(ws.close(code=1013), WS_SEND_TIMEOUT_SECS)
+        except Exception:
+            pass
+
+    # ── Cross-worker publish (off the broadcast path) ────────────────
+    def _publish(self, text: str) -> None:
+        if self._bus_task is None or self._bus_task.done():
+            self._bus_outbox = asyncio.Queue(maxsize=WS_SEND_QUEUE_SIZE)
+            self._bus_task = asyncio.create_task(self._publisher())
+        try:
+            self._bus_outbox.put_nowait(text)
+        except asyncio.QueueFull:
+            logger.warning("Shared-state bus backlog full – frame not published")
+
+    async def _publisher(self) -> None:
+        while True:
+            text = await self._bus_outbox.get()
+            try:
+                await self._bus.publish(WS_CHANNEL, text)
+            except Exception as exc:
+                logger.debug("WS publish failed: %s", exc)
 
     async def broadcast_raw(self, frame_type: WSFrameType, data: Any = None,
                             incident_id: str | None = None) -> None:
@@ -60,7 +507,24 @@ class ConnectionManager:
 
     @property
     def count(self) -> int:
-        return len(self._connections)
+        return len(self._clients)
+
+    def snapshot(self) -> dict:
+        queued = [len(c.outbox) for c in self._clients.values()]
+        encodings: dict[str, int] = {}
+        for c in self._clients.values():
+            encodings[c.encoding] = encodings.get(c.encoding, 0) + 1
+        return {
+            "clients": len(queued),
+            "filtered_clients": sum(c.sub != ALL for c in self._clients.values()),
+            "queued_frames": sum(queued),
+            "max_client_backlog": max(queued, default=0),
+            "slow_disconnects": self.slow_disconnects,
+            "encodings": encodings,
+            "stream": self.stream_id,
+            "seq": self._seq,
+            "replay_frames": len(self._replay),
+        }
 
 
 # Singleton
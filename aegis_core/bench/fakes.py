@@ -0,0 +1,454 @@
+"""
+AegisOps GOD MODE – In-process fakes for benchmarks and offline replay.
+
+Each fake replaces one I/O boundary so everything above it runs for real:
+  • FakeLLM      – stands in for the OpenAI-compatible clients in ai_brain
+                   (prompt building, JSON parsing, council tally stay real)
+  • FakeDocker   – stands in for the Docker SDK client in docker_ops
+                   (restart / scale / nginx code paths stay real; container
+                   events feed the inventory, followed logs the log tailer)
+  • FakeHealth   – stands in for verification._probe
+                   (verify_health backoff + early exit stay real)
+
+Latencies are blocking sleeps where the real call blocks (LLM, Docker run
+in worker threads) and async sleeps where it awaits (health probe), so
+thread-pool and event-loop contention look like production.
+
+``install(...)`` patches the app modules and returns an undo callable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Callable, Optional
+
+from docker.errors import APIError, NotFound
+
+
+def _jitter(rng: random.Random, latency: float, spread: float) -> float:
+    if latency <= 0:
+        return 0.0
+    return max(0.0, rng.uniform(latency * (1 - spread), latency * (1 + spread)))
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# LLM
+# ═══════════════════════════════════════════════════════════════════════
+
+# alert_type substring → action the fake SRE agent recommends
+DEFAULT_ACTIONS: dict[str, str] = {
+    "cpu": "SCALE_UP",
+    "latency": "SCALE_UP",
+    "traffic": "SCALE_UP",
+    "memory": "RESTART",
+    "crash": "RESTART",
+    "oom": "RESTART",
+}
+
+
+class FakeLLM:
+    """
+    OpenAI ``chat.completions.create`` look-alike.
+
+    Responses are JSON chosen by call type (analysis / security / auditor);
+    ``responses`` overrides any of them with a fixed dict. Without an
+    override the analysis action is derived from the alert type.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.5,
+        stream_latency: Optional[float] = None,
+        spread: float = 0.3,
+        stream_chunks: int = 40,
+        reject_rate: float = 0.0,
+        responses: Optional[dict[str, dict]] = None,
+        seed: int = 7,
+    ) -> None:
+        self.latency = latency
+        self.stream_latency = latency if stream_latency is None else stream_latency
+        self.spread = spread
+        self.stream_chunks = max(1, stream_chunks)
+        self.reject_rate = reject_rate
+        self.responses = responses or {}
+        self.calls: dict[str, int] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    # ── OpenAI surface ───────────────────────────────────────────────
+    def create(self, model: str, messages: list[dict], stream: bool = False, **_: Any):
+        from app import ai_brain
+
+        system, user = messages[0]["content"], messages[-1]["content"]
+        if system == ai_brain.SECURITY_SYSTEM:
+            kind = "security"
+        elif system == ai_brain.AUDITOR_SYSTEM:
+            kind = "auditor"
+        else:
+            kind = "stream" if stream else "analysis"
+        with self._lock:
+            self.calls[kind] = self.calls.get(kind, 0) + 1
+            delay = _jitter(self._rng, self.stream_latency if stream else self.latency,
+                            self.spread)
+            reject = self._rng.random() < self.reject_rate
+
+        body = self._body(kind, user, reject)
+        if stream:
+            return self._stream(body, delay)
+        time.sleep(delay)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=body))])
+
+    def _stream(self, body: str, delay: float):
+        size = max(1, len(body) // self.stream_chunks)
+        pieces = [body[i:i + size] for i in range(0, len(body), size)]
+        for piece in pieces:
+            time.sleep(delay / len(pieces))
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+    # ── Canned answers ───────────────────────────────────────────────
+    def _body(self, kind: str, user: str, reject: bool) -> str:
+        if kind in self.responses:
+            return json.dumps(self.responses[kind])
+        if kind in ("security", "auditor"):
+            verdict = "REJECTED" if reject and kind == "security" else "APPROVED"
+            return json.dumps({"verdict": verdict, "reasoning": f"Replay {kind} review."})
+
+        alert = ""
+        for line in user.splitlines():
+            if line.startswith("Alert Type"):
+                alert = line.split(":", 1)[1].strip().lower()
+        action = next((a for k, a in DEFAULT_ACTIONS.items() if k in alert), "NOOP")
+        analysis = {
+            "root_cause": f"Replay diagnosis for {alert or 'unknown alert'}",
+            "action": action,
+            "justification": "Synthetic response from the replay harness.",
+            "confidence": 0.9,
+            "replica_count": 2,
+        }
+        if kind == "stream":
+            return (f"Looking at the {alert} signal… the logs point to "
+                    f"{analysis['root_cause'].lower()}. Recommending {action}.")
+        return json.dumps(analysis)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Docker
+# ═══════════════════════════════════════════════════════════════════════
+
+class FakeContainer:
+    _ids = itertools.count(1)
+
+    def __init__(self, owner: "FakeDocker", name: str, image: str = "aegis/buggy-app:latest") -> None:
+        self._owner = owner
+        self.name = name
+        self.status = "running"
+        self.short_id = f"{next(self._ids):012x}"
+        self.id = self.short_id
+        self.image = SimpleNamespace(tags=[image], id=f"sha256:{self.short_id}")
+        self.attrs = {
+            "Config": {"Env": [], "Image": image, "Labels": {}},
+            "State": {"StartedAt": datetime.now(timezone.utc).isoformat()},
+        }
+        self._log: list[tuple[float, str]] = []
+        self._followers: list[_LogStream] = []
+        for _ in range(5):
+            self.log("INFO replay container log line")
+
+    def log(self, line: str) -> None:
+        """Append one line of container output (seen by followers at once)."""
+        entry = (time.time(), line)
+        with self._owner._lock:
+            self._log.append(entry)
+            for stream in self._followers:
+                stream._queue.put(entry)
+
+    def restart(self, timeout: int = 10) -> None:
+        self._owner._op("restart")
+        self.attrs["State"]["StartedAt"] = datetime.now(timezone.utc).isoformat()
+        self.log("INFO restarted")
+        self._owner._emit("restart", self)
+
+    def reload(self) -> None:
+        return None
+
+    def start(self) -> None:
+        self._owner._op("start")
+        self.status = "running"
+        self.attrs["State"]["StartedAt"] = datetime.now(timezone.utc).isoformat()
+        self._owner._emit("start", self)
+
+    def rename(self, name: str) -> None:
+        self._owner._op("rename")
+        with self._owner._lock:
+            if name in self._owner._containers:
+                raise APIError(f"Conflict: name {name} already in use")
+            self._owner._containers[name] = self._owner._containers.pop(self.name)
+        self.name = name
+        self._owner._emit("rename", self)
+
+    def remove(self, force: bool = False) -> None:
+        self._owner._op("remove")
+        with self._owner._lock:
+            self._owner._containers.pop(self.name, None)
+        self.status = "removing"
+        self._owner._emit("destroy", self)
+
+    def logs(self, tail: Any = "all", timestamps: bool = False, stream: bool = False,
+             follow: bool = False, since: Any = None, **_: Any):
+        self._owner._op("logs")
+        with self._owner._lock:
+            entries = [e for e in self._log if since is None or e[0] >= since]
+            if tail != "all":
+                entries = entries[-tail:] if tail else []
+            if not (stream and follow):
+                return b"".join(_log_line(e, timestamps) for e in entries)
+            out = _LogStream(self, timestamps)
+            for e in entries:
+                out._queue.put(e)
+            self._followers.append(out)
+        return out
+
+    def stats(self, stream: bool = False, decode: bool = False, **_: Any):
+        if stream:
+            return self._stats_stream()
+        self._owner._op("stats")
+        return self._sample(1)
+
+    def _sample(self, n: int) -> dict:
+        return {
+            "cpu_stats": {"cpu_usage": {"total_usage": 2_000 * n}, "system_cpu_usage": 20_000 * n,
+                          "online_cpus": 2},
+            "precpu_stats": {"cpu_usage": {"total_usage": 2_000 * n - 1_000},
+                             "system_cpu_usage": 20_000 * n - 10_000},
+            "memory_stats": {"usage": 64 * 1024 * 1024, "limit": 512 * 1024 * 1024},
+            "networks": {"eth0": {"rx_bytes": 1024 * n, "tx_bytes": 2048 * n}},
+        }
+
+    def _stats_stream(self):
+        # Like the daemon: one decoded sample per interval until the container goes
+        n = 0
+        while self.status == "running" and self.name in self._owner._containers:
+            self._owner._op("stats_sample")
+            n += 1
+            yield self._sample(n)
+
+    def put_archive(self, path: str, data: Any) -> bool:
+        self._owner._op("put_archive")
+        return True
+
+    def exec_run(self, cmd: Any, **_: Any) -> SimpleNamespace:
+        self._owner._op("exec")
+        return SimpleNamespace(exit_code=0, output=b"")
+
+
+class _Containers:
+    def __init__(self, owner: "FakeDocker") -> None:
+        self._owner = owner
+
+    def get(self, name: str) -> FakeContainer:
+        self._owner._op("inspect")
+        try:
+            return self._owner._containers[name]
+        except KeyError:
+            for c in list(self._owner._containers.values()):
+                if c.id == name:
+                    return c
+            raise NotFound(f"No such container: {name}")
+
+    def list(self, all: bool = False, filters: Optional[dict] = None, **_: Any) -> list[FakeContainer]:
+        self._owner._op("list")
+        filters = filters or {}
+        found = []
+        for c in list(self._owner._containers.values()):
+            if not all and c.status != "running":
+                continue
+            if "status" in filters and c.status != filters["status"]:
+                continue
+            if "name" in filters and filters["name"] not in c.name:
+                continue
+            if "label" in filters:
+                key, _, value = filters["label"].partition("=")
+                labels = c.attrs["Config"]["Labels"]
+                if key not in labels or (value and labels[key] != value):
+                    continue
+            found.append(c)
+        return found
+
+    def create(self, image: str, name: str, labels: Optional[dict] = None, **_: Any) -> FakeContainer:
+        self._owner._op("create")
+        container = FakeContainer(self._owner, name, image)
+        container.attrs["Config"]["Labels"] = dict(labels or {})
+        container.status = "created"
+        with self._owner._lock:
+            if name in self._owner._containers:
+                raise APIError(f"Conflict: name {name} already in use")
+            self._owner._containers[name] = container
+        self._owner._emit("create", container)
+        return container
+
+    def run(self, image: str, name: str, **kwargs: Any) -> FakeContainer:
+        container = self.create(image, name, **kwargs)
+        container.start()
+        return container
+
+
+# Relative cost of each Docker op (x latency) – inspects are cheap, creating
+# a container (filesystem layer, network endpoint) and restarting are not
+OP_WEIGHTS: dict[str, float] = {
+    "inspect": 0.1, "list": 0.2, "rename": 0.2, "put_archive": 0.3, "exec": 0.5,
+    "logs": 0.5, "stats": 20.0, "stats_sample": 20.0, "remove": 1.0, "start": 1.0, "create": 2.0,
+    "restart": 3.0,
+}
+
+
+def _log_line(entry: tuple[float, str], timestamps: bool) -> bytes:
+    ts, line = entry
+    if not timestamps:
+        return f"{line}\n".encode()
+    stamp = datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")
+    return f"{stamp}000Z {line}\n".encode()
+
+
+class _LogStream:
+    """Followed log output (one bytes chunk per line); close() ends it from any thread."""
+
+    def __init__(self, container: FakeContainer, timestamps: bool) -> None:
+        self._container = container
+        self._timestamps = timestamps
+        self._queue: queue.Queue = queue.Queue()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        entry = self._queue.get()
+        if entry is None:
+            raise StopIteration
+        return _log_line(entry, self._timestamps)
+
+    def close(self) -> None:
+        owner = self._container._owner
+        with owner._lock:
+            if self in self._container._followers:
+                self._container._followers.remove(self)
+        self._queue.put(None)
+
+
+class _EventStream:
+    """Blocking iterator over emitted events; close() ends it from any thread."""
+
+    def __init__(self, owner: "FakeDocker") -> None:
+        self._owner = owner
+        self._queue: queue.Queue = queue.Queue()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> dict:
+        event = self._queue.get()
+        if event is None:
+            raise StopIteration
+        return event
+
+    def close(self) -> None:
+        with self._owner._lock:
+            if self in self._owner._subscribers:
+                self._owner._subscribers.remove(self)
+        self._queue.put(None)
+
+
+class FakeDocker:
+    """Docker SDK client look-alike with an in-memory container table."""
+
+    def __init__(self, names: tuple[str, ...], latency: float = 0.05,
+                 spread: float = 0.3, seed: int = 11) -> None:
+        self.latency = latency
+        self.spread = spread
+        self.ops: dict[str, int] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._containers: dict[str, FakeContainer] = {}
+        self._subscribers: list[_EventStream] = []
+        for name in names:
+            self._containers[name] = FakeContainer(self, name)
+        self.containers = _Containers(self)
+
+    def version(self) -> dict:
+        return {"Version": "replay"}
+
+    def events(self, decode: bool = False, **_: Any) -> _EventStream:
+        stream = _EventStream(self)
+        with self._lock:
+            self._subscribers.append(stream)
+        return stream
+
+    def _emit(self, action: str, container: FakeContainer) -> None:
+        event = {"Type": "container", "Action": action, "time": int(time.time()),
+                 "Actor": {"ID": container.id, "Attributes": {"name": container.name}}}
+        with self._lock:
+            for stream in self._subscribers:
+                stream._queue.put(event)
+
+    def _op(self, op: str) -> None:
+        with self._lock:
+            self.ops[op] = self.ops.get(op, 0) + 1
+            delay = _jitter(self._rng, self.latency * OP_WEIGHTS.get(op, 1.0), self.spread)
+        time.sleep(delay)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Health probe
+# ═══════════════════════════════════════════════════════════════════════
+
+class FakeHealth:
+    """Replacement for verification._probe: async sleep, then pass with probability."""
+
+    def __init__(self, latency: float = 0.02, success_rate: float = 1.0,
+                 spread: float = 0.3, seed: int = 13) -> None:
+        self.latency = latency
+        self.success_rate = success_rate
+        self.spread = spread
+        self.probes = 0
+        self._rng = random.Random(seed)
+
+    async def __call__(self, url: str, attempt: int) -> bool:
+        from app.telemetry import HTTP_CALL
+
+        self.probes += 1
+        with HTTP_CALL.time(target="health"):
+            await asyncio.sleep(_jitter(self._rng, self.latency, self.spread))
+        return self._rng.random() < self.success_rate
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Wiring
+# ═══════════════════════════════════════════════════════════════════════
+
+def install(llm: FakeLLM, docker_client: FakeDocker, health: FakeHealth) -> Callable[[], None]:
+    """Point ai_brain, docker_ops and verification at the fakes. Returns an undo."""
+    from app import ai_brain, docker_ops, verification
+
+    patches = [
+        (ai_brain, "_get_primary", lambda: llm),
+        (ai_brain, "_get_fallback", lambda: llm),
+        (docker_ops, "_get_client", lambda: docker_client),
+        (verification, "_probe", health),
+    ]
+    saved = [(mod, attr, getattr(mod, attr)) for mod, attr, _ in patches]
+    for mod, attr, value in patches:
+        setattr(mod, attr, value)
+
+    def _undo() -> None:
+        for mod, attr, value in saved:
+            setattr(mod, attr, value)
+
+    return _undo
@@ -0,0 +1,86 @@
+"""
+AegisOps GOD MODE – Webhook ingest throughput benchmark.
+
+Compares POST /webhook (one alert per request) with POST /webhook/batch
+(N alerts per request) in-process over ASGI. The remediation pipeline is
+replaced by a no-op so only ingest cost is measured: validation, incident
+store, executor admission and the INCIDENT_NEW broadcast.
+
+Run from aegis_core/:
+    python -m bench.ingest --alerts 2000 --batch-size 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import uuid
+
+
+def _payload(i: int) -> dict:
+    return {
+        "incident_id": f"bench-{uuid.uuid4().hex[:8]}-{i}",
+        "alert_type": "CPU Spike" if i % 2 else "Memory Leak",
+        "severity": "CRITICAL" if i % 5 == 0 else "WARNING",
+        "logs": "ERROR: CPU usage at 98% – worker loop spinning " * 4,
+        "container_name": "buggy-app-v2",
+    }
+
+
+async def _run(alerts: int, batch_size: int) -> None:
+    import httpx
+
+    from app import main
+    from app.executor import RemediationExecutor
+
+    async def _noop(_payload, _result) -> None:
+        return None
+
+    main.executor = RemediationExecutor(_noop, workers=8, max_queue=alerts * 2)
+    main.executor.start()
+    await main.incident_store.start()
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        payloads = [_payload(i) for i in range(alerts)]
+        t0 = time.perf_counter()
+        for p in payloads:
+            resp = await client.post("/webhook", json=p)
+            resp.raise_for_status()
+        single = time.perf_counter() - t0
+
+        payloads = [_payload(i) for i in range(alerts)]
+        t0 = time.perf_counter()
+        for i in range(0, alerts, batch_size):
+            resp = await client.post("/webhook/batch", json=payloads[i:i + batch_size])
+            resp.raise_for_status()
+        batched = time.perf_counter() - t0
+
+    await main.executor.drain()
+    await main.incident_store.close()
+
+    print(f"alerts           : {alerts}")
+    print(f"/webhook         : {alerts / single:10.1f} alerts/s  ({single:.2f}s)")
+    print(f"/webhook/batch   : {alerts / batched:10.1f} alerts/s  ({batched:.2f}s, batch={batch_size})")
+    print(f"speed-up         : {single / batched:10.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--alerts", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("INCIDENT_DB_PATH", os.path.join(tmp, "bench.db"))
+        os.environ.setdefault("SLACK_WEBHOOK_URL", "")
+        logging.disable(logging.INFO)
+        asyncio.run(_run(args.alerts, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
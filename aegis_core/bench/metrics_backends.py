@@ -0,0 +1,141 @@
+"""
+AegisOps GOD MODE – Container metrics backend benchmark.
+
+Measures what one metrics tick costs for a fleet of containers with each
+collection path get_all_metrics() can take:
+
+  • docker-oneshot  – `stats(stream=False)` per container every tick
+  • docker-stream   – StatsCollector with one stats stream per container
+  • cgroup          – StatsCollector reading cgroup v2 files directly
+
+Docker is the in-memory fake from bench.fakes (stats latency =
+20 × --latency, like the daemon's two-sample wait). The cgroup backend
+reads a real file tree laid out like /sys/fs/cgroup + /proc in a temp dir,
+so its numbers are genuine file I/O and parsing.
+
+Reports wall time per tick (what _metrics_loop waits for) and agent CPU
+per tick including the background stream threads.
+
+Run from aegis_core/:
+    python -m bench.metrics_backends --containers 50 --ticks 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+def _fake_cgroup_tree(root: Path, containers) -> None:
+    """cgroup v2 (systemd driver) dirs + /proc net counters for each container."""
+    (root / "cgroup.controllers").write_text("cpuset cpu io memory pids\n")
+    proc = root / "proc"
+    proc.mkdir()
+    (proc / "meminfo").write_text("MemTotal:       16303428 kB\nMemFree:         8000000 kB\n")
+    for pid, c in enumerate(containers, start=1000):
+        scope = root / "system.slice" / f"docker-{c.id}.scope"
+        scope.mkdir(parents=True)
+        (scope / "cpu.stat").write_text(
+            f"usage_usec {pid * 1_000}\nuser_usec {pid * 700}\nsystem_usec {pid * 300}\n"
+            "nr_periods 0\nnr_throttled 0\nthrottled_usec 0\n")
+        (scope / "memory.current").write_text(f"{64 * 1024 * 1024}\n")
+        (scope / "memory.max").write_text("max\n" if pid % 2 else f"{512 * 1024 * 1024}\n")
+        (scope / "cgroup.procs").write_text(f"{pid}\n")
+        (proc / str(pid) / "net").mkdir(parents=True)
+        (proc / str(pid) / "net" / "dev").write_text(
+            "Inter-|   Receive                            |  Transmit\n"
+            " face |bytes    packets errs drop fifo frame compressed multicast|"
+            "bytes    packets errs drop fifo colls carrier compressed\n"
+            "    lo:    1000      10    0    0    0     0          0         0"
+            "     1000      10    0    0    0     0       0          0\n"
+            f"  eth0: {pid * 1024}     100    0    0    0     0          0         0"
+            f" {pid * 2048}     200    0    0    0     0       0          0\n")
+
+
+async def _tick_loop(fetch, ticks: int, interval: float) -> dict:
+    walls = []
+    cpu0 = time.process_time()
+    for _ in range(ticks):
+        t0 = time.perf_counter()
+        rows = await fetch()
+        walls.append(time.perf_counter() - t0)
+        await asyncio.sleep(max(0.0, interval - walls[-1]))
+    cpu = time.process_time() - cpu0
+    return {"rows": len(rows), "wall_ms": sum(walls) / ticks * 1e3,
+            "cpu_ms": cpu / ticks * 1e3, "threads": 0}
+
+
+async def _run(args: argparse.Namespace) -> list[dict]:
+    from app import docker_ops
+    from app.cgroup_metrics import CgroupReader
+    from app.stats_collector import StatsCollector, stats_collector
+    from bench.fakes import FakeDocker
+
+    names = tuple(f"svc-{i}" for i in range(args.containers))
+    fake = FakeDocker(names, latency=args.latency)
+    saved = docker_ops._get_client
+    docker_ops._get_client = lambda: fake
+    results = []
+    try:
+        assert not stats_collector.running
+        r = await _tick_loop(docker_ops.get_all_metrics, args.oneshot_ticks, args.interval)
+        results.append({"backend": "docker-oneshot", **r})
+
+        collector = StatsCollector(backend="docker")
+        collector.start()
+        while sum(1 for m in collector.snapshot() if m.cpu_percent) < args.containers:
+            await asyncio.sleep(0.05)  # first sample from every stream
+        r = await _tick_loop(_async(collector.snapshot), args.ticks, args.interval)
+        r["threads"] = collector.status()["streams"] - collector.status()["cgroup"]
+        await collector.stop()
+        results.append({"backend": "docker-stream", **r})
+
+        with tempfile.TemporaryDirectory(prefix="aegis-cgroup-") as tmp:
+            _fake_cgroup_tree(Path(tmp), fake._containers.values())
+            reader = CgroupReader(tmp, os.path.join(tmp, "proc"))
+            collector = StatsCollector(backend="cgroup", cgroup=reader)
+            collector.start()
+            while collector.status()["cgroup"] < args.containers:
+                await asyncio.sleep(0.01)
+            r = await _tick_loop(_async(collector.snapshot), args.ticks, args.interval)
+            r["threads"] = collector.status()["streams"] - collector.status()["cgroup"]
+            await collector.stop()
+            results.append({"backend": "cgroup", **r})
+    finally:
+        docker_ops._get_client = saved
+    return results
+
+
+def _async(fn):
+    async def call():
+        return fn()
+    return call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--containers", type=int, default=50)
+    parser.add_argument("--ticks", type=int, default=5, help="ticks for the collector backends")
+    parser.add_argument("--oneshot-ticks", type=int, default=2)
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between ticks")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="fake Docker base latency (stats = 20×)")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    results = asyncio.run(_run(args))
+    print(f"{args.containers} containers, tick every {args.interval:g}s, "
+          f"docker stats latency {args.latency * 20:g}s")
+    print(f"{'backend':<16}{'rows':>6}{'wall ms/tick':>14}{'cpu ms/tick':>13}{'threads':>9}")
+    for r in results:
+        print(f"{r['backend']:<16}{r['rows']:>6}{r['wall_ms']:>14.3f}"
+              f"{r['cpu_ms']:>13.3f}{r['threads']:>9}")
+
+
+if __name__ == "__main__":
+    main()
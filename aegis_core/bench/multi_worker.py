@@ -0,0 +1,105 @@
+"""
+AegisOps GOD MODE – Multi-worker remediation throughput benchmark.
+
+Simulates N uvicorn workers sharing one Redis (fakeredis, in-process):
+each worker has its own RemediationExecutor (--pipelines concurrent
+pipelines) and TargetCoordinator attached to its own RedisSharedState.
+Incidents are spread round-robin over the workers and spread over
+--targets containers; each one holds its target for --work seconds
+(execute + verify) under the cross-worker target lease.
+
+Reports incidents/s per worker count, and the most pipelines seen on
+one target at once – always 1 if the lease holds. Throughput grows with
+workers until every target is busy.
+
+Run from aegis_core/ (needs fakeredis + lupa):
+    python -m bench.multi_worker --incidents 96 --targets 16 --workers 1,2,4,8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+
+
+async def _case(n_workers: int, args: argparse.Namespace) -> dict:
+    import fakeredis
+
+    from app.coordinator import TargetCoordinator
+    from app.executor import RemediationExecutor
+    from app.models import IncidentPayload, IncidentResult
+    from app.shared_state import RedisSharedState
+
+    server = fakeredis.FakeServer()
+    running: dict[str, int] = {}
+    peak = 0
+    done = 0
+    finished = asyncio.Event()
+
+    def _worker():
+        state = RedisSharedState(prefix="bench", sync_client=fakeredis.FakeRedis(server=server),
+                                 async_client=fakeredis.FakeAsyncRedis(server=server))
+        coordinator = TargetCoordinator()
+        coordinator.attach(state)
+
+        async def _work(target: str) -> None:
+            nonlocal peak
+            running[target] = running.get(target, 0) + 1
+            peak = max(peak, running[target])
+            await asyncio.sleep(args.work)
+            running[target] -= 1
+
+        async def _pipeline(payload: IncidentPayload, result: IncidentResult) -> None:
+            nonlocal done
+            target = payload.container_name
+            # A distinct action per incident: every run executes, none is merged
+            await coordinator.run(target, f"RESTART-{payload.incident_id}", payload.incident_id,
+                                  lambda: _work(target))
+            done += 1
+            if done == args.incidents:
+                finished.set()
+
+        executor = RemediationExecutor(_pipeline, workers=args.pipelines, max_queue=0)
+        executor.start()
+        return executor
+
+    executors = [_worker() for _ in range(n_workers)]
+    t0 = time.perf_counter()
+    for i in range(args.incidents):
+        iid = f"bench-{i}"
+        payload = IncidentPayload(incident_id=iid, alert_type="Memory Leak",
+                                  container_name=f"svc-{i % args.targets}")
+        executors[i % n_workers].submit(payload, IncidentResult(incident_id=iid,
+                                                                alert_type="Memory Leak"))
+    await finished.wait()
+    elapsed = time.perf_counter() - t0
+    for executor in executors:
+        await executor.drain(timeout=1)
+    return {"workers": n_workers, "elapsed": elapsed, "rate": args.incidents / elapsed,
+            "peak": peak}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--incidents", type=int, default=96)
+    parser.add_argument("--targets", type=int, default=16)
+    parser.add_argument("--pipelines", type=int, default=2, help="pipelines per worker")
+    parser.add_argument("--work", type=float, default=0.1, help="seconds a run holds its target")
+    parser.add_argument("--workers", default="1,2,4,8")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    results = [asyncio.run(_case(int(n), args)) for n in args.workers.split(",")]
+    base = results[0]["rate"]
+    print(f"{args.incidents} incidents over {args.targets} targets, "
+          f"{args.pipelines} pipelines/worker, {args.work:g}s per run")
+    print(f"{'workers':>8}{'elapsed s':>11}{'incidents/s':>13}{'scaling':>9}{'max/target':>12}")
+    for r in results:
+        print(f"{r['workers']:>8}{r['elapsed']:>11.2f}{r['rate']:>13.1f}"
+              f"{r['rate'] / base:>8.1f}x{r['peak']:>12}")
+
+
+if __name__ == "__main__":
+    main()
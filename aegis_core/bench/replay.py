@@ -0,0 +1,267 @@
+"""
+AegisOps GOD MODE – Offline incident replay / load test.
+
+Drives the full remediation pipeline (webhook → executor → RAG → stream →
+analysis → council → execute → verify → runbook) in-process, with the LLM,
+Docker daemon and health endpoint replaced by the fakes in bench.fakes.
+Incidents are offered at a fixed arrival rate (open loop), so queueing and
+429 shedding show up exactly as they would under real alert storms.
+
+Input is either synthetic (default) or recorded: a JSON list or JSONL file
+of webhook payloads (IncidentPayload fields).
+
+Reports incidents/sec, end-to-end latency, per-stage latency (from the
+telemetry histograms) and peak memory.
+
+Run from aegis_core/:
+    python -m bench.replay --incidents 200 --rate 20
+    python -m bench.replay --input recorded.jsonl --llm-latency 1.5 --json out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+_SYNTHETIC = (
+    ("CPU Spike", "CRITICAL", "ERROR: CPU usage at 98% – worker loop spinning on /compute"),
+    ("Memory Leak", "WARNING", "WARN: RSS grew 1.2GB in 10m – cache never evicted, OOM soon"),
+    ("Latency Regression", "HIGH", "p99 latency 4.2s on /checkout – upstream pool exhausted"),
+    ("Crash Loop", "CRITICAL", "FATAL: segfault in worker 3 – container exited with 139"),
+    ("Disk Usage", "INFO", "INFO: /var/log at 71% – rotation healthy"),
+)
+
+
+def synthetic_payloads(n: int, seed: int = 1) -> list[dict]:
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        alert_type, severity, logs = rng.choice(_SYNTHETIC)
+        out.append({
+            "incident_id": f"replay-{uuid.UUID(int=rng.getrandbits(128)).hex[:8]}-{i}",
+            "alert_type": alert_type,
+            "severity": severity,
+            "logs": f"{logs}\n" * rng.randint(2, 8),
+            "container_name": "buggy-app-v2",
+        })
+    return out
+
+
+def load_payloads(path: Path) -> list[dict]:
+    text = path.read_text()
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _replay(args: argparse.Namespace, payloads: list[dict], runbook: Path) -> dict:
+    import httpx
+
+    from app import ai_brain, main, telemetry, verification
+    from app.config import NGINX_CONTAINER, TARGET_CONTAINER
+    from app.executor import RemediationExecutor
+
+    from bench.fakes import FakeDocker, FakeHealth, FakeLLM, install
+
+    llm = FakeLLM(
+        latency=args.llm_latency,
+        stream_latency=args.stream_latency,
+        reject_rate=args.reject_rate,
+        responses=json.loads(Path(args.llm_json).read_text()) if args.llm_json else None,
+    )
+    docker_client = FakeDocker((TARGET_CONTAINER, NGINX_CONTAINER), latency=args.docker_latency)
+    health = FakeHealth(latency=args.health_latency, success_rate=args.health_success)
+    undo = install(llm, docker_client, health)
+
+    # Keep the learning loop real but away from the checked-in runbook
+    real_load, real_append = ai_brain._load_runbook, verification.append_to_runbook
+    ai_brain._load_runbook = functools.partial(real_load, path=runbook)
+    main.append_to_runbook = functools.partial(real_append, path=runbook)
+
+    # Time every incident from acceptance to pipeline exit
+    started: dict[str, float] = {}
+    e2e: list[float] = []
+    done = asyncio.Event()
+    expected, finished = {"n": len(payloads)}, {"n": 0}
+
+    async def _timed_pipeline(payload, result) -> None:
+        try:
+            await main._run_pipeline(payload, result)
+        finally:
+            t_accepted = started.pop(payload.incident_id, None)
+            if t_accepted is not None:
+                e2e.append(time.perf_counter() - t_accepted)
+            finished["n"] += 1
+            if finished["n"] >= expected["n"]:
+                done.set()
+
+    main.executor = RemediationExecutor(
+        _timed_pipeline, workers=args.workers, max_queue=args.queue_size,
+    )
+    for hist in telemetry.REGISTRY:
+        hist.reset()
+
+    shed = 0
+    interval = 1.0 / args.rate if args.rate > 0 else 0.0
+    transport = httpx.ASGITransport(app=main.app)
+    try:
+        async with main.lifespan(main.app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://replay") as client:
+                t0 = time.perf_counter()
+                for i, body in enumerate(payloads):
+                    if interval:
+                        delay = t0 + i * interval - time.perf_counter()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                    started[body["incident_id"]] = time.perf_counter()
+                    resp = await client.post("/webhook", json=body)
+                    if resp.status_code == 429:
+                        shed += 1
+                        started.pop(body["incident_id"], None)
+                        expected["n"] -= 1
+                    else:
+                        resp.raise_for_status()
+                offered = time.perf_counter() - t0
+                if finished["n"] < expected["n"]:
+                    await done.wait()
+                wall = time.perf_counter() - t0
+
+            snapshot = main.executor.snapshot()
+            statuses = await main.incident_store.list(limit=len(payloads) + 1)
+    finally:
+        ai_brain._load_runbook, main.append_to_runbook = real_load, real_append
+        undo()
+
+    by_status: dict[str, int] = {}
+    for r in statuses:
+        by_status[r.status.value] = by_status.get(r.status.value, 0) + 1
+    completed = finished["n"]
+    return {
+        "offered": len(payloads),
+        "accepted": completed,
+        "shed_429": shed,
+        "outcomes": by_status,
+        "offer_secs": round(offered, 3),
+        "wall_secs": round(wall, 3),
+        "incidents_per_sec": round(completed / wall, 2) if wall else 0.0,
+        "e2e_ms": {
+            "p50": round(_percentile(e2e, 0.50) * 1000, 1),
+            "p95": round(_percentile(e2e, 0.95) * 1000, 1),
+            "p99": round(_percentile(e2e, 0.99) * 1000, 1),
+            "max": round(max(e2e, default=0.0) * 1000, 1),
+        },
+        "queue_wait": snapshot["queue_wait"],
+        "telemetry": telemetry.pipeline_summary(),
+        "fake_calls": {"llm": llm.calls, "docker": docker_client.ops, "health": health.probes},
+    }
+
+
+def _print_report(report: dict, args: argparse.Namespace) -> None:
+    print(f"incidents        : {report['offered']} offered, {report['accepted']} accepted, "
+          f"{report['shed_429']} shed (429)")
+    print(f"outcomes         : {report['outcomes']}")
+    print(f"arrival rate     : {args.rate or 'unbounded'}/s  "
+          f"(workers={args.workers}, queue={args.queue_size})")
+    print(f"throughput       : {report['incidents_per_sec']:.2f} incidents/s "
+          f"({report['wall_secs']:.2f}s wall)")
+    e = report["e2e_ms"]
+    print(f"end-to-end (ms)  : p50 {e['p50']:.1f}  p95 {e['p95']:.1f}  "
+          f"p99 {e['p99']:.1f}  max {e['max']:.1f}")
+    q = report["queue_wait"]
+    print(f"queue wait (ms)  : avg {q['avg_ms']:.1f}  max {q['max_ms']:.1f}")
+    for section in ("stages", "llm", "docker", "http"):
+        rows = report["telemetry"][section]
+        if not rows:
+            continue
+        print(f"\n{section:<17}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for name, s in rows.items():
+            print(f"  {name:<15}{s['count']:>7}{s['p50_ms']:>10.1f}"
+                  f"{s['p95_ms']:>10.1f}{s['p99_ms']:>10.1f}")
+    m = report["memory"]
+    print(f"\npeak memory      : rss {m['peak_rss_mb']:.1f} MB"
+          + (f", python heap {m['peak_heap_mb']:.1f} MB" if "peak_heap_mb" in m else ""))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    src = parser.add_argument_group("input")
+    src.add_argument("--input", help="JSON list / JSONL of webhook payloads (default: synthetic)")
+    src.add_argument("--incidents", type=int, default=100, help="synthetic incident count")
+    src.add_argument("--rate", type=float, default=10.0, help="arrivals per second (0 = unbounded)")
+    src.add_argument("--seed", type=int, default=1)
+
+    fake = parser.add_argument_group("fakes")
+    fake.add_argument("--llm-latency", type=float, default=0.5, help="seconds per LLM call")
+    fake.add_argument("--stream-latency", type=float, default=None,
+                      help="seconds per streamed analysis (default: --llm-latency)")
+    fake.add_argument("--llm-json", help="JSON file {analysis|security|auditor|stream: response}")
+    fake.add_argument("--reject-rate", type=float, default=0.0,
+                      help="probability the security officer rejects")
+    fake.add_argument("--docker-latency", type=float, default=0.05, help="seconds per Docker op")
+    fake.add_argument("--health-latency", type=float, default=0.02, help="seconds per probe")
+    fake.add_argument("--health-success", type=float, default=1.0, help="probe pass probability")
+
+    agent = parser.add_argument_group("agent")
+    agent.add_argument("--workers", type=int, default=None, help="REMEDIATION_WORKERS override")
+    agent.add_argument("--queue-size", type=int, default=None, help="REMEDIATION_QUEUE_SIZE override")
+
+    out = parser.add_argument_group("output")
+    out.add_argument("--json", help="also write the report to this file")
+    out.add_argument("--tracemalloc", action="store_true",
+                     help="track peak Python heap too (slows the run)")
+    out.add_argument("--verbose", action="store_true", help="keep INFO logs")
+    args = parser.parse_args()
+
+    payloads = (load_payloads(Path(args.input)) if args.input
+                else synthetic_payloads(args.incidents, args.seed))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("INCIDENT_DB_PATH", os.path.join(tmp, "replay.db"))
+        os.environ["SLACK_WEBHOOK_URL"] = ""
+        os.environ["SHARED_STATE_URL"] = ""
+        if not args.verbose:
+            logging.disable(logging.WARNING)
+
+        from app import config
+        args.workers = args.workers or config.REMEDIATION_WORKERS
+        args.queue_size = args.queue_size or max(config.REMEDIATION_QUEUE_SIZE, len(payloads))
+        runbook = Path(tmp) / "runbook.json"
+        if config.RUNBOOK_PATH.exists():
+            shutil.copy(config.RUNBOOK_PATH, runbook)
+
+        if args.tracemalloc:
+            tracemalloc.start()
+        report = asyncio.run(_replay(args, payloads, runbook))
+        rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        report["memory"] = {"peak_rss_mb": round(rss_kb / (1024 if sys.platform != "darwin" else 1024 ** 2), 1)}
+        if args.tracemalloc:
+            report["memory"]["peak_heap_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+            tracemalloc.stop()
+
+    _print_report(report, args)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
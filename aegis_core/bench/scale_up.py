@@ -0,0 +1,92 @@
+"""
+AegisOps GOD MODE – Scale-up latency benchmark (verdict → serving).
+
+Times ScalingController.scale_to() for an approved SCALE_UP – from the
+verdict until the replicas run and nginx is reloaded – against the fake
+Docker client (bench.fakes; create = 2×, start = 1×, rename = 0.2×
+--latency), for each way replicas can come up:
+
+  • sequential   – one `containers.run` after another (concurrency 1)
+  • parallel     – runs fanned out over SCALE_SPAWN_CONCURRENCY threads
+  • warm-pool    – pre-created stopped replicas, renamed + started
+  • prepared     – replicas staged by prepare_scale_up during the council
+                   vote (the staging time is reported separately)
+
+Run from aegis_core/:
+    python -m bench.scale_up --replicas 4 --latency 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+
+
+async def _case(mode: str, args: argparse.Namespace) -> dict:
+    from app import docker_ops
+    from app.docker_ops import ScalingController, UpstreamManager, WarmPool, prepare_scale_up
+    from bench.fakes import FakeDocker
+
+    service = "buggy-app-v2"
+    fake = FakeDocker((service, "aegis-lb"), latency=args.latency, spread=0.0)
+    saved = docker_ops._get_client, docker_ops.warm_pool, docker_ops.lb
+    docker_ops._get_client = lambda: fake
+    docker_ops.lb = UpstreamManager()  # each case starts from the live single-server upstream
+    pool = docker_ops.warm_pool = WarmPool(
+        size=args.replicas if mode == "warm-pool" else 0, concurrency=args.concurrency,
+    )
+    controller = ScalingController(
+        cooldown=0, max_replicas=args.replicas, pool=pool,
+        spawn_concurrency=1 if mode == "sequential" else args.concurrency,
+    )
+    try:
+        staging = 0.0
+        plan = None
+        if mode == "warm-pool":
+            await pool.fill(service)  # filled long before the incident
+        elif mode == "prepared":
+            t0 = time.perf_counter()
+            plan = await prepare_scale_up(service, args.replicas)
+            staging = time.perf_counter() - t0
+        await controller._discover(service)
+        fake.ops.clear()
+
+        t0 = time.perf_counter()
+        event = await controller.scale_to(service, args.replicas, reason="bench", plan=plan,
+                                          at_least=True)
+        serving = time.perf_counter() - t0
+        await pool.close()
+        assert len(event.replicas) == args.replicas, event
+        return {"mode": mode, "serving_ms": serving * 1e3, "staging_ms": staging * 1e3,
+                "ops": dict(sorted(fake.ops.items()))}
+    finally:
+        docker_ops._get_client, docker_ops.warm_pool, docker_ops.lb = saved
+
+
+def main() -> None:
+    from app.config import SCALE_SPAWN_CONCURRENCY
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--replicas", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.2, help="fake Docker base latency (s)")
+    parser.add_argument("--concurrency", type=int, default=SCALE_SPAWN_CONCURRENCY)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    modes = ("sequential", "parallel", "warm-pool", "prepared")
+    results = [asyncio.run(_case(m, args)) for m in modes]
+    base = results[0]["serving_ms"]
+    print(f"{args.replicas} replicas, Docker latency {args.latency:g}s, "
+          f"concurrency {args.concurrency}")
+    print(f"{'mode':<12}{'verdict→serving ms':>20}{'speedup':>9}{'staged ms':>11}  docker ops")
+    for r in results:
+        staged = f"{r['staging_ms']:.0f}" if r["staging_ms"] else "-"
+        ops = " ".join(f"{k}={v}" for k, v in r["ops"].items())
+        print(f"{r['mode']:<12}{r['serving_ms']:>20.0f}{base / r['serving_ms']:>8.1f}x"
+              f"{staged:>11}  {ops}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+AegisOps GOD MODE – WebSocket frame encoding benchmark.
+
+Pushes the periodic metrics + container.list frames for a fleet of
+containers through the real ConnectionManager to in-process clients, once
+per wire encoding (json / compact / msgpack), with and without
+permessage-deflate. Deflate is applied per client with context takeover,
+the way the server's websocket library compresses each connection.
+
+Reports bytes per push, bytes/sec per client at METRICS_INTERVAL_SECS and
+server CPU per client (serialization + queueing + compression).
+
+Run from aegis_core/:
+    python -m bench.ws_encoding --containers 50 --clients 20 --rounds 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+import zlib
+
+
+class _Socket:
+    """Accepts frames like a websocket; optionally deflates them per message."""
+
+    def __init__(self, deflate: bool) -> None:
+        self.bytes = 0
+        self.frames = 0
+        # RFC 7692: raw deflate, shared window across messages, sync flush
+        self._z = zlib.compressobj(wbits=-15) if deflate else None
+
+    async def accept(self) -> None:
+        return None
+
+    async def _send(self, payload: bytes) -> None:
+        if self._z is not None:
+            payload = (self._z.compress(payload) + self._z.flush(zlib.Z_SYNC_FLUSH))[:-4]
+        self.bytes += len(payload)
+        self.frames += 1
+
+    async def send_text(self, text: str) -> None:
+        await self._send(text.encode())
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self._send(data)
+
+    async def close(self, code: int = 1000) -> None:
+        return None
+
+
+def _fleet(n: int, rng: random.Random) -> tuple[list[dict], list[dict]]:
+    from app.models import ContainerMetrics
+
+    metrics, listing = [], []
+    for i in range(n):
+        name = f"buggy-app-v2-replica-{i}" if i else "buggy-app-v2"
+        metrics.append(ContainerMetrics(
+            name=name,
+            cpu_percent=round(rng.uniform(0, 100), 2),
+            memory_mb=round(rng.uniform(40, 400), 2),
+            memory_limit_mb=512.0,
+            memory_percent=round(rng.uniform(5, 80), 2),
+            net_rx_bytes=rng.randint(10_000, 10_000_000),
+            net_tx_bytes=rng.randint(10_000, 10_000_000),
+            status="running",
+            uptime_seconds=round(rng.uniform(10, 86_400), 1),
+            image="aegis/buggy-app:latest",
+        ).model_dump())
+        listing.append({"name": name, "status": "running",
+                        "image": "aegis/buggy-app:latest", "id": f"{rng.getrandbits(48):012x}"})
+    return metrics, listing
+
+
+async def _run_case(encoding: str, deflate: bool, args: argparse.Namespace) -> dict:
+    from app.models import WSFrameType
+    from app.ws_manager import ConnectionManager
+
+    rng = random.Random(args.seed)
+    manager = ConnectionManager()
+    sockets = [_Socket(deflate) for _ in range(args.clients)]
+    for sock in sockets:
+        await manager.connect(sock, encoding=encoding)
+    await asyncio.sleep(0)
+
+    metrics, listing = _fleet(args.containers, rng)
+    cpu = 0.0
+    for i in range(args.rounds):
+        for row in metrics:  # values move every push, as in production
+            row["cpu_percent"] = round(rng.uniform(0, 100), 2)
+            row["memory_mb"] = round(rng.uniform(40, 400), 2)
+            row["net_rx_bytes"] += rng.randint(0, 50_000)
+            row["net_tx_bytes"] += rng.randint(0, 50_000)
+        t0 = time.process_time()
+        await manager.broadcast_raw(WSFrameType.METRICS, data=metrics)
+        await manager.broadcast_raw(WSFrameType.CONTAINER_LIST, data=listing)
+        while any(s.frames < 2 * (i + 1) for s in sockets):
+            await asyncio.sleep(0)  # let the writers drain
+        cpu += time.process_time() - t0
+    await manager.close()
+
+    per_push = sum(s.bytes for s in sockets) / args.clients / args.rounds
+    return {
+        "encoding": encoding + ("+deflate" if deflate else ""),
+        "bytes_per_push": per_push,
+        "bytes_per_sec": per_push / args.interval,
+        "cpu_us_per_client_push": cpu / args.rounds / args.clients * 1e6,
+    }
+
+
+async def _run(args: argparse.Namespace) -> list[dict]:
+    from app.ws_manager import msgpack
+
+    encodings = ["json", "compact"] + (["msgpack"] if msgpack is not None else [])
+    results = []
+    for encoding in encodings:
+        for deflate in (False, True):
+            results.append(await _run_case(encoding, deflate, args))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--containers", type=int, default=50)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=200, help="metrics pushes per case")
+    parser.add_argument("--interval", type=float, default=None,
+                        help="seconds between pushes (default: METRICS_INTERVAL_SECS)")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    from app.config import METRICS_INTERVAL_SECS
+    args.interval = args.interval or METRICS_INTERVAL_SECS
+    results = asyncio.run(_run(args))
+
+    base = results[0]["bytes_per_push"]
+    print(f"fleet {args.containers} containers, {args.clients} clients, "
+          f"push every {args.interval:g}s, {args.rounds} pushes")
+    print(f"{'encoding':<18}{'bytes/push':>12}{'bytes/s':>10}{'vs json':>9}{'cpu µs/client':>15}")
+    for r in results:
+        print(f"{r['encoding']:<18}{r['bytes_per_push']:>12.0f}{r['bytes_per_sec']:>10.0f}"
+              f"{r['bytes_per_push'] / base:>8.0%} {r['cpu_us_per_client_push']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""cgroup v2 reader against a fake /sys/fs/cgroup + /proc tree."""
+
+import asyncio
+
+from app import cgroup_metrics, docker_ops
+from app.cgroup_metrics import CgroupReader
+from app.stats_collector import StatsCollector
+from bench.fakes import FakeDocker
+
+MiB = 1024 * 1024
+
+
+def _tree(tmp_path, cid="abc123", driver="systemd", usage=1_000_000,
+          mem=64 * MiB, limit=str(256 * MiB), pid="4242"):
+    root, proc = tmp_path / "cgroup", tmp_path / "proc"
+    root.mkdir(exist_ok=True)
+    (root / "cgroup.controllers").write_text("cpu memory pids\n")
+    path = (root / "system.slice" / f"docker-{cid}.scope" if driver == "systemd"
+            else root / "docker" / cid)
+    path.mkdir(parents=True)
+    (path / "cpu.stat").write_text(f"usage_usec {usage}\nuser_usec {usage}\nsystem_usec 0\n")
+    (path / "memory.current").write_text(f"{mem}\n")
+    (path / "memory.max").write_text(f"{limit}\n")
+    (path / "cgroup.procs").write_text(f"{pid}\n")
+    (proc / pid / "net").mkdir(parents=True)
+    (proc / pid / "net" / "dev").write_text(
+        "Inter-|   Receive      |  Transmit\n"
+        " face |bytes packets ...|bytes packets ...\n"
+        "    lo: 999 1 0 0 0 0 0 0 999 1 0 0 0 0 0 0\n"
+        "  eth0: 1500 10 0 0 0 0 0 0 700 5 0 0 0 0 0 0\n"
+    )
+    (proc / "meminfo").write_text("MemTotal:       1048576 kB\nMemFree:  1 kB\n")
+    return root, proc, path
+
+
+def test_available_and_both_drivers(tmp_path):
+    root, proc, systemd = _tree(tmp_path, cid="sys1")
+    cgroupfs = root / "docker" / "fs1"
+    cgroupfs.mkdir(parents=True)
+    (cgroupfs / "cpu.stat").write_text("usage_usec 1\n")
+    reader = CgroupReader(root, proc)
+    assert reader.available
+    assert reader.path_for("sys1") == systemd
+    assert reader.path_for("fs1") == cgroupfs
+    assert reader.path_for("missing") is None
+    assert not CgroupReader(tmp_path / "nowhere", proc).available
+
+
+def test_read_memory_and_network(tmp_path):
+    root, proc, _ = _tree(tmp_path)
+    m = CgroupReader(root, proc).read("api", "abc123", image="img", uptime=12.4)
+    assert m.memory_mb == 64.0 and m.memory_limit_mb == 256.0
+    assert m.memory_percent == 25.0
+    assert (m.net_rx_bytes, m.net_tx_bytes) == (1500, 700)  # lo excluded
+    assert m.cpu_percent == 0.0  # first read only sets the baseline
+    assert (m.image, m.uptime_seconds, m.status) == ("img", 12.0, "running")
+
+
+def test_unlimited_memory_falls_back_to_host_total(tmp_path):
+    root, proc, _ = _tree(tmp_path, limit="max")
+    m = CgroupReader(root, proc).read("api", "abc123")
+    assert m.memory_limit_mb == 1024.0
+
+
+def test_cpu_percent_over_a_window(tmp_path, monkeypatch):
+    root, proc, path = _tree(tmp_path, usage=1_000_000)
+    now = [100.0]
+    monkeypatch.setattr(cgroup_metrics.time, "monotonic", lambda: now[0])
+    reader = CgroupReader(root, proc)
+    reader.read("api", "abc123")
+    (path / "cpu.stat").write_text("usage_usec 1500000\n")
+    now[0] += 0.1  # shorter than the minimum window → last value kept
+    assert reader.read("api", "abc123").cpu_percent == 0.0
+    now[0] += 0.9  # 0.5 s of CPU over 1 s
+    assert reader.read("api", "abc123").cpu_percent == 50.0
+
+
+def test_vanished_cgroup_reads_none(tmp_path):
+    root, proc, path = _tree(tmp_path)
+    reader = CgroupReader(root, proc)
+    assert reader.read("api", "abc123") is not None
+    (path / "memory.current").unlink()
+    assert reader.read("api", "abc123") is None
+    assert "abc123" not in reader._paths
+
+
+def test_collector_reads_cgroups_instead_of_streaming(tmp_path, monkeypatch):
+    fake = FakeDocker(("api", "db"), latency=0.0, spread=0.0)
+    monkeypatch.setattr(docker_ops, "_get_client", lambda: fake)
+    api = fake.containers.get("api")
+    root, proc, _ = _tree(tmp_path, cid=api.id)
+    collector = StatsCollector(backend="cgroup", cgroup=CgroupReader(root, proc))
+    asyncio.run(collector.refresh())
+    status = collector.status()
+    assert status["streams"] == 2 and status["cgroup"] == 1  # db has no cgroup → stream
+    by_name = {m.name: m for m in collector.snapshot()}
+    assert by_name["api"].memory_mb == 64.0
+    asyncio.run(collector.stop())
+
+
+def test_stats_collector_docker_backend_ignores_cgroups(tmp_path):
+    root, proc, _ = _tree(tmp_path)
+    assert StatsCollector(backend="docker", cgroup=CgroupReader(root, proc))._cgroup is None
@@ -0,0 +1,111 @@
+"""Per-target coordinator: serialization, joining and collapsing."""
+
+import asyncio
+
+import pytest
+
+from app.coordinator import TargetCoordinator
+
+
+def test_same_action_in_flight_is_joined():
+    async def main():
+        co = TargetCoordinator()
+        calls = 0
+        gate = asyncio.Event()
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await gate.wait()
+            return "replicas"
+
+        first = asyncio.create_task(co.run("web", "SCALE_UP", "inc-1", work))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(co.run("web", "SCALE_UP", "inc-2", work))
+        await asyncio.sleep(0)
+        gate.set()
+        assert await first == ("replicas", None)
+        assert await second == ("replicas", "inc-1")
+        assert calls == 1
+        assert co.snapshot()["merged"] == 1
+
+    asyncio.run(main())
+
+
+def test_queued_duplicates_collapse_into_one_run():
+    async def main():
+        co = TargetCoordinator()
+        ran = []
+        gate = asyncio.Event()
+
+        async def scale():
+            ran.append("SCALE_UP")
+            await gate.wait()
+
+        async def restart():
+            ran.append("RESTART")
+
+        leader = asyncio.create_task(co.run("web", "SCALE_UP", "inc-1", scale))
+        await asyncio.sleep(0)
+        restarts = [asyncio.create_task(co.run("web", "RESTART", f"inc-{i}", restart))
+                    for i in range(2, 5)]
+        await asyncio.sleep(0)
+        assert [q["owner"] for q in co.snapshot()["queued"]] == ["inc-2"]
+        gate.set()
+        await leader
+        leaders = [leader for _, leader in await asyncio.gather(*restarts)]
+        assert ran == ["SCALE_UP", "RESTART"]
+        assert leaders == [None, "inc-2", "inc-2"]
+
+    asyncio.run(main())
+
+
+def test_different_targets_run_concurrently():
+    async def main():
+        co = TargetCoordinator()
+        running = set()
+        peak = 0
+
+        async def work(target):
+            nonlocal peak
+            running.add(target)
+            peak = max(peak, len(running))
+            await asyncio.sleep(0.01)
+            running.discard(target)
+
+        await asyncio.gather(*(
+            co.run(t, "RESTART", f"inc-{t}", lambda t=t: work(t)) for t in ("a", "b", "c")
+        ))
+        assert peak == 3
+
+    asyncio.run(main())
+
+
+def test_leader_error_reaches_joiners_and_state_is_cleared():
+    async def main():
+        co = TargetCoordinator()
+        gate = asyncio.Event()
+
+        async def work():
+            await gate.wait()
+            raise RuntimeError("docker down")
+
+        first = asyncio.create_task(co.run("web", "RESTART", "inc-1", work))
+        await asyncio.sleep(0)
+        joined = []
+
+        async def on_join(leader):
+            joined.append(leader)
+
+        second = asyncio.create_task(co.run("web", "RESTART", "inc-2", work, on_join))
+        await asyncio.sleep(0)
+        gate.set()
+        for task in (first, second):
+            with pytest.raises(RuntimeError, match="docker down"):
+                await task
+        assert joined == ["inc-1"]
+        snap = co.snapshot()
+        assert snap["in_flight"] == [] and snap["queued"] == []
+        assert snap["locked_targets"] == []
+
+    asyncio.run(main())
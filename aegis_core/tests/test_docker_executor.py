@@ -0,0 +1,110 @@
+"""Prioritised Docker executor and the replica fan-out that shares its sizing."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app import docker_ops
+from app.docker_executor import (
+    BACKGROUND, INTERACTIVE, REMEDIATION, DockerExecutor, DockerSaturated, DockerTimeout,
+)
+
+
+def _blocker(ex: DockerExecutor):
+    """Occupy every worker until the returned event is set."""
+    gate = threading.Event()
+    return gate, [asyncio.create_task(ex.run("restart", gate.wait)) for _ in range(ex.workers)]
+
+
+def test_remediation_is_served_before_queued_reads():
+    async def main():
+        ex = DockerExecutor(workers=1, queue_size=10, timeouts={})
+        gate, held = _blocker(ex)
+        await asyncio.sleep(0.05)
+        order = []
+        calls = [asyncio.create_task(ex.run(op, lambda op=op: order.append(op), priority=p))
+                 for op, p in (("stats", BACKGROUND), ("list", INTERACTIVE), ("restart", REMEDIATION))]
+        await asyncio.sleep(0.01)
+        gate.set()
+        await asyncio.gather(*held, *calls)
+        assert order == ["restart", "list", "stats"]
+        ex.close()
+
+    asyncio.run(main())
+
+
+def test_full_queue_refuses_all_but_remediation():
+    async def main():
+        ex = DockerExecutor(workers=1, queue_size=1, timeouts={})
+        gate, held = _blocker(ex)
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(ex.run("stats", lambda: "polled"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(DockerSaturated):
+            await ex.run("list", lambda: None)
+        urgent = asyncio.create_task(ex.run("restart", lambda: "restarted"))
+        await asyncio.sleep(0.01)
+        gate.set()
+        assert await asyncio.gather(queued, urgent) == ["polled", "restarted"]
+        assert ex.status()["rejected"] == 1
+        ex.close()
+
+    asyncio.run(main())
+
+
+def test_zero_queue_size_is_unbounded():
+    async def main():
+        ex = DockerExecutor(workers=1, queue_size=0, timeouts={})
+        gate, held = _blocker(ex)
+        await asyncio.sleep(0.05)
+        reads = [asyncio.create_task(ex.run("list", lambda i=i: i)) for i in range(5)]
+        await asyncio.sleep(0.01)
+        gate.set()
+        assert await asyncio.gather(*reads) == list(range(5))
+        ex.close()
+
+    asyncio.run(main())
+
+
+def test_timed_out_read_is_dropped_not_run():
+    async def main():
+        ex = DockerExecutor(workers=1, queue_size=10, timeouts={"list": 0.05})
+        gate, held = _blocker(ex)
+        await asyncio.sleep(0.05)
+        ran = []
+        with pytest.raises(DockerTimeout):
+            await ex.run("list", lambda: ran.append(1))
+        gate.set()
+        await asyncio.gather(*held)
+        await asyncio.sleep(0.05)
+        assert ran == [] and ex.status()["dropped"] == 1
+        ex.close()
+
+    asyncio.run(main())
+
+
+def test_fan_out_is_capped_by_the_executor_workers(monkeypatch):
+    monkeypatch.setattr(docker_ops.docker_executor, "workers", 2)
+    monkeypatch.setattr(docker_ops, "_fanout_pool", None)
+    lock, inflight, peak = threading.Lock(), [0], [0]
+
+    def job(i):
+        with lock:
+            inflight[0] += 1
+            peak[0] = max(peak[0], inflight[0])
+        time.sleep(0.02)
+        with lock:
+            inflight[0] -= 1
+        if i == 3:
+            raise RuntimeError("boom")
+        return i
+
+    results = docker_ops._fan_out(job, list(range(6)), limit=8)
+    assert peak[0] == 2
+    assert [r if not isinstance(r, Exception) else "err" for r in results] == [0, 1, 2, "err", 4, 5]
+    pool = docker_ops._fanout_pool
+    docker_ops._fan_out(job, [0, 1], limit=8)
+    assert docker_ops._fanout_pool is pool  # reused, not rebuilt per call
+    pool.shutdown()
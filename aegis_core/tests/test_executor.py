@@ -0,0 +1,188 @@
+"""Remediation executor: admission, priorities, duplicates and drain."""
+
+import asyncio
+
+import pytest
+
+from app.executor import DuplicateIncident, ExecutorSaturated, RemediationExecutor
+from app.models import IncidentPayload, IncidentResult, ResolutionStatus
+
+
+def _job(iid: str, severity: str | None = None):
+    payload = IncidentPayload(incident_id=iid, alert_type="Memory Leak", severity=severity)
+    return payload, IncidentResult(incident_id=iid, alert_type="Memory Leak")
+
+
+def test_full_queue_is_refused():
+    async def main():
+        gate = asyncio.Event()
+
+        async def handler(payload, result):
+            await gate.wait()
+
+        ex = RemediationExecutor(handler, workers=1, max_queue=2)
+        ex.start()
+        ex.submit(*_job("a"))
+        await asyncio.sleep(0)          # "a" is now running
+        ex.submit(*_job("b"))
+        ex.submit(*_job("c"))
+        assert ex.saturated
+        with pytest.raises(ExecutorSaturated):
+            ex.submit(*_job("d"))
+        gate.set()
+        await ex.drain(timeout=1)
+        assert ex.snapshot()["completed"] == 3
+        assert ex.snapshot()["rejected"] == 1
+
+    asyncio.run(main())
+
+
+def test_zero_queue_size_is_unbounded():
+    async def main():
+        async def handler(payload, result):
+            pass
+
+        ex = RemediationExecutor(handler, workers=1, max_queue=0)
+        ex.start()
+        for i in range(100):
+            ex.submit(*_job(f"inc-{i}"))
+        assert not ex.saturated
+        ex.submit_many([_job("batch-1"), _job("batch-2")])
+        await ex.drain(timeout=1)
+        assert ex.snapshot()["completed"] == 102
+
+    asyncio.run(main())
+
+
+def test_duplicate_incident_is_refused_until_done():
+    async def main():
+        gate = asyncio.Event()
+        seen = []
+
+        async def handler(payload, result):
+            seen.append(payload.incident_id)
+            await gate.wait()
+
+        ex = RemediationExecutor(handler, workers=1, max_queue=4)
+        ex.start()
+        ex.submit(*_job("a"))
+        ex.submit(*_job("b"))
+        await asyncio.sleep(0)
+        for iid in ("a", "b"):          # running / queued
+            assert ex.is_pending(iid)
+            with pytest.raises(DuplicateIncident):
+                ex.submit(*_job(iid))
+        with pytest.raises(DuplicateIncident):
+            ex.submit_many([_job("c"), _job("c")])
+        assert not ex.is_pending("c")   # nothing of the batch was admitted
+
+        gate.set()
+        await ex.drain(timeout=1)
+        assert seen == ["a", "b"]
+        assert not ex.is_pending("a")
+        ex.start()
+        ex.submit(*_job("a"))           # finished incidents may be re-submitted
+        await ex.drain(timeout=1)
+        assert seen == ["a", "b", "a"]
+
+    asyncio.run(main())
+
+
+def test_batch_is_all_or_nothing():
+    async def main():
+        gate = asyncio.Event()
+
+        async def handler(payload, result):
+            await gate.wait()
+
+        ex = RemediationExecutor(handler, workers=1, max_queue=2)
+        ex.start()
+        with pytest.raises(ExecutorSaturated):
+            ex.submit_many([_job("a"), _job("b"), _job("c")])
+        assert ex.snapshot()["queue_depth"] == 0
+        gate.set()
+        await ex.drain(timeout=1)
+
+    asyncio.run(main())
+
+
+def test_critical_alerts_run_first():
+    async def main():
+        order = []
+        gate = asyncio.Event()
+
+        async def handler(payload, result):
+            await gate.wait()
+            order.append(payload.incident_id)
+
+        ex = RemediationExecutor(handler, workers=1, max_queue=8)
+        ex.start()
+        ex.submit(*_job("first"))
+        await asyncio.sleep(0)
+        ex.submit(*_job("info", "INFO"))
+        ex.submit(*_job("warning", "WARNING"))
+        ex.submit(*_job("critical", "CRITICAL"))
+        gate.set()
+        await ex.drain(timeout=1)
+        assert order == ["first", "critical", "warning", "info"]
+
+    asyncio.run(main())
+
+
+def test_crashed_handler_marks_incident_failed():
+    async def main():
+        async def handler(payload, result):
+            raise RuntimeError("boom")
+
+        ex = RemediationExecutor(handler, workers=1, max_queue=1)
+        ex.start()
+        payload, result = _job("a")
+        ex.submit(payload, result)
+        await ex.drain(timeout=1)
+        assert result.status == ResolutionStatus.FAILED
+        assert "boom" in result.error
+        assert not ex.is_pending("a")
+
+    asyncio.run(main())
+
+
+class _Done:
+    def __await__(self):
+        return iter(())
+
+
+class _Service:
+    """Stand-in for a lifespan-managed singleton that logs every call."""
+
+    def __init__(self, name: str, log: list[str]) -> None:
+        self._name, self._log = name, log
+
+    def __getattr__(self, attr):
+        def call(*_, **__):
+            self._log.append(f"{self._name}.{attr}")
+            return _Done()
+        return call
+
+
+def test_shutdown_drains_remediation_before_stopping_its_services(monkeypatch):
+    from app import main
+
+    log: list[str] = []
+    for name in ("incident_store", "ws", "coordinator", "scaler", "shared_state", "executor",
+                 "inventory", "stats_collector", "log_tailer", "warm_pool", "docker_executor"):
+        monkeypatch.setattr(main, name, _Service(name, log))
+
+    async def close_health_client():
+        log.append("close_health_client")
+
+    monkeypatch.setattr(main, "close_health_client", close_health_client)
+
+    async def run():
+        async with main.lifespan(main.app):
+            log.clear()
+
+    asyncio.run(run())
+    drained = log.index("executor.drain")
+    for teardown in ("warm_pool.close", "stats_collector.stop", "log_tailer.stop",
+                     "inventory.stop", "ws.close", "incident_store.close"):
+        assert log.index(teardown) > drained, teardown
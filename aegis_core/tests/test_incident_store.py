@@ -0,0 +1,88 @@
+"""Incident store: pinning, LRU eviction, write-behind and recovery."""
+
+import asyncio
+
+from app.incident_store import IncidentStore, SQLiteIncidentBackend
+from app.models import IncidentResult, ResolutionStatus, TimelineEntry
+
+
+def _incident(iid: str, status=ResolutionStatus.RECEIVED, alert_type="Memory Leak"):
+    result = IncidentResult(incident_id=iid, alert_type=alert_type, status=status)
+    result.timeline.append(TimelineEntry(status="RECEIVED", message="test"))
+    return result
+
+
+def _store(tmp_path, cache_size=2):
+    return IncidentStore(SQLiteIncidentBackend(tmp_path / "incidents.db"),
+                         cache_size=cache_size, flush_interval=3600)
+
+
+def test_in_flight_incidents_are_never_evicted(tmp_path):
+    store = _store(tmp_path)
+    live = [_incident(f"live-{i}") for i in range(5)]
+    for r in live:
+        store.put(r)
+    for i in range(5):
+        store.put(_incident(f"done-{i}", ResolutionStatus.RESOLVED))
+    stats = store.stats()
+    assert stats["active"] == 5
+    assert stats["cached"] == 2
+    # Pinned entries are the very objects the pipeline mutates
+    assert all(asyncio.run(store.get(r.incident_id)) is r for r in live)
+
+
+def test_finished_incident_moves_from_pin_to_lru(tmp_path):
+    store = _store(tmp_path)
+    result = _incident("a")
+    store.put(result)
+    result.status = ResolutionStatus.RESOLVED
+    store.touch(result)
+    assert store.stats()["active"] == 0
+    assert store.stats()["cached"] == 1
+
+
+def test_evicted_incidents_are_read_back_from_sqlite(tmp_path):
+    async def main():
+        store = _store(tmp_path, cache_size=1)
+        for i in range(3):
+            store.put(_incident(f"inc-{i}", ResolutionStatus.RESOLVED))
+        assert await store.flush() == 3
+        assert store.stats()["cached"] == 1
+        old = await store.get("inc-0")
+        assert old is not None and old.status == ResolutionStatus.RESOLVED
+        assert await store.get("missing") is None
+
+    asyncio.run(main())
+
+
+def test_list_filters_and_prefers_live_objects(tmp_path):
+    async def main():
+        store = _store(tmp_path)
+        live = _incident("a", alert_type="CPU")
+        store.put(live)
+        store.put(_incident("b", ResolutionStatus.FAILED, alert_type="CPU"))
+        store.put(_incident("c", ResolutionStatus.FAILED, alert_type="Disk"))
+        failed_cpu = await store.list(status="FAILED", alert_type="CPU")
+        assert [r.incident_id for r in failed_cpu] == ["b"]
+        everything = await store.list()
+        assert live in everything and len(everything) == 3
+
+    asyncio.run(main())
+
+
+def test_restart_marks_unfinished_incidents_failed(tmp_path):
+    async def main():
+        store = _store(tmp_path)
+        store.put(_incident("interrupted"))
+        store.put(_incident("done", ResolutionStatus.RESOLVED))
+        await store.close()
+
+        reopened = _store(tmp_path)
+        await reopened.start()
+        result = await reopened.get("interrupted")
+        assert result.status == ResolutionStatus.FAILED
+        assert "restarted" in result.error
+        assert (await reopened.get("done")).status == ResolutionStatus.RESOLVED
+        await reopened.close()
+
+    asyncio.run(main())
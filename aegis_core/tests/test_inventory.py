@@ -0,0 +1,91 @@
+"""Event-driven container inventory against the fake Docker client."""
+
+import asyncio
+import time
+
+import pytest
+
+from app import docker_ops
+from app.inventory import ContainerInventory
+from bench.fakes import FakeDocker
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakeDocker(("api", "db"), latency=0.0, spread=0.0)
+    monkeypatch.setattr(docker_ops, "_get_client", lambda: fake)
+    return fake
+
+
+def _event(action, cid):
+    return {"Type": "container", "Action": action, "Actor": {"ID": cid}}
+
+
+def test_resync_indexes_by_name_id_and_label(fake):
+    fake.containers.create("aegis/buggy-app:latest", name="api-r1", labels={"aegis.replica_of": "api"})
+    inv = ContainerInventory()
+    asyncio.run(inv.resync())
+    api = fake.containers.get("api")
+    assert inv.get("api").id == api.id
+    assert inv.get(api.id[:12]).name == "api"
+    assert [i.name for i in inv.by_label("aegis.replica_of", "api")] == ["api-r1"]
+    assert {i.name for i in inv.list()} == {"api", "db"}  # api-r1 is only created
+    assert len(inv.list(running_only=False)) == 3
+
+
+def test_events_flip_status_and_drop_destroyed(fake):
+    inv = ContainerInventory()
+    asyncio.run(inv.resync())
+    db = fake.containers.get("db")
+    inv._apply(_event("die", db.id))
+    assert inv.get("db").status == "exited"
+    assert "db" not in {i.name for i in inv.list()}
+    inv._apply(_event("destroy", db.id))
+    assert inv.get("db") is None
+    assert inv.events == 2
+
+
+def test_resync_keeps_changes_made_while_listing(fake, monkeypatch):
+    inv = ContainerInventory()
+    asyncio.run(inv.resync())
+    db = fake.containers.get("db")
+    real = docker_ops._run
+
+    async def racing_run(op, fn, priority=None):
+        rows = await real(op, fn, priority=priority)
+        inv._apply(_event("die", db.id))  # lands after the listing was taken
+        return rows
+
+    monkeypatch.setattr(docker_ops, "_run", racing_run)
+    asyncio.run(inv.resync())
+    assert inv.get("db").status == "exited"
+
+
+def test_watcher_follows_live_events(fake):
+    async def scenario():
+        inv = ContainerInventory(resync_secs=60)
+        inv.start()
+        try:
+            await asyncio.sleep(0.1)
+            fake.containers.run("aegis/buggy-app:latest", name="cache")
+            fake.containers.get("api").remove(force=True)
+            deadline = time.monotonic() + 2
+            while inv.get("cache") is None or inv.get("api") is not None:
+                assert time.monotonic() < deadline, inv.status()
+                await asyncio.sleep(0.02)
+            assert inv.status()["watching"]
+        finally:
+            await inv.stop()
+
+    asyncio.run(scenario())
+
+
+def test_name_reuse_replaces_the_old_entry(fake):
+    inv = ContainerInventory()
+    asyncio.run(inv.resync())
+    old = fake.containers.get("api")
+    old.remove(force=True)
+    new = fake.containers.run("aegis/buggy-app:latest", name="api")
+    inv.upsert(new)
+    assert inv.get("api").id == new.id
+    assert inv.get(old.id) is None
@@ -0,0 +1,116 @@
+"""Incremental log tailer against the fake Docker client's follow streams."""
+
+import asyncio
+import time
+
+import pytest
+
+from app import docker_ops
+from app.log_tailer import LogTailer, _parse_ts
+from bench.fakes import FakeDocker
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakeDocker(("api", "db"), latency=0.0, spread=0.0)
+    monkeypatch.setattr(docker_ops, "_get_client", lambda: fake)
+    return fake
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def _bodies(lines):
+    return [line.split(" ", 1)[1] for line in lines]
+
+
+def test_parse_docker_timestamps():
+    assert _parse_ts("2024-05-01T12:00:00.5Z") == pytest.approx(1714564800.5)
+    assert _parse_ts("2024-05-01T12:00:00Z") == 1714564800.0
+    assert _parse_ts("not-a-timestamp") is None
+
+
+def test_history_is_loaded_then_lines_follow(fake):
+    tailer = LogTailer(containers="api", lines=10)
+    assert tailer.recent("api") is None and not tailer.covers("api", 5)
+    tailer.resync()
+    _wait_for(lambda: tailer.recent("api") is not None)
+    assert len(tailer.recent("api")) == 5                 # the fake's start-up lines
+    fake.containers.get("api").log("ERROR boom")
+    _wait_for(lambda: _bodies(tailer.recent("api", lines=1)) == ["ERROR boom"])
+    assert tailer.covers("api", 10) and not tailer.covers("api", 11)
+    assert tailer.text("api", lines=1).endswith("ERROR boom\n")
+    assert tailer.recent("api", lines=0) == []
+    asyncio.run(tailer.stop())
+
+
+def test_seconds_window(fake):
+    tailer = LogTailer(containers="api", lines=10)
+    tailer.resync()
+    _wait_for(lambda: tailer.recent("api") is not None)
+    time.sleep(0.2)
+    fake.containers.get("api").log("WARN recent")
+    _wait_for(lambda: len(tailer.recent("api")) == 6)
+    assert _bodies(tailer.recent("api", seconds=0.1)) == ["WARN recent"]
+    asyncio.run(tailer.stop())
+
+
+def test_restarted_stream_neither_repeats_nor_misses(fake):
+    tailer = LogTailer(containers="api", lines=20)
+    tailer.resync()
+    _wait_for(lambda: tailer.recent("api") is not None)
+    follow = tailer._follows["api"]
+    _wait_for(lambda: follow.stream is not None)
+    follow.stream.close()                                  # stream dropped
+    _wait_for(lambda: not follow.active)
+    fake.containers.get("api").log("INFO while disconnected")
+    tailer.resync()                                        # resumes at the cursor (inclusive)
+    _wait_for(lambda: len(tailer.recent("api")) == 6)
+    time.sleep(0.05)
+    api = fake.containers.get("api")
+    assert _bodies(tailer.recent("api")) == [line for _, line in api._log]
+    assert tailer.status()["streams"] == 2
+    asyncio.run(tailer.stop())
+
+
+def _stamp(secs: int) -> str:
+    return f"2024-05-01T12:00:{secs:02d}.000000000Z"
+
+
+def test_repeated_lines_in_one_tick_are_kept(fake):
+    tailer = LogTailer(containers="api", lines=20)
+    follow = tailer._follows["api"]
+    for _ in range(2):
+        tailer._add(follow, f"{_stamp(1)} same line")
+    assert len(follow.lines) == 2
+    tailer._resume(follow)               # what a resumed stream repeats…
+    for _ in range(3):
+        tailer._add(follow, f"{_stamp(1)} same line")
+    assert len(follow.lines) == 3        # …is skipped once per kept copy
+
+
+def test_out_of_order_stamps_are_kept_outside_a_resume(fake):
+    tailer = LogTailer(containers="api", lines=20)
+    follow = tailer._follows["api"]
+    # stdout at :02, then stderr stamped :01 arriving late
+    for raw in (f"{_stamp(2)} out", f"{_stamp(1)} err", f"{_stamp(3)} out"):
+        tailer._add(follow, raw)
+    assert _bodies(line for _, line in follow.lines) == ["out", "err", "out"]
+    assert follow.cursor == _parse_ts(_stamp(3))
+
+    tailer._resume(follow)
+    for raw in (f"{_stamp(2)} out", f"{_stamp(3)} out",    # re-sent by `since`
+                f"{_stamp(5)} new", f"{_stamp(4)} late err"):
+        tailer._add(follow, raw)
+    assert _bodies(line for _, line in follow.lines)[3:] == ["new", "late err"]
+
+
+def test_follow_is_capped():
+    tailer = LogTailer(containers="", max_containers=1)
+    assert tailer.follow("api") and tailer.follow("api")
+    assert not tailer.follow("db")
+    assert tailer.status()["containers"] == 1
@@ -0,0 +1,63 @@
+"""Live metrics delta encoding."""
+
+from app.metrics_delta import MetricsDelta
+from app.models import WSFrameType
+
+
+def _row(name: str, cpu: float = 10.0, mem: float = 100.0, status: str = "running") -> dict:
+    return {"name": name, "cpu_percent": cpu, "memory_mb": mem, "status": status,
+            "uptime_seconds": 1}
+
+
+def _delta(**kwargs) -> MetricsDelta:
+    return MetricsDelta(**{"keyframe_every": 10, "pct_epsilon": 0.5, "rel_epsilon": 0.01,
+                           **kwargs})
+
+
+def test_first_tick_is_a_keyframe_then_quiet_ticks_send_nothing():
+    d = _delta()
+    rows = [_row("a"), _row("b")]
+    assert d.metrics(rows) == (WSFrameType.METRICS, rows)
+    assert d.metrics([_row("a", cpu=10.2), _row("b", mem=100.5)]) is None
+
+
+def test_only_moved_added_and_removed_containers_are_sent():
+    d = _delta()
+    d.metrics([_row("a"), _row("b")])
+    frame_type, data = d.metrics([_row("a", cpu=20.0), _row("c")])
+    assert frame_type is WSFrameType.METRICS_DELTA
+    assert [r["name"] for r in data["changed"]] == ["a", "c"]
+    assert data["removed"] == ["b"]
+
+
+def test_small_drifts_accumulate_against_what_was_sent():
+    d = _delta()
+    d.metrics([_row("a", cpu=10.0)])
+    assert d.metrics([_row("a", cpu=10.4)]) is None
+    frame_type, data = d.metrics([_row("a", cpu=10.8)])   # 0.8 from the last *sent* value
+    assert data["changed"][0]["cpu_percent"] == 10.8
+
+
+def test_status_change_is_always_sent():
+    d = _delta()
+    d.metrics([_row("a")])
+    _, data = d.metrics([_row("a", status="exited")])
+    assert data["changed"][0]["status"] == "exited"
+
+
+def test_keyframes_recur_and_reset_forces_one():
+    d = _delta(keyframe_every=3)
+    rows = [_row("a")]
+    kinds = [d.metrics(rows) for _ in range(4)]
+    assert kinds[0][0] is WSFrameType.METRICS and kinds[3][0] is WSFrameType.METRICS
+    assert kinds[1] is None and kinds[2] is None
+    d.reset()
+    assert d.metrics(rows)[0] is WSFrameType.METRICS
+
+
+def test_container_list_only_on_membership_or_status_change():
+    d = _delta()
+    listing = [{"name": "a", "status": "running", "id": "1"}]
+    assert d.containers(listing)
+    assert not d.containers(list(listing))
+    assert d.containers([{"name": "a", "status": "exited", "id": "1"}])
@@ -0,0 +1,115 @@
+"""Multi-resolution ring buffers and query-time downsampling."""
+
+import pytest
+
+from app.metrics_history import MetricsHistory, parse_tiers
+
+
+def _row(name="api", cpu=0.0, mem=0.0):
+    return {"name": name, "cpu_percent": cpu, "memory_mb": mem,
+            "memory_percent": 0.0, "net_rx_bytes": 0, "net_tx_bytes": 0}
+
+
+def test_parse_tiers_sorts_and_rejects_empty():
+    assert parse_tiers("60:10, 3:100") == [(3.0, 100), (60.0, 10)]
+    with pytest.raises(ValueError):
+        parse_tiers(" , ")
+
+
+def test_buckets_keep_min_avg_max():
+    h = MetricsHistory([(10, 10)])
+    for ts, cpu in ((0, 10), (5, 30), (10, 50)):
+        h.record([_row(cpu=cpu)], ts=ts)
+    for agg, expected in (("min", [10, 50]), ("avg", [20, 50]), ("max", [30, 50])):
+        out = h.query("api", 0, 20, 10, agg=agg)
+        assert out["ts"] == [0, 10] and out["cpu_percent"] == expected, agg
+    with pytest.raises(ValueError):
+        h.query("api", 0, 20, 10, agg="p99")
+    assert h.query("nobody", 0, 20, 10) is None
+
+
+def test_query_rebuckets_to_a_coarser_step():
+    h = MetricsHistory([(1, 100)])
+    for ts in range(10):
+        h.record([_row(cpu=ts)], ts=ts)
+    out = h.query("api", 0, 9, 5)
+    assert out["resolution"] == 1
+    assert out["ts"] == [0, 5] and out["cpu_percent"] == [2.0, 7.0]
+
+
+def test_ring_wraps_and_coarse_tier_keeps_older_history():
+    h = MetricsHistory([(1, 5), (10, 10)])
+    for ts in range(30):
+        h.record([_row(cpu=ts)], ts=ts)
+    fine = h.query("api", 25, 29, 1)
+    assert fine["resolution"] == 1 and fine["ts"] == [25, 26, 27, 28, 29]
+    # The fine ring no longer reaches back to 0 → the 10 s tier answers
+    old = h.query("api", 0, 29, 10)
+    assert old["resolution"] == 10
+    assert old["ts"] == [0, 10, 20] and old["cpu_percent"] == [4.5, 14.5, 24.5]
+
+
+def test_container_cap_drops_least_recently_seen():
+    h = MetricsHistory([(1, 4)], max_containers=2)
+    h.record([_row("a"), _row("b")], ts=0)
+    h.record([_row("a")], ts=1)
+    h.record([_row("c")], ts=2)
+    assert h.names() == ["a", "c"]
+    status = h.status()
+    assert status["containers"] == 2
+    assert status["bytes"] == 2 * h.bytes_per_container
+    assert h.retention_secs == 4
+
+
+def test_mirror_rebuilds_state_from_keyframes_and_deltas(monkeypatch):
+    from app import metrics_delta
+    from app.metrics_delta import MetricsMirror
+    from app.models import WSFrameType
+
+    now = [100.0]
+    monkeypatch.setattr(metrics_delta.time, "monotonic", lambda: now[0])
+    mirror = MetricsMirror(max_age=30)
+    mirror.apply(WSFrameType.METRICS_DELTA, {"changed": [_row("api")], "removed": []})
+    assert mirror.rows() is None                      # no keyframe yet
+    mirror.apply(WSFrameType.METRICS, [_row("api", cpu=1), _row("db", cpu=2)])
+    mirror.apply(WSFrameType.METRICS_DELTA, {"changed": [_row("api", cpu=9)], "removed": ["db"]})
+    assert mirror.rows() == [_row("api", cpu=9)]
+    now[0] += 31                                      # leader went quiet
+    assert mirror.rows() is None
+
+
+def test_follower_worker_records_and_serves_history(monkeypatch):
+    import asyncio
+    from types import SimpleNamespace
+
+    import httpx
+
+    from app import config, main
+    from app.metrics_delta import MetricsMirror
+    from app.models import WSFrame, WSFrameType
+
+    async def no_docker():
+        raise AssertionError("followers must not poll Docker")
+
+    monkeypatch.setattr(config, "METRICS_INTERVAL_SECS", 0.01)
+    monkeypatch.setattr(main, "METRICS_HISTORY", True)
+    monkeypatch.setattr(main, "shared_state", SimpleNamespace(is_leader=False, distributed=True))
+    monkeypatch.setattr(main, "metrics_history", MetricsHistory([(1, 100)]))
+    monkeypatch.setattr(main, "_metrics_mirror", MetricsMirror())
+    monkeypatch.setattr(main, "get_all_metrics", no_docker)
+
+    async def run():
+        # What the leader publishes on the shared bus
+        await main._mirror_frame(WSFrame(type=WSFrameType.METRICS,
+                                         data=[_row("api", cpu=40)]).model_dump_json())
+        loop = asyncio.create_task(main._metrics_loop())
+        await asyncio.sleep(0.05)
+        loop.cancel()
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://aegis") as client:
+            return await client.get("/metrics/history", params={"container": "api", "range": 60})
+
+    resp = asyncio.run(run())
+    assert resp.status_code == 200
+    points = resp.json()["series"]["api"]
+    assert points["ts"] and set(points["cpu_percent"]) == {40.0}
@@ -0,0 +1,235 @@
+"""ScalingController against the fake Docker client."""
+
+import asyncio
+import contextlib
+
+import pytest
+
+from app import docker_ops
+from app.docker_ops import (
+    ScalingController, UpstreamManager, WarmPool, prepare_scale_up,
+)
+from bench.fakes import FakeDocker
+
+SERVICE = "web"
+
+
+@pytest.fixture
+def fake():
+    fake = FakeDocker((SERVICE, "aegis-lb"), latency=0.0, spread=0.0)
+    saved = docker_ops._get_client, docker_ops.lb, docker_ops.warm_pool
+    docker_ops._get_client = lambda: fake
+    docker_ops.lb = UpstreamManager(debounce_secs=0)
+    docker_ops.warm_pool = WarmPool(size=0)
+    yield fake
+    docker_ops._get_client, docker_ops.lb, docker_ops.warm_pool = saved
+
+
+def _names(fake) -> list[str]:
+    return sorted(c.name for c in fake.containers.list(all=True) if c.name.startswith(SERVICE + "-"))
+
+
+def _scaler(**kwargs) -> ScalingController:
+    kwargs.setdefault("cooldown", 0)
+    return ScalingController(max_replicas=5, pool=docker_ops.warm_pool, **kwargs)
+
+
+def test_concurrent_requests_share_one_reconcile(fake):
+    async def main():
+        scaler = _scaler()
+        events = await asyncio.gather(*(
+            scaler.scale_to(SERVICE, n, incident_id=f"inc-{n}", at_least=True) for n in (2, 3, 1)
+        ))
+        assert {e.replica_count for e in events} == {3}
+        assert _names(fake) == ["web-replica-1", "web-replica-2", "web-replica-3"]
+
+    asyncio.run(main())
+
+
+def test_plan_is_rolled_back_when_discovery_fails(fake):
+    async def main():
+        plan = await prepare_scale_up(SERVICE, 2)
+        assert plan.staged and not plan.settled
+        scaler = _scaler()
+
+        async def broken(service):
+            raise RuntimeError("docker unavailable")
+
+        scaler._discover = broken
+        with pytest.raises(RuntimeError):
+            await scaler.scale_to(SERVICE, 2, plan=plan, at_least=True)
+        assert plan.settled
+        assert _names(fake) == []              # staged containers removed
+
+    asyncio.run(main())
+
+
+def test_plan_is_committed_by_scale_to(fake):
+    async def main():
+        plan = await prepare_scale_up(SERVICE, 2)
+        event = await _scaler().scale_to(SERVICE, 2, plan=plan, at_least=True)
+        assert plan.settled
+        assert event.started == ["web-replica-1", "web-replica-2"]
+        assert _names(fake) == ["web-replica-1", "web-replica-2"]
+
+    asyncio.run(main())
+
+
+def test_scale_down_waits_for_cooldown_unless_forced(fake):
+    async def main():
+        scaler = _scaler(cooldown=60)
+        await scaler.scale_to(SERVICE, 2, at_least=True)
+        plan = await prepare_scale_up(SERVICE, 3)
+        deferred = await scaler.scale_to(SERVICE, 1, plan=plan)
+        assert deferred.outcome == "deferred"
+        assert plan.settled                    # the unused plan is discarded
+        forced = await scaler.scale_to(SERVICE, 1, force=True)
+        assert forced.removed == ["web-replica-2"]
+
+    asyncio.run(main())
+
+
+def test_missing_replicas_start_concurrently(fake, monkeypatch):
+    fake.latency = 0.02
+    inflight, peak = [0], [0]
+    real_op = fake._op
+
+    def counting_op(op):
+        if op != "create":
+            return real_op(op)
+        with fake._lock:
+            inflight[0] += 1
+            peak[0] = max(peak[0], inflight[0])
+        try:
+            real_op(op)
+        finally:
+            with fake._lock:
+                inflight[0] -= 1
+
+    monkeypatch.setattr(fake, "_op", counting_op)
+
+    async def main():
+        event = await _scaler(spawn_concurrency=4).scale_to(SERVICE, 4, at_least=True)
+        assert len(event.started) == 4
+
+    asyncio.run(main())
+    assert peak[0] > 1
+
+
+def test_warm_pool_serves_scale_up_without_creating(fake):
+    async def main():
+        docker_ops.warm_pool = pool = WarmPool(size=2, concurrency=2)
+        assert await pool.fill(SERVICE) == 2
+        warm = sorted(c.name for c in fake.containers.list(all=True) if "-warm-" in c.name)
+        assert len(warm) == 2 and pool.available(SERVICE) == 2
+        creates = fake.ops.get("create", 0)
+        event = await _scaler().scale_to(SERVICE, 2, at_least=True)
+        assert event.started == ["web-replica-1", "web-replica-2"]
+        assert fake.ops.get("create", 0) == creates  # renamed + started, not created
+        assert pool.claimed == 2
+        await asyncio.sleep(0.1)                      # background refill after the claim
+        assert pool.available(SERVICE) == 2
+        await pool.close()
+
+    asyncio.run(main())
+
+
+def test_warm_pool_adopts_leftovers_and_drops_stale_images(fake):
+    fake.containers.create("aegis/buggy-app:old", name=f"{SERVICE}-warm-old",
+                           labels={docker_ops.REPLICA_LABEL: SERVICE})
+    fake.containers.create("aegis/buggy-app:latest", name=f"{SERVICE}-warm-keep",
+                           labels={docker_ops.REPLICA_LABEL: SERVICE})
+
+    async def main():
+        pool = WarmPool(size=2)
+        assert await pool.fill(SERVICE) == 1
+        names = {c.name for c in pool.take(SERVICE, 5)}
+        assert f"{SERVICE}-warm-keep" in names and f"{SERVICE}-warm-old" not in names
+        assert pool.take(SERVICE, 1) == []
+
+    asyncio.run(main())
+    assert f"{SERVICE}-warm-old" not in {c.name for c in fake.containers.list(all=True)}
+
+
+def test_discovery_uses_labels_not_names(fake):
+    labels = {docker_ops.REPLICA_LABEL: SERVICE}
+    for name in ("web-replica-1", "web-replica-2"):
+        fake.containers.run("aegis/buggy-app:latest", name=name, labels=labels)
+    fake.containers.run("aegis/buggy-app:latest", name="web-replica-9")  # no label
+    fake.containers.create("aegis/buggy-app:latest", name="web-warm-abc", labels=labels)
+
+    async def main():
+        scaler = _scaler()
+        await scaler._discover(SERVICE)
+        assert scaler._replicas[SERVICE] == ["web-replica-1", "web-replica-2"]
+        assert scaler._desired[SERVICE] == 2
+
+    asyncio.run(main())
+
+
+def test_unlabelled_replica_holding_a_name_is_replaced(fake):
+    stale = fake.containers.run("aegis/buggy-app:latest", name="web-replica-1")
+
+    async def main():
+        event = await _scaler().scale_to(SERVICE, 1, at_least=True)
+        assert event.started == ["web-replica-1"]
+
+    asyncio.run(main())
+    current = fake.containers.get("web-replica-1")
+    assert current is not stale
+    assert current.attrs["Config"]["Labels"] == {docker_ops.REPLICA_LABEL: SERVICE}
+
+
+def test_scale_by_steps_down_one_replica_at_a_time(fake):
+    async def main():
+        scaler = _scaler()
+        await scaler.scale_to(SERVICE, 3, at_least=True)
+        first = await scaler.scale_by(SERVICE, -1)
+        assert first.replica_count == 2 and first.removed == ["web-replica-3"]
+        second = await scaler.scale_by(SERVICE, -1)
+        assert second.removed == ["web-replica-2"]
+        assert _names(fake) == ["web-replica-1"]
+
+    asyncio.run(main())
+
+
+class _SlowReleaseState:
+    """Shared state whose lease release awaits, like a Redis DEL round trip."""
+
+    distributed = True
+
+    def __init__(self) -> None:
+        self.records: dict = {}
+        self.releasing = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    @contextlib.asynccontextmanager
+    async def lock(self, name: str):
+        async with self._lock:
+            yield
+            self.releasing.set()
+            await asyncio.sleep(0.05)
+
+    async def load_state(self, key: str):
+        return self.records.get(key)
+
+    async def save_state(self, key: str, value) -> None:
+        self.records[key] = value
+
+
+def test_request_during_lease_release_gets_its_own_reconcile(fake):
+    async def main():
+        shared = _SlowReleaseState()
+        scaler = _scaler()
+        scaler.attach(shared)
+        plan = await prepare_scale_up(SERVICE, 3)
+        first = asyncio.create_task(scaler.scale_to(SERVICE, 2, at_least=True))
+        await shared.releasing.wait()          # first reconcile is done, lease not yet free
+        second = await scaler.scale_to(SERVICE, 3, plan=plan, at_least=True)
+        assert (await first).replica_count == 2
+        assert second.replica_count == 3 and second.started == ["web-replica-3"]
+        assert plan.settled
+        assert _names(fake) == ["web-replica-1", "web-replica-2", "web-replica-3"]
+        assert shared.records[f"scale:{SERVICE}"]["desired"] == 3
+
+    asyncio.run(main())
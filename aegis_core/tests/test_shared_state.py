@@ -0,0 +1,153 @@
+"""Cross-worker locks and state records (fakeredis stands in for Redis)."""
+
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # fakeredis needs it for the lease scripts
+
+from app import docker_ops  # noqa: E402
+from app.coordinator import TargetCoordinator  # noqa: E402
+from app.docker_ops import ScalingController, UpstreamManager, WarmPool  # noqa: E402
+from app.shared_state import LocalSharedState, RedisSharedState  # noqa: E402
+from bench.fakes import FakeDocker  # noqa: E402
+
+
+def _workers(n: int, **kwargs) -> list[RedisSharedState]:
+    server = fakeredis.FakeServer()
+    return [
+        RedisSharedState(prefix="test", sync_client=fakeredis.FakeRedis(server=server),
+                         async_client=fakeredis.FakeAsyncRedis(server=server), **kwargs)
+        for _ in range(n)
+    ]
+
+
+def test_lock_is_exclusive_across_workers():
+    async def main():
+        holders, peak = set(), 0
+
+        async def hold(state, i):
+            nonlocal peak
+            async with state.lock("target:web"):
+                holders.add(i)
+                peak = max(peak, len(holders))
+                await asyncio.sleep(0.02)
+                holders.discard(i)
+
+        workers = _workers(3)
+        await asyncio.gather(*(hold(w, i) for i, w in enumerate(workers) for _ in range(2)))
+        assert peak == 1
+
+    asyncio.run(main())
+
+
+def test_lock_is_renewed_while_held():
+    async def main():
+        a, b = _workers(2, lock_lease_secs=0.15)
+        entered = asyncio.Event()
+
+        async def slow():
+            async with a.lock("target:web"):
+                entered.set()
+                await asyncio.sleep(0.5)      # > 3 lease periods
+                return asyncio.get_running_loop().time()
+
+        task = asyncio.create_task(slow())
+        await entered.wait()
+        async with b.lock("target:web"):
+            acquired = asyncio.get_running_loop().time()
+        assert acquired >= await task
+
+    asyncio.run(main())
+
+
+def test_state_records_round_trip():
+    async def main():
+        a, b = _workers(2)
+        assert await b.load_state("scale:web") is None
+        await a.save_state("scale:web", {"desired": 3})
+        assert await b.load_state("scale:web") == {"desired": 3}
+        assert await LocalSharedState().load_state("scale:web") is None
+
+    asyncio.run(main())
+
+
+def test_coordinators_on_different_workers_take_turns_per_target():
+    async def main():
+        running: dict[str, int] = {}
+        peak: dict[str, int] = {}
+
+        async def work(target):
+            running[target] = running.get(target, 0) + 1
+            peak[target] = max(peak.get(target, 0), running[target])
+            await asyncio.sleep(0.02)
+            running[target] -= 1
+
+        coordinators = []
+        for state in _workers(3):
+            co = TargetCoordinator()
+            co.attach(state)
+            coordinators.append(co)
+        await asyncio.gather(*(
+            co.run(target, "RESTART", f"{target}-{i}", lambda t=target: work(t))
+            for i, co in enumerate(coordinators) for target in ("a", "b")
+        ))
+        assert peak == {"a": 1, "b": 1}
+        assert coordinators[0].snapshot()["distributed"]
+
+    asyncio.run(main())
+
+
+def test_local_state_keeps_coordinator_per_process():
+    co = TargetCoordinator()
+    co.attach(LocalSharedState())
+    assert not co.snapshot()["distributed"]
+
+
+@pytest.fixture
+def fake_docker():
+    fake = FakeDocker(("web", "aegis-lb"), latency=0.0, spread=0.0)
+    saved = docker_ops._get_client, docker_ops.lb
+    docker_ops._get_client = lambda: fake
+    docker_ops.lb = UpstreamManager(debounce_secs=0)
+    yield fake
+    docker_ops._get_client, docker_ops.lb = saved
+
+
+def _scalers(n: int, cooldown: float = 0.0) -> list[ScalingController]:
+    scalers = []
+    for state in _workers(n):
+        scaler = ScalingController(cooldown=cooldown, max_replicas=5, pool=WarmPool(size=0))
+        scaler.attach(state)
+        scalers.append(scaler)
+    return scalers
+
+
+def _replicas(fake) -> list[str]:
+    return sorted(c.name for c in fake.containers.list(filters={"label": docker_ops.REPLICA_LABEL}))
+
+
+def test_stale_worker_does_not_undo_another_workers_scale_up(fake_docker):
+    async def main():
+        a, b = _scalers(2)
+        await b._discover("web")               # b last saw 0 replicas
+        await a.scale_to("web", 3, at_least=True)
+        event = await b.scale_to("web", 2, at_least=True)
+        assert event.replica_count == 3
+        assert _replicas(fake_docker) == ["web-replica-1", "web-replica-2", "web-replica-3"]
+
+    asyncio.run(main())
+
+
+def test_scale_down_respects_cooldown_from_another_worker(fake_docker):
+    async def main():
+        a, b = _scalers(2, cooldown=60)
+        await a.scale_to("web", 2, at_least=True)
+        event = await b.scale_by("web", -1)
+        assert event.outcome == "deferred"
+        assert len(_replicas(fake_docker)) == 2
+        forced = await b.scale_to("web", 1, force=True)
+        assert forced.replicas == ["web-replica-1"]
+
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""Streaming stats collector against the fake Docker client."""
+
+import asyncio
+import time
+
+import pytest
+
+from app import docker_ops
+from app.stats_collector import StatsCollector
+from bench.fakes import FakeDocker
+
+
+@pytest.fixture
+def fake():
+    fake = FakeDocker(("api", "db"), latency=0.01, spread=0.0)
+    saved = docker_ops._get_client
+    docker_ops._get_client = lambda: fake
+    yield fake
+    docker_ops._get_client = saved
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_one_stream_per_container_feeds_the_snapshot(fake):
+    collector = StatsCollector(backend="docker")
+    asyncio.run(collector.refresh())
+    _wait_for(lambda: all(m.cpu_percent > 0 for m in collector.snapshot()))
+    snapshot = {m.name: m for m in collector.snapshot()}
+    assert set(snapshot) == {"api", "db"}
+    assert snapshot["api"].memory_mb == 64.0
+    assert collector.status()["streams"] == 2
+    asyncio.run(collector.stop())
+
+
+def test_removed_container_is_dropped_on_resync(fake):
+    collector = StatsCollector(backend="docker")
+    asyncio.run(collector.refresh())
+    fake.containers.get("db").remove(force=True)
+    _wait_for(lambda: [m.name for m in collector.snapshot()] == ["api"])
+    asyncio.run(collector.refresh())
+    assert collector.status()["streams"] == 1
+    asyncio.run(collector.stop())
+
+
+def test_snapshot_never_calls_docker(fake):
+    collector = StatsCollector(backend="docker")
+    asyncio.run(collector.refresh())
+    _wait_for(lambda: collector.status()["samples"] > 0)
+    before = dict(fake.ops)
+    collector.snapshot()
+    assert {k: v for k, v in fake.ops.items() if k != "stats_sample"} == \
+        {k: v for k, v in before.items() if k != "stats_sample"}
+    asyncio.run(collector.stop())
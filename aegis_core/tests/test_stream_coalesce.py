@@ -0,0 +1,83 @@
+"""AI stream coalescing: tokens batched per window, nothing lost."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.ai_brain import _iterate_in_thread
+from app.main import _coalesce
+
+
+async def _tokens(items, delay: float = 0.0, fail: bool = False):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+    if fail:
+        raise RuntimeError("stream broke")
+
+
+async def _collect(source, window: float) -> list[str]:
+    return [delta async for delta in _coalesce(source, window)]
+
+
+def test_fast_tokens_are_joined_into_few_deltas():
+    tokens = [f"t{i} " for i in range(200)]
+    deltas = asyncio.run(_collect(_tokens(tokens), 0.05))
+    assert "".join(deltas) == "".join(tokens)
+    assert len(deltas) < 10
+
+
+def test_slow_tokens_are_not_held_back():
+    deltas = asyncio.run(_collect(_tokens(["a", "b", "c"], delay=0.05), 0.01))
+    assert deltas == ["a", "b", "c"]
+
+
+def test_producer_errors_surface_to_the_consumer():
+    with pytest.raises(RuntimeError, match="stream broke"):
+        asyncio.run(_collect(_tokens(["a", "b"], fail=True), 0.01))
+
+
+class _BlockingStream:
+    """Blocking chunk iterator with close(), like the OpenAI SDK's Stream."""
+
+    def __init__(self, chunks: int = 200, delay: float = 0.005) -> None:
+        self.chunks, self.delay = chunks, delay
+        self.read = 0
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        for i in range(self.chunks):
+            if self.closed.is_set():
+                raise RuntimeError("response closed")
+            time.sleep(self.delay)
+            self.read += 1
+            yield i
+
+    def close(self) -> None:
+        self.closed.set()
+
+
+def test_thread_stops_reading_when_the_consumer_stops():
+    stream = _BlockingStream()
+
+    async def main():
+        chunks = _iterate_in_thread(stream)
+        assert [await chunks.__anext__() for _ in range(3)] == [0, 1, 2]
+        await chunks.aclose()
+        assert stream.closed.is_set()
+        await asyncio.sleep(0.05)
+        return stream.read
+
+    read_at_stop = asyncio.run(main())
+    time.sleep(0.05)
+    assert stream.read <= read_at_stop + 1 < stream.chunks
+
+
+def test_thread_stream_delivers_everything():
+    async def main():
+        return [c async for c in _iterate_in_thread(_BlockingStream(chunks=20, delay=0))]
+
+    assert asyncio.run(main()) == list(range(20))
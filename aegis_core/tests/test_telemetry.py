@@ -0,0 +1,99 @@
+"""Latency histograms and LLM stream timing."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app import ai_brain
+from app.telemetry import LLM_CALL, Histogram
+
+
+def _series(hist: Histogram) -> dict:
+    with hist._lock:
+        return {key: (s.count, s.total) for key, s in hist._series.items()}
+
+
+def test_render_omits_empty_label_braces():
+    hist = Histogram("t_seconds", "test", ())
+    hist.observe(0.2)
+    lines = hist.render()
+    assert 't_seconds_bucket{le="+Inf"} 1' in lines
+    assert "t_seconds_sum 0.200000" in lines
+    assert "t_seconds_count 1" in lines
+
+    labelled = Histogram("l_seconds", "test", ("op",))
+    labelled.observe(0.2, op="stats")
+    assert 'l_seconds_count{op="stats"} 1' in labelled.render()
+
+
+def test_quantiles_interpolate_within_buckets():
+    hist = Histogram("q_seconds", "test", ("op",), buckets=(1.0, 2.0))
+    for _ in range(10):
+        hist.observe(1.5, op="a")
+    summary = hist.summary("op")["a"]
+    assert summary["count"] == 10
+    assert 1000 < summary["p50_ms"] <= 2000
+
+
+def test_time_sets_outcome_and_ignores_generator_close():
+    hist = Histogram("o_seconds", "test", ("op", "outcome"))
+    with pytest.raises(ValueError):
+        with hist.time(op="x"):
+            raise ValueError
+    with pytest.raises(GeneratorExit):
+        with hist.time(op="x"):
+            raise GeneratorExit
+    assert set(_series(hist)) == {("x", "error"), ("x", "ok")}
+
+
+def _chunks(n: int, delay: float):
+    for i in range(n):
+        time.sleep(delay)
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=f"t{i} "))])
+
+
+def test_stream_timing_excludes_consumer_time():
+    LLM_CALL.reset()
+
+    async def main():
+        got = []
+        async for chunk in ai_brain._timed_stream("ollama", "stream", lambda: _chunks(3, 0.01)):
+            got.append(chunk)
+            await asyncio.sleep(0.1)            # slow consumer
+        return got
+
+    assert len(asyncio.run(main())) == 3
+    (key, (count, total)), = _series(LLM_CALL).items()
+    assert key == ("ollama", "stream", "ok")
+    assert count == 1
+    assert total < 0.2                          # ~0.03s of provider time, not ~0.33s
+
+
+def test_stream_closed_early_is_not_an_error():
+    LLM_CALL.reset()
+
+    async def main():
+        stream = ai_brain._timed_stream("fastrouter", "stream", lambda: _chunks(5, 0.0))
+        async for _ in stream:
+            break
+        await stream.aclose()
+
+    asyncio.run(main())
+    assert list(_series(LLM_CALL)) == [("fastrouter", "stream", "ok")]
+
+
+def test_stream_provider_failure_is_an_error():
+    LLM_CALL.reset()
+
+    def create():
+        raise ConnectionError("provider down")
+
+    async def main():
+        async for _ in ai_brain._timed_stream("fastrouter", "stream", create):
+            pass
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(main())
+    assert list(_series(LLM_CALL)) == [("fastrouter", "stream", "error")]
@@ -0,0 +1,90 @@
+"""UpstreamManager: debounced nginx upstream swaps against the fake Docker client."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app import docker_ops
+from app.config import NGINX_CONTAINER
+from app.docker_ops import UpstreamManager
+from bench.fakes import FakeDocker
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakeDocker(("web", NGINX_CONTAINER), latency=0.02, spread=0.0)
+    monkeypatch.setattr(docker_ops, "_get_client", lambda: fake)
+    return fake
+
+
+def _slow_nginx(fake, monkeypatch, codes=None):
+    """Make each swap take 50 ms, exiting with the next code (default 0)."""
+    codes = iter(codes or [])
+
+    def exec_run(cmd, **_):
+        time.sleep(0.05)
+        return SimpleNamespace(exit_code=next(codes, 0), output=b"nginx: [emerg] bad")
+
+    monkeypatch.setattr(fake.containers.get(NGINX_CONTAINER), "exec_run", exec_run)
+
+
+def test_overlapping_applies_end_on_the_latest_set(fake, monkeypatch):
+    _slow_nginx(fake, monkeypatch)
+    async def main():
+        lb = UpstreamManager(debounce_secs=0.05)
+        first = asyncio.create_task(lb.apply("web", ["web-replica-1"]))
+        await asyncio.sleep(0.02)        # first write is in flight
+        later = [asyncio.create_task(lb.apply("web", r)) for r in
+                 (["web-replica-1", "web-replica-2"],
+                  ["web-replica-1", "web-replica-2", "web-replica-3"])]
+        assert await asyncio.gather(first, *later) == [True, True, True]
+        assert lb.servers == ["web", "web-replica-1", "web-replica-2", "web-replica-3"]
+        assert lb.applied == 2 and lb.coalesced == 1
+
+    asyncio.run(main())
+
+
+def test_each_caller_gets_its_own_flush_result(fake, monkeypatch):
+    _slow_nginx(fake, monkeypatch, codes=[0, 3])
+
+    async def main():
+        lb = UpstreamManager(debounce_secs=0)
+        first = asyncio.create_task(lb.apply("web", ["web-replica-1"]))
+        await asyncio.sleep(0.02)        # first write is in flight
+        second = asyncio.create_task(lb.apply("web", ["web-replica-1", "web-replica-2"]))
+        assert await asyncio.gather(first, second) == [True, False]
+        assert lb.servers == ["web", "web-replica-1"]   # the rejected set never went live
+        assert lb.rejected == 1
+
+    asyncio.run(main())
+
+
+def test_unchanged_set_skips_the_reload(fake):
+    async def main():
+        lb = UpstreamManager(debounce_secs=0)
+        assert await lb.apply("web", ["web-replica-1"])
+        execs = fake.ops.get("exec", 0)
+        assert await lb.apply("web", ["web-replica-1"])
+        assert fake.ops.get("exec", 0) == execs
+        assert (lb.applied, lb.skipped) == (1, 1)
+
+    asyncio.run(main())
+
+
+def test_write_errors_reach_the_callers(fake, monkeypatch):
+    async def main():
+        lb = UpstreamManager(debounce_secs=0)
+
+        def broken(*_):
+            raise RuntimeError("daemon gone")
+
+        monkeypatch.setattr(lb, "_swap", broken)
+        with pytest.raises(RuntimeError):
+            await lb.apply("web", ["web-replica-1"])
+        monkeypatch.undo()
+        monkeypatch.setattr(docker_ops, "_get_client", lambda: fake)
+        assert await lb.apply("web", ["web-replica-1"])  # the flusher recovered
+
+    asyncio.run(main())
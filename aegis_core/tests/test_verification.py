@@ -0,0 +1,71 @@
+"""Adaptive health verification: early exit, consecutive passes, deadline."""
+
+import asyncio
+
+import pytest
+
+from app import verification
+
+
+@pytest.fixture
+def probes(monkeypatch):
+    """Replace the HTTP probe with a scripted sequence of results."""
+    script: list[bool] = []
+    seen: list[int] = []
+
+    async def fake_probe(url, attempt):
+        seen.append(attempt)
+        return script.pop(0) if script else False
+
+    monkeypatch.setattr(verification, "_probe", fake_probe)
+    return script, seen
+
+
+def _verify(**kwargs) -> bool:
+    kwargs = {"url": "http://test/health", "deadline": 1.0, "required_passes": 2,
+              "initial_delay": 0, "backoff": 0.01, "max_backoff": 0.05, **kwargs}
+    return asyncio.run(verification.verify_health(**kwargs))
+
+
+def test_healthy_target_exits_after_required_passes(probes):
+    script, seen = probes
+    script.extend([True, True, True])
+    assert _verify()
+    assert seen == [1, 2]
+
+
+def test_a_failure_resets_the_consecutive_count(probes):
+    script, seen = probes
+    script.extend([True, False, True, True])
+    assert _verify()
+    assert len(seen) == 4
+
+
+def test_gives_up_at_the_deadline(probes):
+    script, seen = probes
+    loop_time = []
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        ok = await verification.verify_health(
+            url="x", deadline=0.2, required_passes=1, initial_delay=0,
+            backoff=0.01, max_backoff=0.05)
+        loop_time.append(loop.time() - start)
+        return ok
+
+    assert not asyncio.run(run())
+    assert loop_time[0] < 0.5
+    assert len(seen) >= 3                      # kept probing with backoff until then
+
+
+def test_on_probe_sees_every_attempt(probes):
+    script, _ = probes
+    script.extend([False, True, True])
+    calls = []
+
+    async def on_probe(attempt, healthy):
+        calls.append((attempt, healthy))
+
+    assert _verify(on_probe=on_probe)
+    assert calls == [(1, False), (2, True), (3, True)]
@@ -0,0 +1,89 @@
+"""/webhook/batch: dedup, all-or-nothing admission and the single incident.new frame."""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app import main
+from app.executor import RemediationExecutor
+from app.models import WSFrameType
+
+
+@pytest.fixture
+def api(monkeypatch):
+    async def handler(payload, result):
+        await asyncio.Event().wait()    # stays in flight until the test ends
+
+    frames, stored = [], []
+
+    async def broadcast_raw(frame_type, data=None, incident_id=None):
+        frames.append((frame_type, data, incident_id))
+
+    async def notify_batch(payloads):
+        pass
+
+    ex = RemediationExecutor(handler, workers=1, max_queue=2)
+    monkeypatch.setattr(main, "executor", ex)
+    monkeypatch.setattr(main, "ws", SimpleNamespace(broadcast_raw=broadcast_raw))
+    monkeypatch.setattr(main, "incident_store", SimpleNamespace(put=stored.append))
+    monkeypatch.setattr(main, "slack_notify_batch", notify_batch)
+    return SimpleNamespace(frames=frames, stored=stored, executor=ex)
+
+
+def _run(api, scenario) -> None:
+    async def run():
+        api.executor.start()
+        transport = httpx.ASGITransport(app=main.app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://aegis") as client:
+                await scenario(client)
+        finally:
+            await api.executor.drain(timeout=0)
+
+    asyncio.run(run())
+
+
+def _alert(iid: str) -> dict:
+    return {"incident_id": iid, "alert_type": "Memory Leak", "logs": "OOM " * 100}
+
+
+def test_batch_is_queued_with_one_list_frame(api):
+    async def scenario(client):
+        resp = await client.post("/webhook/batch", json=[_alert("a"), _alert("b"), _alert("a")])
+        assert resp.status_code == 200
+        body = resp.json()
+        assert [r["incident_id"] for r in body["accepted"]] == ["a", "b"]
+        assert body["duplicates"] == ["a"] and body["already_pending"] == []
+
+    _run(api, scenario)
+    assert len(api.frames) == 1
+    frame_type, data, incident_id = api.frames[0]
+    assert frame_type == WSFrameType.INCIDENT_NEW and incident_id is None
+    assert [row["incident_id"] for row in data] == ["a", "b"]
+    assert all(len(row["logs"]) == 200 for row in data)
+    assert [r.incident_id for r in api.stored] == ["a", "b"]
+
+
+def test_ids_still_pending_are_reported_separately(api):
+    async def scenario(client):
+        await client.post("/webhook/batch", json=[_alert("a")])
+        body = (await client.post("/webhook/batch", json=[_alert("a"), _alert("c")])).json()
+        assert [r["incident_id"] for r in body["accepted"]] == ["c"]
+        assert body["already_pending"] == ["a"] and body["duplicates"] == []
+
+    _run(api, scenario)
+
+
+def test_batch_that_does_not_fit_is_refused_whole(api):
+    async def scenario(client):
+        await client.post("/webhook/batch", json=[_alert("a")])
+        await asyncio.sleep(0.01)       # "a" is in flight, both queue slots free
+        resp = await client.post("/webhook/batch", json=[_alert("b"), _alert("c"), _alert("d")])
+        assert resp.status_code == 429
+        assert resp.headers["Retry-After"]
+        assert not any(api.executor.is_pending(i) for i in "bcd")   # not even two of three
+
+    _run(api, scenario)
+    assert len(api.frames) == 1 and len(api.stored) == 1   # nothing from the refused batch
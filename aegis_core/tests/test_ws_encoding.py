@@ -0,0 +1,43 @@
+"""WebSocket wire encodings: json, compact (columnar rows) and msgpack."""
+
+import json
+
+import pytest
+
+from app.models import WSFrame, WSFrameType
+from app.ws_manager import encode
+
+ROWS = [{"name": "api", "cpu": 1.5, "mem": 10}, {"name": "db", "cpu": 0.5, "mem": 20}]
+
+
+def test_json_is_the_plain_model():
+    frame = WSFrame(type=WSFrameType.METRICS, data=ROWS, seq=3)
+    assert json.loads(encode(frame, "json"))["data"] == ROWS
+
+
+def test_compact_sends_rows_as_columns():
+    body = json.loads(encode(WSFrame(type=WSFrameType.METRICS, data=ROWS, seq=3), "compact"))
+    assert body["data"] == {"cols": ["name", "cpu", "mem"],
+                            "rows": [["api", 1.5, 10], ["db", 0.5, 20]]}
+    assert body["seq"] == 3
+
+
+def test_compact_delta_keeps_removed_names():
+    frame = WSFrame(type=WSFrameType.METRICS_DELTA, data={"changed": ROWS[:1], "removed": ["db"]})
+    body = json.loads(encode(frame, "compact"))
+    assert body["data"]["changed"] == {"cols": ["name", "cpu", "mem"], "rows": [["api", 1.5, 10]]}
+    assert body["data"]["removed"] == ["db"]
+
+
+def test_compact_leaves_other_frames_alone():
+    frame = WSFrame(type=WSFrameType.STATUS_UPDATE, incident_id="a", data={"s": 1})
+    assert json.loads(encode(frame, "compact")) == json.loads(encode(frame, "json"))
+
+
+def test_msgpack_round_trips_the_compact_layout():
+    msgpack = pytest.importorskip("msgpack")
+    frame = WSFrame(type=WSFrameType.METRICS, data=ROWS)
+    packed = encode(frame, "msgpack")
+    assert isinstance(packed, bytes)
+    assert msgpack.unpackb(packed) == json.loads(encode(frame, "compact"))
+    assert len(packed) < len(encode(frame, "json"))
@@ -0,0 +1,196 @@
+"""WebSocket fan-out: outboxes, subscription routing and batched frames."""
+
+import asyncio
+import json
+
+import pytest
+
+from app import ws_manager
+from app.models import WSFrameType
+from app.ws_manager import ConnectionManager
+
+
+class FakeWS:
+    def __init__(self) -> None:
+        self.sent: list = []
+        self.closed_with = None
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(json.loads(text))
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+
+    def frames(self, frame_type: WSFrameType) -> list[dict]:
+        return [f for f in self.sent if isinstance(f, dict) and f["type"] == frame_type.value]
+
+
+async def _client(manager: ConnectionManager, **subscribe) -> FakeWS:
+    ws = FakeWS()
+    await manager.connect(ws)
+    if subscribe:
+        await manager.handle_message(ws, json.dumps({"op": "subscribe", **subscribe}))
+    return ws
+
+
+async def _settle() -> None:
+    """Let the writer tasks drain every outbox."""
+    await asyncio.sleep(0.05)
+
+
+def _run(test) -> None:
+    async def main():
+        manager = ConnectionManager()
+        try:
+            await test(manager)
+        finally:
+            await manager.close()
+
+    asyncio.run(main())
+
+
+class StuckWS(FakeWS):
+    """A client whose sends never complete until released."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def send_text(self, text: str) -> None:
+        await self.release.wait()
+        await super().send_text(text)
+
+
+@pytest.fixture
+def small_outbox(monkeypatch):
+    monkeypatch.setattr(ws_manager, "WS_SEND_QUEUE_SIZE", 4)
+    monkeypatch.setattr(ws_manager, "WS_SLOW_CLIENT_MAX_DROPS", 3)
+
+
+def test_slow_client_does_not_delay_others(small_outbox):
+    async def main(manager):
+        slow = StuckWS()
+        await manager.connect(slow)
+        fast = await _client(manager)
+        for i in range(3):
+            await manager.broadcast_raw(WSFrameType.STATUS_UPDATE, data={"i": i}, incident_id="a")
+        await _settle()
+        assert len(fast.frames(WSFrameType.STATUS_UPDATE)) == 3
+        assert slow.sent == []
+        slow.release.set()
+        await _settle()
+        assert len(slow.frames(WSFrameType.STATUS_UPDATE)) == 3
+
+    _run(main)
+
+
+def test_full_outbox_sheds_metrics_before_pipeline_frames(small_outbox):
+    async def main(manager):
+        slow = StuckWS()
+        await manager.connect(slow)
+        await _settle()                        # the resume frame is in flight
+        await manager.broadcast_raw(WSFrameType.METRICS, data=[])
+        for i in range(3):
+            await manager.broadcast_raw(WSFrameType.STATUS_UPDATE, data={"i": i}, incident_id="a")
+        await manager.broadcast_raw(WSFrameType.FAILED, incident_id="a")
+        assert manager.count == 1
+        slow.release.set()
+        await _settle()
+        assert slow.frames(WSFrameType.METRICS) == []
+        assert len(slow.frames(WSFrameType.STATUS_UPDATE)) == 3
+        assert len(slow.frames(WSFrameType.FAILED)) == 1
+
+    _run(main)
+
+
+def test_client_full_of_pipeline_frames_is_evicted(small_outbox):
+    async def main(manager):
+        slow = StuckWS()
+        await manager.connect(slow)
+        for i in range(6):
+            await manager.broadcast_raw(WSFrameType.STATUS_UPDATE, data={"i": i}, incident_id="a")
+        await _settle()
+        assert manager.count == 0
+        assert manager.slow_disconnects == 1
+        assert slow.closed_with == 1013
+
+    _run(main)
+
+
+def test_incident_filter_routes_tagged_frames():
+    async def main(manager):
+        everyone = await _client(manager)
+        only_a = await _client(manager, incidents=["a"])
+        for iid in ("a", "b"):
+            await manager.broadcast_raw(WSFrameType.STATUS_UPDATE, data={"s": 1}, incident_id=iid)
+        await _settle()
+        assert [f["incident_id"] for f in everyone.frames(WSFrameType.STATUS_UPDATE)] == ["a", "b"]
+        assert [f["incident_id"] for f in only_a.frames(WSFrameType.STATUS_UPDATE)] == ["a"]
+
+    _run(main)
+
+
+def test_type_filter_and_reset_to_everything():
+    async def main(manager):
+        ws = await _client(manager, types=["failed"])
+        await manager.broadcast_raw(WSFrameType.RESOLVED, incident_id="a")
+        await manager.broadcast_raw(WSFrameType.FAILED, incident_id="b")
+        await manager.handle_message(ws, json.dumps({"op": "subscribe", "types": "*"}))
+        await manager.broadcast_raw(WSFrameType.RESOLVED, incident_id="c")
+        await _settle()
+        assert [f["incident_id"] for f in ws.sent if f["type"] in ("resolved", "failed")] == ["b", "c"]
+        assert ws.frames(WSFrameType.SUBSCRIPTION)[-1]["data"]["types"] is None
+
+    _run(main)
+
+
+def test_batched_incident_new_is_trimmed_per_subscription():
+    async def main(manager):
+        everyone = await _client(manager)
+        only_b = await _client(manager, incidents=["b"])
+        only_z = await _client(manager, incidents=["z"])
+        await manager.broadcast_raw(WSFrameType.INCIDENT_NEW, data=[
+            {"incident_id": iid, "alert_type": "CPU", "logs": ""} for iid in ("a", "b", "c")
+        ])
+        await _settle()
+        (batch,) = everyone.frames(WSFrameType.INCIDENT_NEW)
+        assert [r["incident_id"] for r in batch["data"]] == ["a", "b", "c"]
+        (trimmed,) = only_b.frames(WSFrameType.INCIDENT_NEW)
+        assert [r["incident_id"] for r in trimmed["data"]] == ["b"]
+        assert only_z.frames(WSFrameType.INCIDENT_NEW) == []
+
+    _run(main)
+
+
+def test_bad_subscribe_is_reported_and_filter_kept():
+    async def main(manager):
+        ws = await _client(manager, incidents=["a"])
+        await manager.handle_message(ws, json.dumps({"op": "subscribe", "incidents": "a"}))
+        await manager.broadcast_raw(WSFrameType.FAILED, incident_id="b")
+        await _settle()
+        assert "error" in ws.frames(WSFrameType.SUBSCRIPTION)[-1]["data"]
+        assert ws.frames(WSFrameType.FAILED) == []
+
+    _run(main)
+
+
+def test_container_filter_trims_per_container_frames():
+    async def main(manager):
+        everyone = await _client(manager)
+        only_api = await _client(manager, containers=["api"])
+        rows = [{"name": "api", "cpu": 1.0}, {"name": "db", "cpu": 2.0}]
+        await manager.broadcast_raw(WSFrameType.METRICS, data=rows)
+        await manager.broadcast_raw(WSFrameType.METRICS_DELTA,
+                                    data={"changed": [rows[1]], "removed": []})
+        await _settle()
+        assert everyone.frames(WSFrameType.METRICS)[0]["data"] == rows
+        assert only_api.frames(WSFrameType.METRICS)[0]["data"] == rows[:1]
+        assert only_api.frames(WSFrameType.METRICS_DELTA) == []   # nothing about "api"
+
+    _run(main)
@@ -0,0 +1,69 @@
+"""WebSocket resume: replay buffer and since-based reconnects."""
+
+import asyncio
+
+from app.models import WSFrame, WSFrameType
+from app.ws_manager import ConnectionManager, ReplayBuffer
+from test_ws_manager import FakeWS, _settle
+
+
+def _frame(seq: int, frame_type=WSFrameType.STATUS_UPDATE, incident_id="a") -> WSFrame:
+    return WSFrame(type=frame_type, incident_id=incident_id, seq=seq)
+
+
+def test_since_returns_missed_frames_in_order():
+    buf = ReplayBuffer(per_topic=10, max_topics=10)
+    for seq, iid in enumerate(["a", "b", "a", "b"], start=1):
+        buf.add(_frame(seq, incident_id=iid))
+    assert [f.seq for f in buf.since(1)] == [2, 3, 4]
+    assert buf.since(4) == []
+
+
+def test_evicted_gap_cannot_be_replayed():
+    buf = ReplayBuffer(per_topic=2, max_topics=10)
+    for seq in range(1, 5):
+        buf.add(_frame(seq))
+    assert buf.since(0) is None
+    assert [f.seq for f in buf.since(2)] == [3, 4]
+
+
+def test_snapshots_keep_only_the_latest():
+    buf = ReplayBuffer()
+    buf.add(_frame(1, WSFrameType.METRICS_DELTA, None))
+    buf.add(_frame(2, WSFrameType.METRICS, None))
+    buf.add(_frame(3, WSFrameType.METRICS_DELTA, None))
+    buf.add(_frame(4, WSFrameType.METRICS, None))
+    buf.add(_frame(5, WSFrameType.HEARTBEAT, None))
+    assert [f.seq for f in buf.live_state()] == [4]
+    assert buf.since(0) is not None             # superseded frames are not a gap
+
+
+def test_reconnect_replays_only_the_gap():
+    async def main():
+        manager = ConnectionManager()
+        try:
+            first = FakeWS()
+            await manager.connect(first)
+            await manager.broadcast_raw(WSFrameType.STATUS_UPDATE, incident_id="a")
+            await _settle()
+            last_seq = first.frames(WSFrameType.STATUS_UPDATE)[-1]["seq"]
+            stream = first.frames(WSFrameType.RESUME)[0]["data"]["stream"]
+            await manager.disconnect(first)
+
+            for iid in ("a", "b"):
+                await manager.broadcast_raw(WSFrameType.STATUS_UPDATE, incident_id=iid)
+            again = FakeWS()
+            await manager.connect(again, stream=stream, since=last_seq)
+            other = FakeWS()
+            await manager.connect(other, stream="another-stream", since=last_seq)
+            await _settle()
+
+            resume = again.frames(WSFrameType.RESUME)[0]["data"]
+            assert resume["replayed"] == 2 and not resume["snapshot_required"]
+            assert [f["seq"] for f in again.frames(WSFrameType.STATUS_UPDATE)] == \
+                [last_seq + 1, last_seq + 2]
+            assert other.frames(WSFrameType.RESUME)[0]["data"]["snapshot_required"]
+        finally:
+            await manager.close()
+
+    asyncio.run(main())